@@ -61,6 +61,10 @@ ALLOWED_ORIGINS=http://localhost:3000,http://localhost:3001
 DATA_DIR=./data
 MAX_UPLOAD_SIZE_MB=10
 FILE_RETENTION_HOURS=24
+# Set one to share the file registry across workers: a SQLite file on one host,
+# or Redis across hosts, e.g. redis://localhost:6379/0
+# REGISTRY_PATH=./data/registry.db
+# REDIS_URL=
 
 # Recommendations
 MIN_CONFIDENCE=0.6
@@ -45,6 +45,20 @@ async def list_domain_configs():
         raise HTTPException(status_code=500, detail=f"Failed to list configurations: {str(e)}")
 
 
+# Registered before /domains/{domain_name} so "active" isn't captured as a domain name
+@router.get("/domains/active", response_model=Optional[DomainConfiguration])
+async def get_active_domain_config():
+    """
+    Get the currently active domain configuration
+    """
+    try:
+        config = config_manager.get_active_config()
+        return config
+    except Exception as e:
+        logger.error(f"Error getting active configuration: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to get active configuration: {str(e)}")
+
+
 @router.get("/domains/{domain_name}", response_model=DomainConfiguration)
 async def get_domain_config(domain_name: str):
     """
@@ -79,12 +93,14 @@ async def update_domain_config(domain_name: str, config: DomainConfiguration):
         if not existing:
             raise HTTPException(status_code=404, detail="Configuration not found")
 
-        # Update fields
-        for field, value in config.dict(exclude={'domain_name'}).items():
-            setattr(existing, field, value)
+        # Take every field from the request except the domain name, and swap
+        # the stored reference in one step
+        updated = config_manager.add_config(
+            config.model_copy(update={'domain_name': existing.domain_name})
+        )
 
         logger.info(f"Updated domain configuration: {domain_name}")
-        return existing
+        return updated
     except HTTPException:
         raise
     except Exception as e:
@@ -101,9 +117,8 @@ async def delete_domain_config(domain_name: str):
     """
     try:
         # For now, just mark as inactive rather than deleting
-        config = config_manager.get_config(domain_name)
+        config = config_manager.deactivate_config(domain_name)
         if config:
-            config.is_active = False
             logger.info(f"Deactivated domain configuration: {domain_name}")
             return {"message": "Configuration deactivated successfully"}
         else:
@@ -123,17 +138,11 @@ async def activate_domain_config(domain_name: str):
     - **domain_name**: Name of the domain configuration to activate
     """
     try:
-        config = config_manager.get_config(domain_name)
+        # Activate this one (deactivates all others)
+        config = config_manager.activate_config(domain_name)
         if not config:
             raise HTTPException(status_code=404, detail="Configuration not found")
 
-        # Deactivate all others
-        for other_config in config_manager.list_configs():
-            other_config.is_active = False
-
-        # Activate this one
-        config.is_active = True
-
         logger.info(f"Activated domain configuration: {domain_name}")
         return {"message": f"Activated configuration: {domain_name}"}
     except HTTPException:
@@ -143,19 +152,6 @@ async def activate_domain_config(domain_name: str):
         raise HTTPException(status_code=500, detail=f"Failed to activate configuration: {str(e)}")
 
 
-@router.get("/domains/active", response_model=Optional[DomainConfiguration])
-async def get_active_domain_config():
-    """
-    Get the currently active domain configuration
-    """
-    try:
-        config = config_manager.get_active_config()
-        return config
-    except Exception as e:
-        logger.error(f"Error getting active configuration: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get active configuration: {str(e)}")
-
-
 @router.post("/domains/{domain_name}/patterns")
 async def add_cleaning_pattern(
     domain_name: str,
@@ -168,11 +164,10 @@ async def add_cleaning_pattern(
     - **pattern**: Cleaning pattern to add
     """
     try:
-        config = config_manager.get_config(domain_name)
+        config = config_manager.add_cleaning_pattern(domain_name, pattern)
         if not config:
             raise HTTPException(status_code=404, detail="Configuration not found")
 
-        config.cleaning_patterns.append(pattern)
         logger.info(f"Added cleaning pattern to domain {domain_name}")
         return {"message": "Pattern added successfully"}
     except HTTPException:
@@ -195,8 +190,8 @@ async def remove_cleaning_pattern(domain_name: str, pattern_index: int):
         if not config:
             raise HTTPException(status_code=404, detail="Configuration not found")
 
-        if 0 <= pattern_index < len(config.cleaning_patterns):
-            removed = config.cleaning_patterns.pop(pattern_index)
+        removed = config_manager.remove_cleaning_pattern(domain_name, pattern_index)
+        if removed is not None:
             logger.info(f"Removed cleaning pattern from domain {domain_name}")
             return {"message": "Pattern removed successfully", "removed_pattern": removed}
         else:
@@ -225,15 +220,10 @@ async def add_merchant_pattern_to_domain(
         merchant_pattern = pattern_manager.create_pattern(pattern)
 
         # Add to domain configuration
-        config = config_manager.get_config(domain_name)
+        config = config_manager.add_entity_pattern(domain_name, 'merchant', merchant_pattern.pattern)
         if not config:
             raise HTTPException(status_code=404, detail="Configuration not found")
 
-        if 'merchant' not in config.entity_patterns:
-            config.entity_patterns['merchant'] = []
-
-        config.entity_patterns['merchant'].append(merchant_pattern.pattern)
-
         logger.info(f"Added merchant pattern to domain {domain_name}")
         return {
             "message": "Merchant pattern added successfully",
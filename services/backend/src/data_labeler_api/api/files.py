@@ -2,17 +2,29 @@
 File upload and management API endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
+from fastapi import (
+    APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks, Query, Request, Response
+)
 from fastapi.responses import JSONResponse
-from typing import List, Optional
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Dict, List, Literal, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import hashlib
 import logging
+import multiprocessing
 import os
-from pathlib import Path
+import sys
+
+from starlette.concurrency import run_in_threadpool
 
-from ..core.config import get_settings
+from ..core.config import get_settings, get_upload_chunk_size, get_upload_size_limit
+from ..core.logging_config import configure_worker_logging
 from ..core.storage import storage_manager
+from ..models.base import fast_constructor
 from ..models.file import (
     FileInfo,
+    FileSummary,
     FileUploadResponse,
     FileListResponse,
     FileDeleteResponse,
@@ -20,10 +32,14 @@ from ..models.file import (
     ValidationReport
 )
 from ..models.transaction import (
+    Transaction,
+    TransactionColumns,
+    TransactionList,
     ProcessedFile,
     FileProcessingOptions
 )
 from ..services.csv_processor import CSVProcessor
+from ..utils.dates import parse_iso_datetime
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -31,6 +47,63 @@ settings = get_settings()
 router = APIRouter(prefix="/files", tags=["Files"])
 csv_processor = CSVProcessor()
 
+# Validate/serialize whole lists in one pydantic-core call
+transaction_list_adapter = TypeAdapter(List[Transaction])
+
+# Unvalidated FileSummary constructor for trusted registry entries
+build_file_summary = fast_constructor(FileSummary)
+
+# Field names, in order, for the columnar transactions format
+TRANSACTION_COLUMNS = tuple(Transaction.model_fields)
+
+# Worker processes for CSV parsing, created lazily by get_process_pool()
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+# Workers never fork the threaded server (log listener, threadpool), whose held locks would deadlock them
+_PROCESS_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _json_model_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON bytes in pydantic-core
+
+    FastAPI validates and dumps the return value against response_model
+    before encoding; large list responses skip that extra pass.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+def _file_summary(file_data: Dict[str, Any]) -> FileSummary:
+    """
+    Build a FileSummary from a storage registry entry
+
+    Registry entries are written by this service with well-typed values, so
+    the model is constructed without re-validating them.
+    """
+    return build_file_summary(
+        file_id=file_data["file_id"],
+        filename=file_data["original_filename"],
+        file_size=file_data["file_size"],
+        uploaded_at=parse_iso_datetime(file_data["uploaded_at"]),
+        # Shared registries decode a fresh string per entry; intern it as validation would
+        status=sys.intern(file_data.get("status", "uploaded")),
+    )
+
+
+def _file_info_fields(file_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a storage registry entry onto FileInfo fields"""
+    return {
+        "file_id": file_data["file_id"],
+        "filename": file_data["original_filename"],
+        "session_id": file_data["session_id"],
+        "file_size": file_data["file_size"],
+        "uploaded_at": file_data["uploaded_at"],
+        "processed_at": file_data.get("processed_at"),
+        "status": file_data.get("status", "uploaded"),
+        "mime_type": file_data.get("mime_type"),
+        "encoding": file_data.get("encoding"),
+    }
+
 
 @router.post("/upload", response_model=FileUploadResponse)
 async def upload_file(
@@ -53,41 +126,32 @@ async def upload_file(
             detail="Only CSV files are supported"
         )
 
-    # Check file size
-    file_size = 0
-    content = await file.read()
-    file_size = len(content)
+    # Starlette has already spooled the upload, so its size is known up front
+    max_size_bytes = get_upload_size_limit()
+    file_size = file.size
+    if file_size is None:
+        file.file.seek(0, os.SEEK_END)
+        file_size = file.file.tell()
+        file.file.seek(0)
 
-    max_size_bytes = settings.max_upload_size_mb * 1024 * 1024
     if file_size > max_size_bytes:
         raise HTTPException(
             status_code=413,
             detail=f"File size exceeds maximum limit of {settings.max_upload_size_mb}MB"
         )
 
-    # Reset file pointer for further processing
-    await file.seek(0)
-
     try:
-        # Save file temporarily for processing
-        temp_file_path = Path(f"/tmp/{file.filename}")
-        with open(temp_file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-
-        # Save to storage
-        file_id = storage_manager.save_uploaded_file(
-            temp_file_path,
+        # Stream straight from the spooled upload into storage
+        file_id = await run_in_threadpool(
+            storage_manager.save_uploaded_file_stream,
+            file.file,
             file.filename,
-            session_id
+            session_id,
+            get_upload_chunk_size()
         )
 
-        # Clean up temp file
-        if temp_file_path.exists():
-            temp_file_path.unlink()
-
         # Get file info
-        file_info = storage_manager.get_file_info(file_id)
+        file_info = await run_in_threadpool(storage_manager.get_file_info, file_id)
         if not file_info:
             raise HTTPException(status_code=500, detail="Failed to save file information")
 
@@ -104,9 +168,11 @@ async def upload_file(
         # Trigger background processing
         background_tasks.add_task(process_uploaded_file, file_id)
 
-        logger.info(f"Successfully uploaded file: {file_id}")
+        logger.info("Successfully uploaded file: %s", file_id)
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading file {file.filename}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
@@ -131,40 +197,21 @@ async def list_files(
     if per_page < 1 or per_page > 100:
         per_page = 20
 
-    # Get files from storage
-    all_files = storage_manager.list_files(session_id)
-
-    # Sort by upload time (newest first)
-    all_files.sort(key=lambda x: x["uploaded_at"], reverse=True)
-
-    # Apply pagination
+    # Get one page of files from storage (newest first)
     start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    paginated_files = all_files[start_idx:end_idx]
-
-    # Convert to FileInfo models
-    files = []
-    for file_data in paginated_files:
-        file_info = FileInfo(
-            file_id=file_data["file_id"],
-            filename=file_data["original_filename"],
-            session_id=file_data["session_id"],
-            file_size=file_data["file_size"],
-            uploaded_at=file_data["uploaded_at"],
-            processed_at=file_data.get("processed_at"),
-            status=file_data.get("status", "uploaded"),
-            mime_type=file_data.get("mime_type"),
-            encoding=file_data.get("encoding")
-        )
-        files.append(file_info)
+    paginated_files, total = await run_in_threadpool(
+        storage_manager.list_files_page, session_id, start_idx, per_page
+    )
 
-    return FileListResponse(
+    files = [_file_summary(file_data) for file_data in paginated_files]
+
+    return _json_model_response(FileListResponse(
         files=files,
-        total=len(all_files),
+        total=total,
         page=page,
         per_page=per_page,
-        has_more=end_idx < len(all_files)
-    )
+        has_more=start_idx + per_page < total
+    ))
 
 
 @router.get("/{file_id}", response_model=FileInfo)
@@ -174,21 +221,11 @@ async def get_file_info(file_id: str):
 
     - **file_id**: Unique file identifier
     """
-    file_info = storage_manager.get_file_info(file_id)
+    file_info = await run_in_threadpool(storage_manager.get_file_info, file_id)
     if not file_info:
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileInfo(
-        file_id=file_info["file_id"],
-        filename=file_info["original_filename"],
-        session_id=file_info["session_id"],
-        file_size=file_info["file_size"],
-        uploaded_at=file_info["uploaded_at"],
-        processed_at=file_info.get("processed_at"),
-        status=file_info.get("status", "uploaded"),
-        mime_type=file_info.get("mime_type"),
-        encoding=file_info.get("encoding")
-    )
+    return FileInfo(**_file_info_fields(file_info))
 
 
 @router.delete("/{file_id}", response_model=FileDeleteResponse)
@@ -198,16 +235,11 @@ async def delete_file(file_id: str):
 
     - **file_id**: Unique file identifier
     """
-    # Check if file exists
-    file_info = storage_manager.get_file_info(file_id)
-    if not file_info:
-        raise HTTPException(status_code=404, detail="File not found")
-
-    # Delete file
-    deleted = storage_manager.delete_file(file_id)
+    # Delete file (returns False only when the file is not registered)
+    deleted = await run_in_threadpool(storage_manager.delete_file, file_id)
 
     if not deleted:
-        raise HTTPException(status_code=500, detail="Failed to delete file")
+        raise HTTPException(status_code=404, detail="File not found")
 
     return FileDeleteResponse(
         file_id=file_id,
@@ -217,20 +249,34 @@ async def delete_file(file_id: str):
 
 
 @router.get("/{file_id}/status", response_model=FileProcessingStatus)
-async def get_file_status(file_id: str):
+async def get_file_status(file_id: str, request: Request, response: Response):
     """
     Get processing status of a file
 
     - **file_id**: Unique file identifier
+
+    Supports conditional requests: an If-None-Match matching the current
+    ETag returns 304 with no body.
     """
-    file_info = storage_manager.get_file_info(file_id)
+    file_info = await run_in_threadpool(storage_manager.get_file_info, file_id)
     if not file_info:
         raise HTTPException(status_code=404, detail="File not found")
 
     # Determine status based on file info
     status = file_info.get("status", "uploaded")
     processed_at = file_info.get("processed_at")
+    error = file_info.get("error")
+
+    # Status only changes with (status, processed_at, error), so that triple is the ETag.
+    # Even completed files can be deleted, so caches must revalidate every time;
+    # a matching ETag makes that a bodiless 304.
+    etag = '"' + hashlib.sha1(f"{file_id}:{status}:{processed_at}:{error}".encode()).hexdigest()[:16] + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=0"}
 
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
     return FileProcessingStatus(
         file_id=file_id,
         status=status,
@@ -248,7 +294,7 @@ async def get_file_validation(file_id: str):
     - **file_id**: Unique file identifier
     """
     # Get processed data which should contain validation report
-    processed_data = storage_manager.get_processed_data(file_id)
+    processed_data = await run_in_threadpool(storage_manager.get_processed_data, file_id)
     if not processed_data:
         raise HTTPException(status_code=404, detail="File not processed yet")
 
@@ -259,6 +305,104 @@ async def get_file_validation(file_id: str):
     return ValidationReport(**validation_report)
 
 
+@router.get("/{file_id}/transactions", response_model=Union[TransactionList, TransactionColumns])
+async def get_file_transactions(
+    file_id: str,
+    page: int = 1,
+    per_page: int = 100,
+    format: Literal["rows", "columnar"] = Query("rows", description="Response layout")
+):
+    """
+    Get a page of processed transactions for a file
+
+    - **file_id**: Unique file identifier
+    - **page**: Page number (default: 1)
+    - **per_page**: Items per page (default: 100, max: 1000)
+    - **format**: "rows" for a list of transactions, "columnar" for one list per field
+    """
+    if page < 1:
+        page = 1
+    if per_page < 1 or per_page > 1000:
+        per_page = 100
+
+    processed_data = await run_in_threadpool(storage_manager.get_processed_data, file_id)
+    if not processed_data:
+        raise HTTPException(status_code=404, detail="File not processed yet")
+
+    transactions = processed_data.get("transactions") or []
+    start_idx = (page - 1) * per_page
+    rows = transactions[start_idx:start_idx + per_page]
+
+    if format == "columnar":
+        # Stored rows are already JSON-ready, so each column is a plain pass
+        # over the page with no per-row model construction
+        return _json_model_response(TransactionColumns(
+            columns={name: [row.get(name) for row in rows] for name in TRANSACTION_COLUMNS},
+            row_count=len(rows),
+            total=len(transactions),
+            page=page,
+            per_page=per_page,
+            file_id=file_id
+        ))
+
+    return _json_model_response(TransactionList(
+        transactions=rows,
+        total=len(transactions),
+        page=page,
+        per_page=per_page,
+        file_id=file_id
+    ))
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared CSV processing pool, creating it on first use"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(
+            max_workers=settings.processing_workers,
+            mp_context=multiprocessing.get_context(_PROCESS_START_METHOD),
+            initializer=configure_worker_logging
+        )
+    return _process_pool
+
+
+def shutdown_process_pool():
+    """Shut down the CSV processing pool if it was started"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+def build_processed_data(file_path: str, file_id: str) -> Dict[str, Any]:
+    """
+    Process a CSV file into its JSON-ready processed payload
+
+    Runs inside a worker process, so it only touches its arguments and
+    returns plain data for the caller to persist.
+
+    Args:
+        file_path: Path to the stored CSV file
+        file_id: Unique file identifier
+
+    Returns:
+        Processed data dictionary
+    """
+    processed_file, transactions, validation_report = csv_processor.process_csv_file(
+        file_path,
+        file_id,
+        FileProcessingOptions()
+    )
+
+    return {
+        "file_id": file_id,
+        "processed_file": processed_file.model_dump(mode="json"),
+        "transactions": transaction_list_adapter.dump_python(transactions, mode="json"),
+        "validation_report": validation_report.model_dump(mode="json"),
+        "processed_at": processed_file.created_at.isoformat()
+    }
+
+
 async def process_uploaded_file(file_id: str):
     """
     Background task to process uploaded CSV file
@@ -267,54 +411,41 @@ async def process_uploaded_file(file_id: str):
         file_id: Unique file identifier
     """
     try:
-        # Get file info
-        file_info = storage_manager.get_file_info(file_id)
-        if not file_info:
+        # Get file info and path
+        file_record = await run_in_threadpool(storage_manager.get_file_record, file_id)
+        if not file_record:
             logger.error(f"File info not found for {file_id}")
             return
 
-        # Get file path
-        file_path = storage_manager.get_file_path(file_id)
-        if not file_path:
-            logger.error(f"File path not found for {file_id}")
-            return
+        file_info, file_path = file_record
 
         # Update status to processing
-        file_info["status"] = "processing"
-        storage_manager._file_registry[file_id] = file_info
-
-        # Process the CSV file
-        processed_file, transactions, validation_report = csv_processor.process_csv_file(
+        await run_in_threadpool(storage_manager.update_file_info, file_id, status="processing")
+
+        # Parse, validate and serialize in a worker process so the event loop
+        # stays free to serve other requests
+        loop = asyncio.get_running_loop()
+        processed_data = await loop.run_in_executor(
+            get_process_pool(),
+            build_processed_data,
             str(file_path),
-            file_id,
-            FileProcessingOptions()
+            file_id
         )
 
-        # Save processed data
-        processed_data = {
-            "file_id": file_id,
-            "processed_file": processed_file.dict(),
-            "transactions": [t.dict() for t in transactions],
-            "validation_report": validation_report.dict(),
-            "processed_at": processed_file.created_at.isoformat()
-        }
-
-        storage_manager.save_processed_data(file_id, processed_data)
-
-        # Update file info
-        file_info["status"] = "completed"
-        file_info["processed_at"] = processed_file.created_at.isoformat()
-        file_info["validation_report"] = validation_report.dict()
-        storage_manager._file_registry[file_id] = file_info
+        # Save processed data and mark the file completed in one registry update
+        processed_at = processed_data["processed_at"]
+        saved = await run_in_threadpool(storage_manager.finalize_processing, file_id, processed_data, {
+            "status": "completed",
+            "processed_at": processed_at,
+            "validation_report": processed_data["validation_report"],
+        })
+        if not saved:
+            raise RuntimeError("Failed to save processed data")
 
-        logger.info(f"Successfully processed file: {file_id}")
+        logger.info("Successfully processed file: %s", file_id)
 
     except Exception as e:
         logger.error(f"Error processing file {file_id}: {e}")
 
         # Update file info with error status
-        if file_id in storage_manager._file_registry:
-            file_info = storage_manager._file_registry[file_id]
-            file_info["status"] = "failed"
-            file_info["error"] = str(e)
-            storage_manager._file_registry[file_id] = file_info
+        await run_in_threadpool(storage_manager.update_file_info, file_id, status="failed", error=str(e))
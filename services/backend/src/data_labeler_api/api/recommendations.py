@@ -6,18 +6,32 @@ from fastapi import APIRouter, HTTPException, Query, Body
 from fastapi.responses import JSONResponse
 from typing import List, Optional, Dict, Any
 import logging
-from datetime import datetime
+import re
 from collections import Counter, defaultdict
+import numpy as np
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
+from ..models.base import fast_constructor
 from ..models.transaction import Transaction
 from ..services.rule_engine import rule_engine
 from ..core.storage import storage_manager
+from ..utils.dates import parse_iso_datetime
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/recommendations", tags=["Recommendations"])
 
+# Positive amount buckets for analyze_amount_patterns: [0, 10), [10, 50), ... [1000, inf]
+AMOUNT_RANGE_EDGES = [0, 10, 50, 100, 500, 1000, np.inf]
+AMOUNT_RANGE_NAMES = ["under_10", "10_to_50", "50_to_100", "100_to_500", "500_to_1000", "over_1000"]
+
+# Words ignored by analyze_description_patterns
+DESCRIPTION_STOP_WORDS = frozenset({'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'an', 'a'})
+
+# Anything that is neither alphanumeric nor whitespace
+_PUNCTUATION_RE = re.compile(r'[^\w\s]|_')
+
 
 class Recommendation(BaseModel):
     """Recommendation model"""
@@ -30,10 +44,14 @@ class Recommendation(BaseModel):
     similar_transactions: List[str] = []
 
 
+# Unvalidated Recommendation constructor for values built by this module
+build_recommendation = fast_constructor(Recommendation)
+
+
 @router.get("/smart-suggestions", response_model=List[Recommendation])
 async def get_smart_suggestions(
     file_id: str = Query(..., description="File ID to analyze"),
-    limit: int = Query(50, description="Maximum number of suggestions to return"),
+    limit: int = Query(50, ge=0, description="Maximum number of suggestions to return"),
     min_confidence: float = Query(0.3, description="Minimum confidence threshold")
 ):
     """
@@ -45,25 +63,17 @@ async def get_smart_suggestions(
     """
     try:
         # Get transactions from file
-        processed_data = storage_manager.get_processed_data(file_id)
+        processed_data = await run_in_threadpool(storage_manager.get_processed_data, file_id)
         if not processed_data:
             raise HTTPException(status_code=404, detail="File not processed yet")
 
         transactions = processed_data.get("transactions", [])
-        labeled_transactions = [t for t in transactions if t.get('label')]
-
-        if len(labeled_transactions) < 2:
-            return []  # Need at least 2 labeled transactions for pattern analysis
-
-        # Analyze patterns and generate recommendations
-        recommendations = analyze_transaction_patterns(transactions, labeled_transactions, min_confidence)
 
-        # Sort by confidence and limit results
-        recommendations.sort(key=lambda r: r.confidence, reverse=True)
-        limited_recommendations = recommendations[:limit]
+        # Analyze patterns and generate the top recommendations by confidence
+        recommendations = analyze_transaction_patterns(transactions, min_confidence, limit=limit)
 
-        logger.info(f"Generated {len(recommendations)} smart suggestions, returning {len(limited_recommendations)}")
-        return limited_recommendations
+        logger.info(f"Returning {len(recommendations)} smart suggestions")
+        return recommendations
 
     except HTTPException:
         raise
@@ -85,7 +95,7 @@ async def analyze_patterns(
     """
     try:
         # Get transactions from file
-        processed_data = storage_manager.get_processed_data(file_id)
+        processed_data = await run_in_threadpool(storage_manager.get_processed_data, file_id)
         if not processed_data:
             raise HTTPException(status_code=404, detail="File not processed yet")
 
@@ -113,68 +123,115 @@ async def analyze_patterns(
         raise HTTPException(status_code=500, detail=f"Failed to analyze patterns: {str(e)}")
 
 
-def analyze_transaction_patterns(transactions: List[Dict], labeled_transactions: List[Dict], min_confidence: float) -> List[Recommendation]:
-    """Analyze transaction patterns to generate recommendations"""
-    recommendations = []
+def _descriptions(transactions: List[Dict]) -> List[str]:
+    """Get each transaction's description as a string"""
+    return [str(t.get('description') or '') for t in transactions]
 
-    # Group transactions by merchant
-    merchant_groups = defaultdict(list)
-    for transaction in transactions:
-        merchant = rule_engine.extract_merchant(str(transaction.get('Description', transaction.get('description', ''))))
-        merchant_groups[merchant].append(transaction)
 
-    # Analyze each merchant group
-    for merchant, merchant_transactions in merchant_groups.items():
-        if merchant == 'UNKNOWN' or len(merchant_transactions) < 2:
-            continue
+def analyze_transaction_patterns(transactions: List[Dict], min_confidence: float,
+                                 limit: Optional[int] = None) -> List[Recommendation]:
+    """
+    Analyze transaction patterns to generate recommendations
 
-        # Find labeled transactions for this merchant
-        labeled_for_merchant = [t for t in labeled_transactions if
-                               rule_engine.extract_merchant(str(t.get('Description', t.get('description', '')))) == merchant]
+    Args:
+        transactions: All transactions in the file, labeled and unlabeled
+        min_confidence: Minimum confidence for a suggestion to be returned
+        limit: If given, return only the top `limit` suggestions, highest confidence first
 
-        if len(labeled_for_merchant) < 1:
+    Returns:
+        Recommendations for unlabeled transactions (none if fewer than 2 are labeled)
+    """
+    # Need at least 2 labeled transactions for pattern analysis; check that
+    # before paying for merchant extraction, stopping as soon as 2 are seen
+    labeled_seen = 0
+    for transaction in transactions:
+        if transaction.get('label'):
+            labeled_seen += 1
+            if labeled_seen >= 2:
+                break
+    if labeled_seen < 2:
+        return []
+
+    # Single pass: extract merchants in one batch, count transactions per
+    # merchant, tally labels and bucket the unlabeled ones
+    merchants = rule_engine.extract_merchants(_descriptions(transactions))
+    merchant_counts: Counter = Counter()
+    labeled_counts: Dict[str, Counter] = defaultdict(Counter)
+    labeled_ids: Dict[str, List[str]] = defaultdict(list)
+    unlabeled_by_merchant: Dict[str, List[Dict]] = defaultdict(list)
+    for transaction, merchant in zip(transactions, merchants):
+        merchant_counts[merchant] += 1
+        label = transaction.get('label')
+        if label:
+            labeled_counts[merchant][label] += 1
+            labeled_ids[merchant].append(str(transaction.get('id', '')))
+        else:
+            unlabeled_by_merchant[merchant].append(transaction)
+
+    # Analyze each merchant group. Confidence only depends on the merchant, so
+    # candidates are kept per group and models are built only for survivors.
+    candidate_groups = []
+    for merchant, merchant_count in merchant_counts.items():
+        if merchant == 'UNKNOWN' or merchant_count < 2:
             continue
 
-        # Get the most common label for this merchant
-        labels = [t.get('label') for t in labeled_for_merchant if t.get('label')]
-        if not labels:
+        label_counts = labeled_counts.get(merchant)
+        unlabeled = unlabeled_by_merchant.get(merchant)
+        if not label_counts or not unlabeled:
             continue
 
-        most_common_label = Counter(labels).most_common(1)[0][0]
-
-        # Generate recommendations for unlabeled transactions of this merchant
-        unlabeled_for_merchant = [t for t in merchant_transactions if not t.get('label')]
+        # Get the most common label for this merchant
+        most_common_label, top_count = label_counts.most_common(1)[0]
+        labeled_count = sum(label_counts.values())
+
+        # Calculate confidence based on:
+        # 1. How many similar labeled transactions exist
+        # 2. How consistent the labeling is
+        # 3. How specific the merchant pattern is
+        label_consistency = top_count / labeled_count
+        merchant_specificity = min(1.0, merchant_count / 10)  # More transactions = more confidence
+        confidence = (label_consistency * 0.6) + (merchant_specificity * 0.4)
+
+        if confidence < min_confidence:
+            continue
 
-        for transaction in unlabeled_for_merchant:
-            # Calculate confidence based on:
-            # 1. How many similar labeled transactions exist
-            # 2. How consistent the labeling is
-            # 3. How specific the merchant pattern is
+        candidate_groups.append((confidence, merchant, most_common_label, labeled_count, unlabeled))
 
-            label_consistency = Counter(labels).most_common(1)[0][1] / len(labels)
-            merchant_specificity = min(1.0, len(merchant_transactions) / 10)  # More transactions = more confidence
-            confidence = (label_consistency * 0.6) + (merchant_specificity * 0.4)
+    if limit is not None:
+        # Stable sort, so equal-confidence groups keep their order
+        candidate_groups.sort(key=lambda group: group[0], reverse=True)
 
-            if confidence >= min_confidence:
-                recommendations.append(Recommendation(
-                    transaction_id=str(transaction.get('id', '')),
-                    suggested_label_id=most_common_label,
-                    confidence=confidence,
-                    reason=f"Pattern analysis: {len(labeled_for_merchant)} similar transactions labeled '{most_common_label}'",
-                    pattern_matches=[merchant],
-                    similar_transactions=[str(t.get('id', '')) for t in labeled_for_merchant[:3]]
-                ))
+    # Generate recommendations for unlabeled transactions of each merchant
+    recommendations = []
+    for confidence, merchant, most_common_label, labeled_count, unlabeled in candidate_groups:
+        if limit is not None and len(recommendations) >= limit:
+            break
+
+        reason = f"Pattern analysis: {labeled_count} similar transactions labeled '{most_common_label}'"
+        similar_transactions = labeled_ids[merchant][:3]
+        if limit is not None:
+            unlabeled = unlabeled[:limit - len(recommendations)]
+
+        # Every field is built here with its final type, so skip re-validation
+        for transaction in unlabeled:
+            recommendations.append(build_recommendation(
+                transaction_id=str(transaction.get('id', '')),
+                suggested_label_id=most_common_label,
+                confidence=confidence,
+                reason=reason,
+                pattern_matches=[merchant],
+                similar_transactions=similar_transactions
+            ))
 
     return recommendations
 
 
 def analyze_merchant_patterns(transactions: List[Dict]) -> Dict[str, Any]:
     """Analyze merchant patterns in transactions"""
-    merchants = []
-    for transaction in transactions:
-        merchant = rule_engine.extract_merchant(str(transaction.get('Description', transaction.get('description', ''))))
-        if merchant != 'UNKNOWN':
-            merchants.append(merchant)
+    merchants = [
+        merchant for merchant in rule_engine.extract_merchants(_descriptions(transactions))
+        if merchant != 'UNKNOWN'
+    ]
 
     if not merchants:
         return {"top_merchants": [], "total_unique_merchants": 0}
@@ -193,7 +250,7 @@ def analyze_amount_patterns(transactions: List[Dict]) -> Dict[str, Any]:
     """Analyze amount patterns in transactions"""
     amounts = []
     for transaction in transactions:
-        amount = transaction.get('Amount', transaction.get('amount', 0))
+        amount = transaction.get('amount', 0)
         try:
             amounts.append(float(amount))
         except (ValueError, TypeError):
@@ -202,31 +259,27 @@ def analyze_amount_patterns(transactions: List[Dict]) -> Dict[str, Any]:
     if not amounts:
         return {"patterns": [], "statistics": {}}
 
-    # Find common amount patterns (round to 2 decimal places)
-    rounded_amounts = [round(a, 2) for a in amounts]
-    amount_counts = Counter(rounded_amounts)
-
-    # Find recurring amounts
-    recurring_amounts = [amount for amount, count in amount_counts.items() if count > 1]
-
-    # Group by amount ranges
-    ranges = {
-        "under_10": len([a for a in amounts if 0 < a < 10]),
-        "10_to_50": len([a for a in amounts if 10 <= a < 50]),
-        "50_to_100": len([a for a in amounts if 50 <= a < 100]),
-        "100_to_500": len([a for a in amounts if 100 <= a < 500]),
-        "500_to_1000": len([a for a in amounts if 500 <= a < 1000]),
-        "over_1000": len([a for a in amounts if a >= 1000])
-    }
+    # Everything below is vectorized over a single float array
+    amounts_np = np.asarray(amounts, dtype=np.float64)
+
+    # Find recurring amounts (round to 2 decimal places); unique values come back sorted
+    unique_amounts, amount_counts = np.unique(np.round(amounts_np, 2), return_counts=True)
+    recurring_amounts = unique_amounts[amount_counts > 1][::-1][:10]
+
+    # Group positive amounts by range in one histogram pass
+    range_counts, _ = np.histogram(amounts_np[amounts_np > 0], bins=AMOUNT_RANGE_EDGES)
+    ranges = dict(zip(AMOUNT_RANGE_NAMES, range_counts.tolist()))
+
+    median_index = len(amounts_np) // 2
 
     return {
-        "recurring_amounts": sorted(recurring_amounts, reverse=True)[:10],
+        "recurring_amounts": recurring_amounts.tolist(),
         "amount_ranges": ranges,
         "statistics": {
-            "min_amount": min(amounts),
-            "max_amount": max(amounts),
-            "avg_amount": sum(amounts) / len(amounts),
-            "median_amount": sorted(amounts)[len(amounts) // 2]
+            "min_amount": float(amounts_np.min()),
+            "max_amount": float(amounts_np.max()),
+            "avg_amount": float(amounts_np.mean()),
+            "median_amount": float(np.partition(amounts_np, median_index)[median_index])
         }
     }
 
@@ -235,31 +288,28 @@ def analyze_description_patterns(transactions: List[Dict]) -> Dict[str, Any]:
     """Analyze description patterns in transactions"""
     descriptions = []
     for transaction in transactions:
-        desc = str(transaction.get('Description', transaction.get('description', '')))
+        desc = str(transaction.get('description') or '')
         if desc:
             descriptions.append(desc)
 
     if not descriptions:
         return {"patterns": [], "common_words": []}
 
-    # Find common words in descriptions (excluding common stop words)
-    stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'an', 'a'}
+    # Find common words in descriptions (excluding common stop words).
+    # Punctuation is stripped from the whole description in one regex pass,
+    # so "mcdonald's" still counts as "mcdonalds".
     word_counts = Counter()
-
+    update = word_counts.update
     for desc in descriptions:
-        words = desc.lower().split()
-        for word in words:
-            # Remove punctuation
-            word = ''.join(c for c in word if c.isalnum())
-            if len(word) > 2 and word not in stop_words:
-                word_counts[word] += 1
+        words = _PUNCTUATION_RE.sub('', desc.lower()).split()
+        update(word for word in words if len(word) > 2 and word not in DESCRIPTION_STOP_WORDS)
 
     common_words = word_counts.most_common(20)
 
     return {
         "common_words": [{"word": word, "count": count} for word, count in common_words],
         "total_descriptions": len(descriptions),
-        "avg_description_length": sum(len(desc) for desc in descriptions) / len(descriptions)
+        "avg_description_length": sum(map(len, descriptions)) / len(descriptions)
     }
 
 
@@ -270,40 +320,42 @@ def calculate_transaction_statistics(transactions: List[Dict]) -> Dict[str, Any]
 
     for transaction in transactions:
         # Extract amounts
-        amount = transaction.get('Amount', transaction.get('amount', 0))
+        amount = transaction.get('amount', 0)
         try:
             amounts.append(float(amount))
         except (ValueError, TypeError):
             continue
 
         # Extract dates
-        date_str = transaction.get('Date', transaction.get('date', ''))
-        if date_str:
-            try:
-                dates.append(datetime.fromisoformat(date_str.replace('Z', '+00:00')))
-            except (ValueError, TypeError):
-                continue
+        date = parse_iso_datetime(transaction.get('date'))
+        if date:
+            dates.append(date)
 
     if not amounts:
         return {"error": "No valid amounts found"}
 
+    amounts_np = np.asarray(amounts, dtype=np.float64)
+    total_volume = float(amounts_np.sum())
+    median_index = len(amounts_np) // 2
+
     stats = {
         "amounts": {
             "count": len(amounts),
-            "min": min(amounts),
-            "max": max(amounts),
-            "average": sum(amounts) / len(amounts),
-            "median": sorted(amounts)[len(amounts) // 2],
-            "total_volume": sum(amounts)
+            "min": float(amounts_np.min()),
+            "max": float(amounts_np.max()),
+            "average": total_volume / len(amounts),
+            "median": float(np.partition(amounts_np, median_index)[median_index]),
+            "total_volume": total_volume
         }
     }
 
     if dates:
+        earliest, latest = min(dates), max(dates)
         stats["dates"] = {
             "count": len(dates),
-            "earliest": min(dates).isoformat(),
-            "latest": max(dates).isoformat(),
-            "date_range_days": (max(dates) - min(dates)).days
+            "earliest": earliest.isoformat(),
+            "latest": latest.isoformat(),
+            "date_range_days": (latest - earliest).days
         }
 
     return stats
@@ -4,10 +4,14 @@ Rules API endpoints for rule management and matching
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Body
 from fastapi.responses import JSONResponse
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, Iterable, List, Optional
+import bisect
+import heapq
 import logging
 from datetime import datetime
 
+from starlette.concurrency import run_in_threadpool
+
 from ..models.rule import (
     Rule, RuleCreate, RuleUpdate, RulePreview, RuleValidation,
     RuleMatch
@@ -23,6 +27,40 @@ router = APIRouter(prefix="/rules", tags=["Rules"])
 # In-memory rule storage for MVP (could be replaced with database)
 rules_db: Dict[str, Rule] = {}
 
+# Rule indices kept sorted by priority (highest first), then creation date.
+# They are maintained by save_rule/delete_rule so reads never sort.
+rules_sorted: List[Rule] = []
+active_rules: List[Rule] = []
+
+# Cap on a rule's applied-transaction history; it is returned with every rule
+MAX_RULE_TRANSACTION_IDS = 10_000
+
+
+def _rule_sort_key(rule: Rule):
+    """Sort key for the rule indices"""
+    return (-rule.priority, rule.created_at)
+
+
+def _unindex_rule(rule_id: str) -> None:
+    """Remove a rule from the sorted indices"""
+    # Rules are updated in place, so an indexed rule's key may be stale; match on ID
+    for index in (rules_sorted, active_rules):
+        for position, indexed in enumerate(index):
+            if indexed.id == rule_id:
+                del index[position]
+                break
+
+
+def record_rule_transactions(rule: Rule, transaction_ids: Iterable[str]) -> None:
+    """Append transaction IDs to a rule's history, skipping duplicates and capping its size"""
+    known_ids = set(rule.transaction_ids)
+    for transaction_id in transaction_ids:
+        if len(rule.transaction_ids) >= MAX_RULE_TRANSACTION_IDS:
+            break
+        if transaction_id not in known_ids:
+            known_ids.add(transaction_id)
+            rule.transaction_ids.append(transaction_id)
+
 
 def get_rule_by_id(rule_id: str) -> Rule:
     """Get a rule by ID"""
@@ -33,7 +71,12 @@ def get_rule_by_id(rule_id: str) -> Rule:
 
 def save_rule(rule: Rule) -> Rule:
     """Save a rule to the database"""
+    _unindex_rule(rule.id)
+    rule_engine.invalidate_rule(rule.id)
     rules_db[rule.id] = rule
+    bisect.insort(rules_sorted, rule, key=_rule_sort_key)
+    if rule.is_active:
+        bisect.insort(active_rules, rule, key=_rule_sort_key)
     return rule
 
 
@@ -41,6 +84,8 @@ def delete_rule(rule_id: str) -> bool:
     """Delete a rule from the database"""
     if rule_id in rules_db:
         del rules_db[rule_id]
+        _unindex_rule(rule_id)
+        rule_engine.invalidate_rule(rule_id)
         return True
     return False
 
@@ -53,12 +98,13 @@ async def create_rule(rule_data: RuleCreate):
     - **rule_data**: Rule configuration data
     """
     try:
-        # Create new rule
+        # Create new rule (random IDs can't collide under concurrent creates)
+        now = datetime.utcnow()
         rule = Rule(
             **rule_data.dict(),
-            id=f"rule_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}_{len(rules_db)}",
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            id=rule_engine.generate_rule_id(),
+            created_at=now,
+            updated_at=now,
             match_count=0,
             transaction_ids=[]
         )
@@ -101,14 +147,8 @@ async def list_rules(
     - **offset**: Number of rules to skip (default: 0)
     """
     try:
-        rules = list(rules_db.values())
-
-        # Filter active rules if requested
-        if active_only:
-            rules = [rule for rule in rules if rule.is_active]
-
-        # Sort by priority (highest first), then by creation date
-        rules.sort(key=lambda r: (-r.priority, r.created_at))
+        # Indices are already sorted by priority (highest first), then by creation date
+        rules = active_rules if active_only else rules_sorted
 
         # Apply pagination
         paginated_rules = rules[offset:offset + limit]
@@ -147,10 +187,11 @@ async def update_rule(rule_id: str, updates: RuleUpdate):
     - **updates**: Fields to update
     """
     try:
-        rule = get_rule_by_id(rule_id)
+        # Work on a copy so a rejected update leaves the stored rule untouched
+        rule = get_rule_by_id(rule_id).model_copy()
 
-        # Apply updates
-        update_data = updates.dict(exclude_unset=True)
+        # Apply updates (keep nested conditions/regex as models, not dicts)
+        update_data = {field: getattr(updates, field) for field in updates.model_fields_set}
         for field, value in update_data.items():
             if hasattr(rule, field):
                 setattr(rule, field, value)
@@ -223,7 +264,7 @@ async def preview_rule(
         rule = get_rule_by_id(rule_id)
 
         # Get transactions from file
-        processed_data = storage_manager.get_processed_data(file_id)
+        processed_data = await run_in_threadpool(storage_manager.get_processed_data, file_id)
         if not processed_data:
             raise HTTPException(status_code=404, detail="File not processed yet")
 
@@ -261,7 +302,7 @@ async def apply_rule(
         rule = get_rule_by_id(rule_id)
 
         # Get transactions from file
-        processed_data = storage_manager.get_processed_data(file_id)
+        processed_data = await run_in_threadpool(storage_manager.get_processed_data, file_id)
         if not processed_data:
             raise HTTPException(status_code=404, detail="File not processed yet")
 
@@ -272,24 +313,35 @@ async def apply_rule(
 
         # Filter to specific transactions if provided
         if transaction_ids:
-            matches = [m for m in matches if m.transaction_id in transaction_ids]
+            ids_set = set(transaction_ids)
+            matches = [m for m in matches if m.transaction_id in ids_set]
+
+        # Index transaction positions by ID once instead of scanning per match
+        position_by_id = {str(t.get('id', '')): position for position, t in enumerate(transactions)}
 
-        # Apply the rule (update labels)
+        # Apply the rule (update labels) to copies; the cached data is shared with other requests
+        updated_transactions = list(transactions)
         updated_count = 0
         for match in matches:
             # Find the transaction
-            transaction = next((t for t in transactions if str(t.get('id', '')) == match.transaction_id), None)
-            if transaction and rule.label_id:
-                transaction['label'] = rule.label_id
-                transaction['label_confidence'] = match.confidence
+            position = position_by_id.get(match.transaction_id)
+            if position is not None and rule.label_id:
+                updated_transactions[position] = {
+                    **transactions[position],
+                    'label': rule.label_id,
+                    'label_confidence': match.confidence,
+                }
                 updated_count += 1
 
-        # Save updated data
-        storage_manager.save_processed_data(file_id, processed_data)
+        # Save updated data; it only replaces the cached data once it is on disk
+        updated_data = {**processed_data, "transactions": updated_transactions}
+        saved = await run_in_threadpool(storage_manager.save_processed_data, file_id, updated_data)
+        if not saved:
+            raise HTTPException(status_code=500, detail="Failed to save labeled transactions")
 
         # Update rule match count
         rule.match_count += updated_count
-        rule.transaction_ids.extend([m.transaction_id for m in matches])
+        record_rule_transactions(rule, (m.transaction_id for m in matches))
         save_rule(rule)
 
         logger.info(f"Applied rule {rule_id} to {updated_count} transactions")
@@ -343,7 +395,7 @@ async def create_rule_from_transaction(
     """
     try:
         # Get transactions from file
-        processed_data = storage_manager.get_processed_data(file_id)
+        processed_data = await run_in_threadpool(storage_manager.get_processed_data, file_id)
         if not processed_data:
             raise HTTPException(status_code=404, detail="File not processed yet")
 
@@ -374,7 +426,7 @@ async def create_rule_from_transaction(
 async def match_rules(
     file_id: str = Query(..., description="File ID containing transactions"),
     rule_ids: Optional[List[str]] = Query(None, description="Specific rule IDs to match (optional, matches all if not provided)"),
-    limit: int = Query(100, description="Maximum number of matches to return")
+    limit: int = Query(100, ge=0, description="Maximum number of matches to return")
 ):
     """
     Find all rule matches for transactions in a file
@@ -385,7 +437,7 @@ async def match_rules(
     """
     try:
         # Get transactions from file
-        processed_data = storage_manager.get_processed_data(file_id)
+        processed_data = await run_in_threadpool(storage_manager.get_processed_data, file_id)
         if not processed_data:
             raise HTTPException(status_code=404, detail="File not processed yet")
 
@@ -395,20 +447,18 @@ async def match_rules(
         if rule_ids:
             rules = [get_rule_by_id(rid) for rid in rule_ids if rid in rules_db]
         else:
+            # Creation order, not priority order: equal-confidence matches keep
+            # the order rules were added in when the limit cuts them off
             rules = [rule for rule in rules_db.values() if rule.is_active]
 
         if not rules:
             return []
 
-        # Find all matches
-        all_matches = []
-        for rule in rules:
-            matches = rule_engine.find_matching_transactions(rule, transactions)
-            all_matches.extend(matches)
+        # Find all matches in one pass over the transactions
+        all_matches = rule_engine.find_matches_bulk(rules, transactions)
 
-        # Sort by confidence (highest first) and limit results
-        all_matches.sort(key=lambda m: m.confidence, reverse=True)
-        limited_matches = all_matches[:limit]
+        # Keep the highest-confidence matches without sorting the discarded tail
+        limited_matches = heapq.nlargest(limit, all_matches, key=lambda m: m.confidence)
 
         logger.info(f"Found {len(all_matches)} rule matches, returning {len(limited_matches)}")
         return limited_matches
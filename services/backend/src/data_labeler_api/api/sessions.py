@@ -2,14 +2,29 @@
 Sessions API endpoints for state persistence
 """
 
-from fastapi import APIRouter, HTTPException, Body
+from fastapi import APIRouter, HTTPException, Body, Request, Response
 from fastapi.responses import JSONResponse
-from typing import List, Optional
+from pydantic import TypeAdapter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import gzip
 import logging
+import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-import json
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+from starlette.concurrency import run_in_threadpool
+
+from ..models.base import fast_constructor, trusted
 from ..models.session import (
     PersistedState,
     SessionMetadata,
@@ -19,6 +34,7 @@ from ..models.session import (
     SyncStatus
 )
 from ..core.config import get_settings
+from ..utils.files import atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -28,54 +44,469 @@ router = APIRouter(prefix="/sessions", tags=["Sessions"])
 # Session storage directory
 SESSIONS_DIR = Path(settings.data_dir) / "sessions"
 SESSIONS_DIR.mkdir(parents=True, exist_ok=True)
+# Prefix for building session file paths as plain strings on hot paths
+_SESSIONS_PATH_PREFIX = f"{SESSIONS_DIR}{os.sep}"
 
 ACTIVE_SESSION_FILE = SESSIONS_DIR / "active_session.txt"
 
+# Sessions are stored gzipped; level 1 gets most of the size win for little CPU
+SESSION_FILE_SUFFIX = ".json.gz"
+SESSION_COMPRESS_LEVEL = 1
+# Uncompressed files from before compression are still read, and replaced on the next save
+LEGACY_SESSION_FILE_SUFFIX = ".json"
+
+# Serializes sessions straight to JSON bytes in pydantic-core, skipping the model_dump copy
+persisted_state_adapter = TypeAdapter(PersistedState)
+
+# Unvalidated PersistedState constructor for states assembled from a validated request
+build_persisted_state = fast_constructor(PersistedState)
+
+# Metadata of every session keyed by session ID, so listing never parses full sessions
+SESSIONS_INDEX_FILE = SESSIONS_DIR / "_index.json"
+SESSIONS_INDEX_LOCK_FILE = SESSIONS_DIR / "_index.lock"
+
+# Serializes index read-modify-writes within this process; flock covers other workers
+_index_lock = threading.Lock()
+
+# Parsed index with the (mtime_ns, size) it was read at; other workers' writes change the key
+_index_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
+# Latest not-yet-written state per session, flushed after the write debounce
+_pending_sessions: Dict[str, PersistedState] = {}
+# Guards _pending_sessions between the event loop and flushing threads
+_pending_lock = threading.Lock()
+# Serializes flush writes with deletes so a deleted session is never written back
+_session_write_lock = threading.Lock()
+_flush_task: Optional[asyncio.Task] = None
+_flush_scheduled = False
+
+# Active session ID with the (mtime_ns, size) of the marker file it was read from
+_active_session_cache: Optional[Tuple[Tuple[int, int], str]] = None
+
 
 def get_session_file(session_id: str) -> Path:
     """Get the file path for a session"""
-    return SESSIONS_DIR / f"{session_id}.json"
+    return SESSIONS_DIR / f"{session_id}{SESSION_FILE_SUFFIX}"
+
+
+def get_legacy_session_file(session_id: str) -> Path:
+    """Get the path an uncompressed session file would have"""
+    return SESSIONS_DIR / f"{session_id}{LEGACY_SESSION_FILE_SUFFIX}"
+
+
+def read_session_bytes(path: str) -> bytes:
+    """Read a session file as JSON bytes, decompressing it if needed"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return gzip.decompress(raw) if path.endswith(".gz") else raw
+
+
+@lru_cache(maxsize=512)
+def _parse_session_file(path: str, mtime_ns: int, size: int) -> PersistedState:
+    """Parse a session file; mtime_ns and size only key the cache, so rewrites miss"""
+    # orjson + validate beats validate_json here: data_state is Any, which pydantic parses slowly
+    return PersistedState.model_validate(orjson.loads(read_session_bytes(path)))
+
+
+def load_session_path(path: str, stat: Optional[os.stat_result] = None) -> PersistedState:
+    """Load a session file, reusing the parsed state while the file is unchanged"""
+    stat = stat or os.stat(path)
+    return _parse_session_file(path, stat.st_mtime_ns, stat.st_size)
 
 
 def load_session_from_file(session_id: str) -> Optional[PersistedState]:
     """Load a session from file"""
-    try:
-        session_file = get_session_file(session_id)
-        if not session_file.exists():
-            return None
+    found = stat_session_file(session_id)
+    if not found:
+        return None
 
-        with open(session_file, 'r') as f:
-            data = json.load(f)
-            return PersistedState(**data)
+    try:
+        return load_session_path(*found)
+    except FileNotFoundError:
+        return None
     except Exception as e:
         logger.error(f"Failed to load session {session_id}: {e}")
         return None
 
 
+def stat_session_file(session_id: str) -> Optional[Tuple[str, os.stat_result]]:
+    """Stat a session file, returning its path and stat result if it exists"""
+    base = _SESSIONS_PATH_PREFIX + session_id
+    for path in (base + SESSION_FILE_SUFFIX, base + LEGACY_SESSION_FILE_SUFFIX):
+        try:
+            return path, os.stat(path)
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip; q=0 refuses it, an explicit entry beats *"""
+    wildcard_q = None
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard_q = q
+    return wildcard_q is not None and wildcard_q > 0
+
+
+def session_etag(stat: os.stat_result, encoding: str = "") -> str:
+    """ETag for one encoding of a session file; atomic rewrites always change (mtime, size)"""
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{suffix}"'
+
+
+def serialize_session(session: PersistedState) -> bytes:
+    """Serialize a session exactly as it is stored on disk"""
+    # Compact output: indentation repeats per row of data_state and can dominate the file
+    return persisted_state_adapter.dump_json(session, by_alias=True)
+
+
 def save_session_to_file(session: PersistedState) -> bool:
     """Save a session to file"""
     try:
-        session_file = get_session_file(session.session_id)
-        with open(session_file, 'w') as f:
-            json.dump(session.dict(by_alias=True), f, default=str, indent=2)
+        payload = gzip.compress(
+            serialize_session(session), compresslevel=SESSION_COMPRESS_LEVEL, mtime=0
+        )
+        atomic_write_bytes(get_session_file(session.session_id), payload)
+        get_legacy_session_file(session.session_id).unlink(missing_ok=True)
+        update_session_index(session.session_id, session.metadata)
         return True
     except Exception as e:
         logger.error(f"Failed to save session {session.session_id}: {e}")
         return False
 
 
+def get_pending_session(session_id: str) -> Optional[PersistedState]:
+    """Get a saved session that has not been written to disk yet"""
+    with _pending_lock:
+        return _pending_sessions.get(session_id)
+
+
+def _write_pending_session(session_id: str, session: PersistedState) -> bool:
+    """Write one pending save, unless it was superseded or deleted meanwhile"""
+    with _session_write_lock:
+        with _pending_lock:
+            if _pending_sessions.get(session_id) is not session:
+                return True
+
+        if not save_session_to_file(session):
+            return False
+
+        with _pending_lock:
+            if _pending_sessions.get(session_id) is session:
+                del _pending_sessions[session_id]
+        return True
+
+
+async def flush_pending_sessions() -> bool:
+    """Write every pending session save to disk, returning whether all of them were written"""
+    with _pending_lock:
+        pending = list(_pending_sessions.items())
+
+    flushed = True
+    for session_id, session in pending:
+        if not await run_in_threadpool(_write_pending_session, session_id, session):
+            logger.error(f"Failed to flush session {session_id}")
+            flushed = False
+    return flushed
+
+
+def _schedule_flush(delay: float) -> None:
+    """Start a debounced flush unless one is already waiting on this event loop"""
+    global _flush_task, _flush_scheduled
+    # A flush left behind by a stopped event loop will never run, so replace it
+    loop = asyncio.get_running_loop()
+    if not _flush_scheduled or _flush_task.done() or _flush_task.get_loop() is not loop:
+        _flush_scheduled = True
+        _flush_task = asyncio.create_task(_flush_after_debounce(delay))
+
+
+async def _flush_after_debounce(delay: float) -> None:
+    """Flush pending saves once the debounce window has passed, retrying failed writes"""
+    global _flush_scheduled
+    try:
+        await asyncio.sleep(delay)
+    except asyncio.CancelledError:
+        _flush_scheduled = False
+        raise
+
+    # Saves arriving from here on schedule their own flush
+    _flush_scheduled = False
+    if not await flush_pending_sessions():
+        # Failed saves stay pending; retry them without waiting for another save
+        _schedule_flush(delay)
+
+
+async def save_session(session: PersistedState) -> bool:
+    """
+    Save a session, coalescing rapid saves of the same session
+
+    Saves are written immediately unless a write debounce is configured. With
+    one, the state is queued and written by a background flush, so only the
+    latest of a burst of saves hits the disk; reads see queued state
+    immediately, and failed flushes are retried.
+
+    Args:
+        session: Session state to persist
+
+    Returns:
+        True if the session was saved or queued
+    """
+    delay = get_settings().session_write_debounce_ms / 1000
+    if delay <= 0:
+        return await run_in_threadpool(save_session_to_file, session)
+
+    with _pending_lock:
+        _pending_sessions[session.session_id] = session
+    _schedule_flush(delay)
+    return True
+
+
+def iter_session_entries() -> List[os.DirEntry]:
+    """List session files as directory entries, without building a Path per file"""
+    with os.scandir(SESSIONS_DIR) as entries:
+        return [
+            entry for entry in entries
+            if entry.name.endswith((SESSION_FILE_SUFFIX, LEGACY_SESSION_FILE_SUFFIX))
+            and entry.name != SESSIONS_INDEX_FILE.name
+            and entry.is_file(follow_symlinks=False)
+        ]
+
+
+@contextmanager
+def _locked_index() -> Iterator[None]:
+    """Hold the session index lock across threads and, where supported, processes"""
+    with _index_lock, open(SESSIONS_INDEX_LOCK_FILE, 'a') as lock_file:
+        if fcntl is not None:
+            # Released when the lock file is closed
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def _read_index() -> Optional[Dict[str, Any]]:
+    """
+    Read the session index, or None if it is missing or unreadable
+
+    The parsed index is reused while the file's (mtime, size) is unchanged,
+    so a steady-state read is a single stat. Callers must not mutate it.
+    """
+    global _index_cache
+    try:
+        stat = os.stat(SESSIONS_INDEX_FILE)
+        cache_key = (stat.st_mtime_ns, stat.st_size)
+        cached = _index_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
+        with open(SESSIONS_INDEX_FILE, 'rb') as f:
+            index = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except orjson.JSONDecodeError as e:
+        logger.warning(f"Rebuilding unreadable session index: {e}")
+        return None
+
+    _index_cache = (cache_key, index)
+    return index
+
+
+def _write_index(index: Dict[str, Any]) -> None:
+    """Replace the session index in one step so readers never see a partial file"""
+    global _index_cache
+    atomic_write_bytes(SESSIONS_INDEX_FILE, orjson.dumps(index))
+
+    # Write-through; safe because writers hold the index lock
+    stat = os.stat(SESSIONS_INDEX_FILE)
+    _index_cache = ((stat.st_mtime_ns, stat.st_size), index)
+
+
+def _build_index() -> Dict[str, Any]:
+    """Build the session index from the session files themselves"""
+    index: Dict[str, Any] = {}
+    # Name order puts a compressed file after a leftover legacy one, so the newer wins
+    for entry in sorted(iter_session_entries(), key=lambda entry: entry.name):
+        try:
+            # Only the metadata subtree is validated; data_state can be the whole dataset
+            raw_metadata = orjson.loads(read_session_bytes(entry.path)).get("metadata")
+            if raw_metadata is None:
+                continue
+            metadata = SessionMetadata.model_validate(raw_metadata)
+            index[metadata.session_id] = metadata.model_dump(mode="json", by_alias=True)
+        except Exception as e:
+            logger.warning(f"Failed to load session from {entry.path}: {e}")
+    return index
+
+
+def is_session_indexed(session_id: str) -> bool:
+    """Check the metadata index for a session; a single stat while the index is unchanged"""
+    index = _read_index()
+    return index is not None and session_id in index
+
+
+def update_session_index(session_id: str, metadata: Optional[SessionMetadata]) -> None:
+    """Set a session's entry in the metadata index, or remove it when metadata is None"""
+    with _locked_index():
+        index = _read_index()
+        # Copy so the cached index only changes once the new file is written
+        index = _build_index() if index is None else dict(index)
+
+        if metadata is None:
+            index.pop(session_id, None)
+        else:
+            index[session_id] = metadata.model_dump(mode="json", by_alias=True)
+        _write_index(index)
+
+
+def load_session_metadata() -> List[Dict[str, Any]]:
+    """
+    Load metadata for every session from the index, newest first
+
+    Entries were validated when they were indexed, and the endpoint's
+    response model validates them again, so they are returned as plain dicts.
+    """
+    # The index is replaced atomically, so only a rebuild needs the lock
+    index = _read_index()
+    if index is None:
+        with _locked_index():
+            index = _read_index()
+            if index is None:
+                index = _build_index()
+                _write_index(index)
+
+    entries = dict(index)
+    with _pending_lock:
+        pending = list(_pending_sessions.values())
+    for session in pending:
+        entries[session.session_id] = session.metadata.model_dump(mode="json", by_alias=True)
+
+    # Sort by last modified (newest first); indexed timestamps share one ISO format
+    return sorted(entries.values(), key=lambda meta: meta.get("lastModified") or "", reverse=True)
+
+
+def read_active_session() -> Optional[str]:
+    """Read the active session ID, if one is set; a single stat while the marker is unchanged"""
+    global _active_session_cache
+    try:
+        stat = os.stat(ACTIVE_SESSION_FILE)
+        cache_key = (stat.st_mtime_ns, stat.st_size)
+        cached = _active_session_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
+        with open(ACTIVE_SESSION_FILE, 'r') as f:
+            session_id = f.read().strip()
+    except FileNotFoundError:
+        return None
+
+    _active_session_cache = (cache_key, session_id)
+    return session_id
+
+
+def write_active_session(session_id: str) -> None:
+    """Persist the active session ID"""
+    global _active_session_cache
+    atomic_write_bytes(ACTIVE_SESSION_FILE, session_id.encode())
+    stat = os.stat(ACTIVE_SESSION_FILE)
+    _active_session_cache = ((stat.st_mtime_ns, stat.st_size), session_id)
+
+
+def clear_active_session(session_id: Optional[str] = None) -> None:
+    """Clear the active session, or only if it is session_id when given"""
+    if session_id is not None and read_active_session() != session_id:
+        return
+    ACTIVE_SESSION_FILE.unlink(missing_ok=True)
+
+
+def clear_session_files() -> int:
+    """Delete every session file and the active session marker"""
+    count = 0
+    with _session_write_lock:
+        with _pending_lock:
+            _pending_sessions.clear()
+
+        for entry in iter_session_entries():
+            try:
+                os.unlink(entry.path)
+                count += 1
+            except Exception as e:
+                logger.warning(f"Failed to delete {entry.path}: {e}")
+
+        with _locked_index():
+            _write_index({})
+    clear_active_session()
+    return count
+
+
 def delete_session_file(session_id: str) -> bool:
     """Delete a session file"""
     try:
-        session_file = get_session_file(session_id)
-        if session_file.exists():
-            session_file.unlink()
+        with _session_write_lock:
+            with _pending_lock:
+                _pending_sessions.pop(session_id, None)
+
+            base = _SESSIONS_PATH_PREFIX + session_id
+            for path in (base + SESSION_FILE_SUFFIX, base + LEGACY_SESSION_FILE_SUFFIX):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            update_session_index(session_id, None)
         return True
     except Exception as e:
         logger.error(f"Failed to delete session {session_id}: {e}")
         return False
 
 
+@router.get("/active", response_model=dict)
+async def get_active_session():
+    """
+    Get the active session ID
+    """
+    try:
+        # Usually just a stat, cheaper than a threadpool hop
+        session_id = read_active_session()
+        return {"sessionId": session_id}
+
+    except Exception as e:
+        logger.error(f"Error getting active session: {e}")
+        return {"sessionId": None}
+
+
+@router.post("/active", response_model=dict)
+async def set_active_session(data: dict = Body(...)):
+    """
+    Set the active session ID
+
+    - **sessionId**: Session ID to set as active
+    """
+    try:
+        session_id = data.get("sessionId")
+        if not session_id:
+            raise HTTPException(status_code=400, detail="sessionId is required")
+
+        await run_in_threadpool(write_active_session, session_id)
+
+        return {"success": True, "sessionId": session_id}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error setting active session: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to set active session: {str(e)}")
+
+
 @router.post("/{session_id}", response_model=SessionResponse)
 async def create_or_update_session(
     session_id: str,
@@ -91,22 +522,28 @@ async def create_or_update_session(
         now = datetime.utcnow()
 
         # Load existing session if it exists
-        existing = load_session_from_file(session_id)
+        existing = get_pending_session(session_id) or await run_in_threadpool(
+            load_session_from_file, session_id
+        )
 
-        # Create persisted state
-        persisted_state = PersistedState(
+        # Create persisted state. Every input was validated with the request
+        # body, so the frontend state dict is stored as-is instead of being
+        # copied through a second validation pass.
+        persisted_state = build_persisted_state(
             session_id=session_id,
             data_state=session_data.data_state,
             active_tab=session_data.active_tab,
-            metadata=SessionMetadata(
+            metadata=trusted(
+                SessionMetadata,
                 session_id=session_id,
                 file_name=session_data.metadata.file_name,
                 last_modified=now,
                 row_count=session_data.metadata.row_count,
                 label_count=session_data.metadata.label_count,
                 rule_count=session_data.metadata.rule_count,
-                storage_type=StorageType.BACKEND,
-                sync_status=SyncStatus.SYNCED,
+                # Plain values, as use_enum_values stores them after validation
+                storage_type=StorageType.BACKEND.value,
+                sync_status=SyncStatus.SYNCED.value,
                 last_synced_at=now,
                 version=session_data.metadata.version or "1.0.0"
             ),
@@ -115,16 +552,21 @@ async def create_or_update_session(
         )
 
         # Save to file
-        if not save_session_to_file(persisted_state):
+        if not await save_session(persisted_state):
             raise HTTPException(status_code=500, detail="Failed to save session")
 
-        logger.info(f"Saved session: {session_id}")
+        logger.info("Saved session: %s", session_id)
+
+        metadata = persisted_state.metadata
+        if get_pending_session(session_id) is persisted_state:
+            # Queued by the write debounce: not on disk until the flush succeeds
+            metadata = metadata.model_copy(update={"sync_status": SyncStatus.PENDING.value})
 
         return SessionResponse(
             success=True,
             session_id=session_id,
             timestamp=now,
-            metadata=persisted_state.metadata
+            metadata=metadata
         )
 
     except HTTPException:
@@ -134,20 +576,63 @@ async def create_or_update_session(
         raise HTTPException(status_code=500, detail=f"Failed to save session: {str(e)}")
 
 
-@router.get("/{session_id}", response_model=PersistedState)
-async def get_session(session_id: str):
+@router.get("/{session_id}", responses={200: {"model": PersistedState}})
+async def get_session(session_id: str, request: Request):
     """
     Get a session by ID
 
     - **session_id**: Unique session identifier
+
+    The stored file already is the response JSON, so it is served as-is;
+    uncompressed legacy files are re-serialized first.
+    Supports conditional requests: an If-None-Match matching the current
+    ETag returns 304 with no body.
     """
     try:
-        session = load_session_from_file(session_id)
+        # A queued save is newer than the file on disk
+        pending = get_pending_session(session_id)
+        if pending is not None:
+            content = await run_in_threadpool(serialize_session, pending)
+            return Response(
+                content=content,
+                media_type="application/json",
+                headers={"Cache-Control": "no-store"}
+            )
+
+        found = await run_in_threadpool(stat_session_file, session_id)
+        if not found:
+            raise HTTPException(status_code=404, detail="Session not found")
 
-        if not session:
+        path, stat = found
+        # Clients that accept gzip get the stored bytes without decompressing them
+        serve_gzip = (
+            path.endswith(".gz") and accepts_gzip(request.headers.get("accept-encoding", ""))
+        )
+        etag = session_etag(stat, "gzip" if serve_gzip else "")
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, max-age=0",
+            "Vary": "Accept-Encoding",
+        }
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        try:
+            if serve_gzip:
+                content = await run_in_threadpool(Path(path).read_bytes)
+                headers["Content-Encoding"] = "gzip"
+            elif path.endswith(LEGACY_SESSION_FILE_SUFFIX):
+                # Legacy files were written with json.dump(default=str), so re-serialize
+                # them for ISO datetimes; the next save replaces them with a .json.gz
+                state = await run_in_threadpool(load_session_path, path, stat)
+                content = await run_in_threadpool(serialize_session, state)
+            else:
+                content = await run_in_threadpool(read_session_bytes, path)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        return session
+        return Response(content=content, media_type="application/json", headers=headers)
 
     except HTTPException:
         raise
@@ -164,17 +649,13 @@ async def delete_session(session_id: str):
     - **session_id**: Unique session identifier
     """
     try:
-        if not delete_session_file(session_id):
+        if not await run_in_threadpool(delete_session_file, session_id):
             raise HTTPException(status_code=404, detail="Session not found")
 
         # Clear active session if it was this one
-        if ACTIVE_SESSION_FILE.exists():
-            with open(ACTIVE_SESSION_FILE, 'r') as f:
-                active = f.read().strip()
-                if active == session_id:
-                    ACTIVE_SESSION_FILE.unlink()
+        await run_in_threadpool(clear_active_session, session_id)
 
-        logger.info(f"Deleted session: {session_id}")
+        logger.info("Deleted session: %s", session_id)
 
         return SessionResponse(
             success=True,
@@ -195,22 +676,7 @@ async def list_sessions():
     List all sessions
     """
     try:
-        sessions: List[SessionMetadata] = []
-
-        for session_file in SESSIONS_DIR.glob("*.json"):
-            try:
-                with open(session_file, 'r') as f:
-                    data = json.load(f)
-                    state = PersistedState(**data)
-                    sessions.append(state.metadata)
-            except Exception as e:
-                logger.warning(f"Failed to load session from {session_file}: {e}")
-                continue
-
-        # Sort by last modified (newest first)
-        sessions.sort(key=lambda s: s.last_modified, reverse=True)
-
-        return sessions
+        return await run_in_threadpool(load_session_metadata)
 
     except Exception as e:
         logger.error(f"Error listing sessions: {e}")
@@ -224,72 +690,25 @@ async def session_exists(session_id: str):
 
     - **session_id**: Unique session identifier
     """
-    exists = get_session_file(session_id).exists()
+    # Queued and indexed sessions answer from memory; only misses touch the session files
+    exists = (
+        get_pending_session(session_id) is not None
+        or is_session_indexed(session_id)
+        or await run_in_threadpool(stat_session_file, session_id) is not None
+    )
     return JSONResponse(
         content={"exists": exists, "sessionId": session_id},
         status_code=200 if exists else 404
     )
 
 
-@router.get("/active", response_model=dict)
-async def get_active_session():
-    """
-    Get the active session ID
-    """
-    try:
-        if not ACTIVE_SESSION_FILE.exists():
-            return {"sessionId": None}
-
-        with open(ACTIVE_SESSION_FILE, 'r') as f:
-            session_id = f.read().strip()
-            return {"sessionId": session_id}
-
-    except Exception as e:
-        logger.error(f"Error getting active session: {e}")
-        return {"sessionId": None}
-
-
-@router.post("/active", response_model=dict)
-async def set_active_session(data: dict = Body(...)):
-    """
-    Set the active session ID
-
-    - **sessionId**: Session ID to set as active
-    """
-    try:
-        session_id = data.get("sessionId")
-        if not session_id:
-            raise HTTPException(status_code=400, detail="sessionId is required")
-
-        with open(ACTIVE_SESSION_FILE, 'w') as f:
-            f.write(session_id)
-
-        return {"success": True, "sessionId": session_id}
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error setting active session: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to set active session: {str(e)}")
-
-
 @router.delete("", response_model=SessionResponse)
 async def clear_all_sessions():
     """
     Clear all sessions (use with caution)
     """
     try:
-        count = 0
-        for session_file in SESSIONS_DIR.glob("*.json"):
-            try:
-                session_file.unlink()
-                count += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete {session_file}: {e}")
-
-        # Clear active session
-        if ACTIVE_SESSION_FILE.exists():
-            ACTIVE_SESSION_FILE.unlink()
+        count = await run_in_threadpool(clear_session_files)
 
         logger.info(f"Cleared {count} sessions")
 
@@ -3,6 +3,7 @@ Configuration management for Data Labeler API
 """
 
 import os
+from functools import lru_cache
 from typing import List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -39,7 +40,16 @@ class Settings(BaseSettings):
     # Storage
     data_dir: Path = Field(default=Path("./data"))
     max_upload_size_mb: int = Field(default=10)
+    upload_chunk_size_kb: int = Field(default=1024, gt=0)
     file_retention_hours: int = Field(default=24)
+    redis_url: Optional[str] = Field(
+        default=None,
+        description="Redis URL for a file registry shared across workers (in-process when unset)"
+    )
+    registry_path: Optional[Path] = Field(
+        default=None,
+        description="SQLite file for a file registry shared by workers on one host"
+    )
 
     # Recommendations
     min_confidence: float = Field(default=0.6, ge=0.0, le=1.0)
@@ -51,7 +61,20 @@ class Settings(BaseSettings):
 
     # Processing
     max_concurrent_uploads: int = Field(default=5, gt=0)
+    processing_workers: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="Worker processes for CSV processing (defaults to CPU count)"
+    )
     request_timeout_seconds: int = Field(default=30, gt=0)
+    session_write_debounce_ms: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Opt-in delay for coalescing rapid saves of the same session; saves inside "
+            "the window are reported as pending until flushed (0 writes immediately)"
+        )
+    )
 
     class Config:
         """Pydantic configuration"""
@@ -63,17 +86,15 @@ class Settings(BaseSettings):
         extra = "ignore"
 
 
-# Global settings instance
-settings = Settings()
-
-
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings"""
-    return settings
+    """Get application settings, loaded from the environment once on first use"""
+    return Settings()
 
 
 def ensure_data_directories():
     """Create data directories if they don't exist"""
+    settings = get_settings()
     directories = [
         settings.data_dir / "uploads",
         settings.data_dir / "processed",
@@ -86,9 +107,14 @@ def ensure_data_directories():
 
 def get_upload_size_limit() -> int:
     """Get maximum upload size in bytes"""
-    return settings.max_upload_size_mb * 1024 * 1024
+    return get_settings().max_upload_size_mb * 1024 * 1024
+
+
+def get_upload_chunk_size() -> int:
+    """Get upload read/write chunk size in bytes"""
+    return get_settings().upload_chunk_size_kb * 1024
 
 
 def get_file_retention_seconds() -> int:
     """Get file retention time in seconds"""
-    return settings.file_retention_hours * 3600
\ No newline at end of file
+    return get_settings().file_retention_hours * 3600
\ No newline at end of file
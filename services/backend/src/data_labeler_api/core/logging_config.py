@@ -0,0 +1,59 @@
+"""
+Logging configuration for Data Labeler API
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def _build_stream_handler() -> logging.Handler:
+    """Create the handler that actually writes log lines"""
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+def configure_logging(level: int = logging.INFO):
+    """
+    Route application logging through a queue
+
+    Log calls only enqueue the record; a listener thread does the formatting
+    and writes, keeping that work off the request path.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, _build_stream_handler(), respect_handler_level=True)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def configure_worker_logging(level: int = logging.INFO):
+    """
+    Configure logging in a worker process
+
+    Workers log directly to the stream, since the parent's queue listener
+    thread does not run in them; a queue handler inherited by a forked
+    worker is removed.
+    """
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, QueueHandler):
+            root_logger.removeHandler(handler)
+
+    root_logger.setLevel(level)
+    root_logger.addHandler(_build_stream_handler())
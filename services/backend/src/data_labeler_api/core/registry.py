@@ -0,0 +1,334 @@
+"""
+File registry backends for the storage manager
+"""
+
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+import sqlite3
+import threading
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class FileRegistry:
+    """
+    In-process file registry
+
+    Each worker process has its own copy, so this is only correct with a
+    single worker; set ``REGISTRY_PATH`` (one host) or ``REDIS_URL`` to share
+    the registry across workers.
+    """
+
+    def __init__(self):
+        # Insertion-ordered by upload time
+        self._files: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self._files
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Get a file's registry entry"""
+        return self._files.get(file_id)
+
+    def add(self, file_info: Dict[str, Any]) -> None:
+        """Register a new file"""
+        self._files[file_info["file_id"]] = file_info
+
+    def update(self, file_id: str, updates: Dict[str, Any]) -> None:
+        """Merge fields into a file's entry, if it exists"""
+        if file_id in self._files:
+            self._files[file_id].update(updates)
+
+    def append(self, file_id: str, field: str, item: Any) -> None:
+        """Append an item to a list field of a file's entry, if it exists"""
+        if file_id in self._files:
+            self._files[file_id].setdefault(field, []).append(item)
+
+    def delete(self, file_id: str) -> bool:
+        """Remove a file's entry"""
+        return self._files.pop(file_id, None) is not None
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over all entries, oldest first"""
+        return iter(list(self._files.values()))
+
+    def page(self, session_id: Optional[str], offset: int,
+             limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Get one page of entries newest first, with the total matching count"""
+        # Newest-first is a reverse walk rather than a sort
+        if session_id is None:
+            page = islice(reversed(self._files.values()), offset, offset + limit)
+            return [file_info.copy() for file_info in page], len(self._files)
+
+        matching = [
+            file_info for file_info in reversed(self._files.values())
+            if file_info["session_id"] == session_id
+        ]
+        page = matching[offset:offset + limit]
+        return [file_info.copy() for file_info in page], len(matching)
+
+    def uploaded_before(self, cutoff: float) -> List[str]:
+        """Get the IDs of files uploaded before a Unix timestamp cutoff"""
+        # Entries are in upload order, so stop at the first one inside the window
+        stale = []
+        for file_id, file_info in self._files.items():
+            if upload_epoch(file_info) >= cutoff:
+                break
+            stale.append(file_id)
+        return stale
+
+
+class RedisFileRegistry(FileRegistry):
+    """
+    File registry stored in Redis, shared by every worker
+
+    Each entry is an orjson blob at ``reg:file:{file_id}``. Sorted sets scored
+    by upload time index all files (``reg:uploaded``) and each session's files
+    (``reg:session:{session_id}``), so listing and cleanup never scan entries.
+    """
+
+    FILE_KEY = "reg:file:{}"
+    SESSION_KEY = "reg:session:{}"
+    UPLOADED_KEY = "reg:uploaded"
+
+    # Entries fetched per MGET when iterating the whole registry
+    BATCH_SIZE = 500
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("REDIS_URL is set but the 'redis' package is not installed") from e
+
+        self._client = redis.Redis.from_url(url)
+
+    def _load_many(self, file_ids: List[bytes]) -> List[Dict[str, Any]]:
+        """Fetch entries for IDs in one round trip, skipping any that vanished"""
+        if not file_ids:
+            return []
+        blobs = self._client.mget([self.FILE_KEY.format(fid.decode()) for fid in file_ids])
+        return [orjson.loads(blob) for blob in blobs if blob is not None]
+
+    def _modify(self, file_id: str, change) -> None:
+        """Read-modify-write an entry atomically (retried if it changes meanwhile)"""
+        key = self.FILE_KEY.format(file_id)
+
+        def apply(pipe):
+            blob = pipe.get(key)
+            if blob is None:
+                return
+            file_info = orjson.loads(blob)
+            change(file_info)
+            pipe.multi()
+            pipe.set(key, orjson.dumps(file_info))
+
+        self._client.transaction(apply, key)
+
+    def __len__(self) -> int:
+        return self._client.zcard(self.UPLOADED_KEY)
+
+    def __contains__(self, file_id: str) -> bool:
+        return bool(self._client.exists(self.FILE_KEY.format(file_id)))
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        blob = self._client.get(self.FILE_KEY.format(file_id))
+        return orjson.loads(blob) if blob is not None else None
+
+    def add(self, file_info: Dict[str, Any]) -> None:
+        file_id = file_info["file_id"]
+        score = upload_epoch(file_info)
+        pipe = self._client.pipeline()
+        pipe.set(self.FILE_KEY.format(file_id), orjson.dumps(file_info))
+        pipe.zadd(self.UPLOADED_KEY, {file_id: score})
+        pipe.zadd(self.SESSION_KEY.format(file_info["session_id"]), {file_id: score})
+        pipe.execute()
+
+    def update(self, file_id: str, updates: Dict[str, Any]) -> None:
+        self._modify(file_id, lambda file_info: file_info.update(updates))
+
+    def append(self, file_id: str, field: str, item: Any) -> None:
+        self._modify(file_id, lambda file_info: file_info.setdefault(field, []).append(item))
+
+    def delete(self, file_id: str) -> bool:
+        key = self.FILE_KEY.format(file_id)
+
+        # WATCH the entry so a concurrent add or delete retries this instead of
+        # leaving index entries behind for a half-removed file
+        def remove(pipe) -> bool:
+            blob = pipe.get(key)
+            if blob is None:
+                return False
+            session_id = orjson.loads(blob)["session_id"]
+            pipe.multi()
+            pipe.delete(key)
+            pipe.zrem(self.UPLOADED_KEY, file_id)
+            pipe.zrem(self.SESSION_KEY.format(session_id), file_id)
+            return True
+
+        return self._client.transaction(remove, key, value_from_callable=True)
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        # Snapshot every ID up front: paging by rank would skip entries whenever
+        # another worker deletes files between pages
+        file_ids = self._client.zrange(self.UPLOADED_KEY, 0, -1)
+        for start in range(0, len(file_ids), self.BATCH_SIZE):
+            yield from self._load_many(file_ids[start:start + self.BATCH_SIZE])
+
+    def page(self, session_id: Optional[str], offset: int,
+             limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        index_key = self.SESSION_KEY.format(session_id) if session_id else self.UPLOADED_KEY
+        if limit <= 0:
+            return [], self._client.zcard(index_key)
+
+        pipe = self._client.pipeline()
+        pipe.zcard(index_key)
+        pipe.zrevrange(index_key, offset, offset + limit - 1)
+        total, file_ids = pipe.execute()
+        return self._load_many(file_ids), total
+
+    def uploaded_before(self, cutoff: float) -> List[str]:
+        # "(" makes the upper bound exclusive, matching uploaded_at_epoch < cutoff
+        file_ids = self._client.zrangebyscore(self.UPLOADED_KEY, "-inf", f"({cutoff}")
+        return [file_id.decode() for file_id in file_ids]
+
+
+class SqliteFileRegistry(FileRegistry):
+    """
+    File registry in a SQLite database, shared by every worker on one host
+
+    Entries are orjson blobs alongside indexed session and upload-time
+    columns. WAL mode lets workers read while another one writes, and
+    read-modify-writes take the write lock up front with BEGIN IMMEDIATE.
+    """
+
+    # Seconds to wait for another worker's write lock before failing
+    BUSY_TIMEOUT = 5.0
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit; transactions are opened explicitly where needed
+        self._conn = sqlite3.connect(
+            str(path), timeout=self.BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        # One connection shared by the threadpool, so calls are serialized
+        self._lock = threading.Lock()
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    file_id TEXT PRIMARY KEY,
+                    session_id TEXT NOT NULL,
+                    uploaded_at_epoch REAL NOT NULL,
+                    info BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS files_uploaded ON files (uploaded_at_epoch);
+                CREATE INDEX IF NOT EXISTS files_session ON files (session_id, uploaded_at_epoch);
+            """)
+
+    def _modify(self, file_id: str, change) -> None:
+        """Read-modify-write an entry under the database write lock"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT info FROM files WHERE file_id = ?", (file_id,)
+                ).fetchone()
+                if row is not None:
+                    file_info = orjson.loads(row[0])
+                    change(file_info)
+                    self._conn.execute(
+                        "UPDATE files SET info = ? WHERE file_id = ?",
+                        (orjson.dumps(file_info), file_id)
+                    )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM files")[0][0]
+
+    def __contains__(self, file_id: str) -> bool:
+        return bool(self._query("SELECT 1 FROM files WHERE file_id = ?", (file_id,)))
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT info FROM files WHERE file_id = ?", (file_id,))
+        return orjson.loads(rows[0][0]) if rows else None
+
+    def add(self, file_info: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (file_id, session_id, uploaded_at_epoch, info) "
+                "VALUES (?, ?, ?, ?)",
+                (file_info["file_id"], file_info["session_id"], upload_epoch(file_info),
+                 orjson.dumps(file_info))
+            )
+
+    def update(self, file_id: str, updates: Dict[str, Any]) -> None:
+        self._modify(file_id, lambda file_info: file_info.update(updates))
+
+    def append(self, file_id: str, field: str, item: Any) -> None:
+        self._modify(file_id, lambda file_info: file_info.setdefault(field, []).append(item))
+
+    def delete(self, file_id: str) -> bool:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM files WHERE file_id = ?", (file_id,))
+            return cursor.rowcount > 0
+
+    def values(self) -> Iterator[Dict[str, Any]]:
+        rows = self._query("SELECT info FROM files ORDER BY uploaded_at_epoch, rowid")
+        return (orjson.loads(info) for (info,) in rows)
+
+    def page(self, session_id: Optional[str], offset: int,
+             limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        where, params = ("WHERE session_id = ?", (session_id,)) if session_id else ("", ())
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM files {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT info FROM files {where} "
+                "ORDER BY uploaded_at_epoch DESC, rowid DESC LIMIT ? OFFSET ?",
+                params + (max(limit, 0), offset)
+            ).fetchall()
+        return [orjson.loads(info) for (info,) in rows], total
+
+    def uploaded_before(self, cutoff: float) -> List[str]:
+        rows = self._query(
+            "SELECT file_id FROM files WHERE uploaded_at_epoch < ? ORDER BY uploaded_at_epoch",
+            (cutoff,)
+        )
+        return [file_id for (file_id,) in rows]
+
+
+def upload_epoch(file_info: Dict[str, Any]) -> float:
+    """Upload time of an entry as a Unix timestamp"""
+    epoch = file_info.get("uploaded_at_epoch")
+    if epoch is None:
+        # Entries registered before the epoch was stored only have the ISO string (naive UTC)
+        epoch = datetime.fromisoformat(file_info["uploaded_at"]).replace(tzinfo=timezone.utc).timestamp()
+    return epoch
+
+
+def create_file_registry(redis_url: Optional[str] = None,
+                         sqlite_path: Optional[Path] = None) -> FileRegistry:
+    """Create the file registry: Redis, then SQLite, when configured, in-process otherwise"""
+    if redis_url:
+        logger.info("Using Redis-backed file registry")
+        return RedisFileRegistry(redis_url)
+    if sqlite_path:
+        logger.info(f"Using SQLite-backed file registry at {sqlite_path}")
+        return SqliteFileRegistry(sqlite_path)
+    return FileRegistry()
@@ -4,22 +4,55 @@ File storage management for Data Labeler API
 
 import os
 import uuid
-import json
 import shutil
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone
 import logging
 
-from .config import get_settings, ensure_data_directories
+import orjson
+
+from .config import get_settings, ensure_data_directories, get_file_retention_seconds
+from .registry import FileRegistry, create_file_registry
+from ..utils.files import DEFAULT_FILE_MODE, atomic_write_bytes
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Stored JSON stays indented for readability; orjson writes UTF-8 as-is
+JSON_WRITE_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Capitalized field names some exports use, mapped to the canonical keys that
+# analysis code reads from processed transactions
+TRANSACTION_FIELD_ALIASES = {
+    "Description": "description",
+    "Amount": "amount",
+    "Date": "date",
+    "Category": "category",
+}
+
+
+def normalize_transaction_fields(transactions: List[Dict[str, Any]]) -> None:
+    """Rename capitalized transaction fields to their canonical keys, in place"""
+    for transaction in transactions:
+        for alias, field in TRANSACTION_FIELD_ALIASES.items():
+            if alias in transaction:
+                # The capitalized value wins, matching the old .get(alias, .get(field)) lookups
+                transaction[field] = transaction.pop(alias)
+
 
 class FileStorageManager:
     """Manages file storage operations for the Data Labeler API"""
 
+    # Upper bound on parsed processed files kept in memory; oldest are evicted first
+    MAX_CACHED_PROCESSED_FILES = 32
+
+    # Upper bound on remembered session upload directories; the set is reset when it fills up
+    MAX_KNOWN_SESSION_DIRS = 4096
+
     def __init__(self):
         """Initialize storage manager"""
         ensure_data_directories()
@@ -27,8 +60,17 @@ class FileStorageManager:
         self.processed_dir = settings.data_dir / "processed"
         self.recommendations_dir = settings.data_dir / "recommendations"
 
-        # In-memory file registry for tracking
-        self._file_registry: Dict[str, Dict[str, Any]] = {}
+        # File registry for tracking, shared across workers when Redis is configured
+        self._file_registry: FileRegistry = create_file_registry(
+            settings.redis_url, settings.registry_path
+        )
+
+        # Parsed processed data keyed by file ID, validated against the file's (mtime, size)
+        self._processed_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._processed_cache_lock = threading.Lock()
+
+        # Session upload directories already created, so uploads skip the mkdir
+        self._known_session_dirs: Set[str] = set()
 
     def generate_file_id(self) -> str:
         """Generate a unique file ID"""
@@ -57,33 +99,106 @@ class FileStorageManager:
         if session_id is None:
             session_id = self.generate_session_id()
 
-        # Ensure session directory exists
-        session_dir = self.uploads_dir / session_id
-        session_dir.mkdir(exist_ok=True)
+        dest_path = self._get_upload_path(file_id, original_filename, session_id)
+        file_size = file_path.stat().st_size
 
-        # Move file to session directory
-        dest_path = session_dir / f"{file_id}_{original_filename}"
+        # Move file to session directory (a plain rename on the same filesystem)
         shutil.move(str(file_path), str(dest_path))
 
-        # Register file
+        return self._register_file(file_id, original_filename, dest_path, session_id, file_size)
+
+    def save_uploaded_file_stream(self, file_obj: BinaryIO, original_filename: str,
+                                  session_id: Optional[str] = None,
+                                  chunk_size: int = 1024 * 1024) -> str:
+        """
+        Save an uploaded file by streaming it straight to its storage path
+
+        Args:
+            file_obj: Readable binary file-like object positioned at the start
+            original_filename: Original filename
+            session_id: Optional session ID
+            chunk_size: Copy buffer size in bytes
+
+        Returns:
+            file_id: Unique file identifier
+        """
+        file_id = self.generate_file_id()
+
+        # Create session if not provided
+        if session_id is None:
+            session_id = self.generate_session_id()
+
+        dest_path = self._get_upload_path(file_id, original_filename, session_id)
+
+        # Write to a temp file beside the destination, then rename into place so
+        # concurrent readers never see a partially written upload
+        try:
+            dest = tempfile.NamedTemporaryFile(dir=dest_path.parent, suffix=".part", delete=False)
+        except FileNotFoundError:
+            # The session directory was removed behind our back; recreate it
+            self._known_session_dirs.discard(session_id)
+            dest_path = self._get_upload_path(file_id, original_filename, session_id)
+            dest = tempfile.NamedTemporaryFile(dir=dest_path.parent, suffix=".part", delete=False)
+
+        with dest:
+            temp_path = Path(dest.name)
+            try:
+                # NamedTemporaryFile creates the file 0600; give it open()'s umask default
+                os.chmod(temp_path, DEFAULT_FILE_MODE)
+                shutil.copyfileobj(file_obj, dest, chunk_size)
+                file_size = dest.tell()
+            except Exception:
+                dest.close()
+                temp_path.unlink(missing_ok=True)
+                raise
+        os.replace(temp_path, dest_path)
+
+        return self._register_file(file_id, original_filename, dest_path, session_id, file_size)
+
+    def _get_upload_path(self, file_id: str, original_filename: str, session_id: str) -> Path:
+        """Build the storage path for an upload, creating the session directory"""
+        # Ensure session directory exists
+        session_dir = self.uploads_dir / session_id
+        if session_id not in self._known_session_dirs:
+            session_dir.mkdir(exist_ok=True)
+            if len(self._known_session_dirs) >= self.MAX_KNOWN_SESSION_DIRS:
+                self._known_session_dirs.clear()
+            self._known_session_dirs.add(session_id)
+
+        # Strip any directory components so the client can't escape the session dir
+        safe_name = Path(original_filename).name or "upload.csv"
+        return session_dir / f"{file_id}_{safe_name}"
+
+    def _register_file(self, file_id: str, original_filename: str, dest_path: Path,
+                       session_id: str, file_size: int) -> str:
+        """Register a stored upload in the file registry"""
+        now = datetime.utcnow()
         file_info = {
             "file_id": file_id,
             "original_filename": original_filename,
             "stored_path": str(dest_path),
             "session_id": session_id,
-            "uploaded_at": datetime.utcnow().isoformat(),
-            "file_size": dest_path.stat().st_size,
+            "uploaded_at": now.isoformat(),
+            "uploaded_at_epoch": now.replace(tzinfo=timezone.utc).timestamp(),
+            "file_size": file_size,
         }
 
-        self._file_registry[file_id] = file_info
+        self._file_registry.add(file_info)
 
-        logger.info(f"Saved uploaded file: {file_id} ({original_filename})")
+        logger.info("Saved uploaded file: %s (%s)", file_id, original_filename)
         return file_id
 
     def get_file_info(self, file_id: str) -> Optional[Dict[str, Any]]:
         """Get file information by ID"""
         return self._file_registry.get(file_id)
 
+    def get_file_record(self, file_id: str) -> Optional[Tuple[Dict[str, Any], Path]]:
+        """Get file information and its stored path in one lookup"""
+        file_info = self._file_registry.get(file_id)
+        if file_info:
+            return file_info, Path(file_info["stored_path"])
+        return None
+
     def get_file_path(self, file_id: str) -> Optional[Path]:
         """Get file path by ID"""
         file_info = self.get_file_info(file_id)
@@ -99,6 +214,21 @@ class FileStorageManager:
                 files.append(file_info.copy())
         return files
 
+    def list_files_page(self, session_id: Optional[str] = None, offset: int = 0,
+                        limit: int = 20) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        List one page of files, newest first
+
+        Args:
+            session_id: Optional session filter
+            offset: Number of files to skip
+            limit: Maximum number of files to return
+
+        Returns:
+            Tuple of (files on this page, total matching files)
+        """
+        return self._file_registry.page(session_id, offset, limit)
+
     def delete_file(self, file_id: str) -> bool:
         """Delete a file and its associated data"""
         file_info = self._file_registry.get(file_id)
@@ -114,69 +244,140 @@ class FileStorageManager:
         processed_path = self.processed_dir / f"{file_id}.json"
         if processed_path.exists():
             processed_path.unlink()
+        self.invalidate_processed_data(file_id)
 
         # Delete recommendations if exist
-        rec_pattern = f"{file_id}_*.json"
-        for rec_file in self.recommendations_dir.glob(rec_pattern):
-            rec_file.unlink()
+        rec_prefix = f"{file_id}_"
+        with os.scandir(self.recommendations_dir) as entries:
+            rec_paths = [
+                entry.path for entry in entries
+                if entry.name.startswith(rec_prefix) and entry.name.endswith(".json")
+            ]
+        for rec_path in rec_paths:
+            os.unlink(rec_path)
 
         # Remove from registry
-        del self._file_registry[file_id]
+        self._file_registry.delete(file_id)
 
-        logger.info(f"Deleted file: {file_id}")
+        logger.info("Deleted file: %s", file_id)
         return True
 
     def save_processed_data(self, file_id: str, data: Dict[str, Any]) -> bool:
         """Save processed transaction data"""
+        return self._write_processed_data(file_id, data) is not None
+
+    def finalize_processing(self, file_id: str, data: Dict[str, Any],
+                            registry_updates: Dict[str, Any]) -> bool:
+        """
+        Save processed data and apply the final registry update in one step
+
+        Args:
+            file_id: Unique file identifier
+            data: Processed transaction data to persist
+            registry_updates: Fields to merge into the file's registry entry
+
+        Returns:
+            True if the processed data was saved
+        """
+        return self._write_processed_data(file_id, data, registry_updates) is not None
+
+    def update_file_info(self, file_id: str, **updates: Any) -> None:
+        """Merge fields into a file's registry entry"""
+        self._file_registry.update(file_id, updates)
+
+    def _write_processed_data(self, file_id: str, data: Dict[str, Any],
+                              registry_updates: Optional[Dict[str, Any]] = None) -> Optional[Path]:
+        """Write processed data to disk and update the registry once"""
         try:
             output_path = self.processed_dir / f"{file_id}.json"
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            atomic_write_bytes(output_path, orjson.dumps(data, option=JSON_WRITE_OPTIONS))
 
-            # Update file info
-            if file_id in self._file_registry:
-                self._file_registry[file_id]["processed_at"] = datetime.utcnow().isoformat()
-                self._file_registry[file_id]["processed_path"] = str(output_path)
+            # Write-through so the next read doesn't re-parse what we just wrote
+            self._cache_processed_data(file_id, output_path, data)
 
-            logger.info(f"Saved processed data for file: {file_id}")
-            return True
+            # Update file info
+            updates = {
+                "processed_at": datetime.utcnow().isoformat(),
+                "processed_path": str(output_path),
+            }
+            updates.update(registry_updates or {})
+            self.update_file_info(file_id, **updates)
+
+            logger.info("Saved processed data for file: %s", file_id)
+            return output_path
         except Exception as e:
             logger.error(f"Failed to save processed data for {file_id}: {e}")
-            return False
+            return None
 
     def get_processed_data(self, file_id: str) -> Optional[Dict[str, Any]]:
-        """Get processed transaction data"""
+        """
+        Get processed transaction data
+
+        The returned dict is the cached copy shared by every caller, so it must
+        not be modified; save changed copies with save_processed_data instead.
+        """
         processed_path = self.processed_dir / f"{file_id}.json"
-        if not processed_path.exists():
+        try:
+            cache_key = self._processed_cache_key(processed_path)
+        except FileNotFoundError:
+            self.invalidate_processed_data(file_id)
             return None
 
+        cached = self._processed_cache.get(file_id)
+        if cached and cached[0] == cache_key:
+            return cached[1]
+
         try:
-            with open(processed_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(processed_path, 'rb') as f:
+                data = orjson.loads(f.read())
+            normalize_transaction_fields(data.get("transactions") or [])
         except Exception as e:
             logger.error(f"Failed to load processed data for {file_id}: {e}")
             return None
 
+        self._store_processed_cache(file_id, cache_key, data)
+        return data
+
+    def invalidate_processed_data(self, file_id: str) -> None:
+        """Drop any cached processed data for a file"""
+        with self._processed_cache_lock:
+            self._processed_cache.pop(file_id, None)
+
+    @staticmethod
+    def _processed_cache_key(path: Path) -> Tuple[int, int]:
+        """Cache validator for a processed file; any rewrite changes it"""
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _cache_processed_data(self, file_id: str, path: Path, data: Dict[str, Any]) -> None:
+        """Cache data that was just written to path"""
+        self._store_processed_cache(file_id, self._processed_cache_key(path), data)
+
+    def _store_processed_cache(self, file_id: str, cache_key: Tuple[int, int],
+                               data: Dict[str, Any]) -> None:
+        """Insert a cache entry, evicting the oldest entries when full"""
+        with self._processed_cache_lock:
+            self._processed_cache.pop(file_id, None)
+            while len(self._processed_cache) >= self.MAX_CACHED_PROCESSED_FILES:
+                self._processed_cache.pop(next(iter(self._processed_cache)))
+            self._processed_cache[file_id] = (cache_key, data)
+
     def save_recommendations(self, file_id: str, recommendations: Dict[str, Any]) -> str:
         """Save recommendation results"""
         recommendation_id = f"{file_id}_{uuid.uuid4()}"
 
         try:
             output_path = self.recommendations_dir / f"{recommendation_id}.json"
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(recommendations, f, indent=2, ensure_ascii=False)
+            atomic_write_bytes(output_path, orjson.dumps(recommendations, option=JSON_WRITE_OPTIONS))
 
             # Update file info
-            if file_id in self._file_registry:
-                if "recommendations" not in self._file_registry[file_id]:
-                    self._file_registry[file_id]["recommendations"] = []
-                self._file_registry[file_id]["recommendations"].append({
-                    "id": recommendation_id,
-                    "generated_at": datetime.utcnow().isoformat(),
-                    "path": str(output_path)
-                })
-
-            logger.info(f"Saved recommendations for file: {file_id} (ID: {recommendation_id})")
+            self._file_registry.append(file_id, "recommendations", {
+                "id": recommendation_id,
+                "generated_at": datetime.utcnow().isoformat(),
+                "path": str(output_path)
+            })
+
+            logger.info("Saved recommendations for file: %s (ID: %s)", file_id, recommendation_id)
             return recommendation_id
         except Exception as e:
             logger.error(f"Failed to save recommendations for {file_id}: {e}")
@@ -189,8 +390,8 @@ class FileStorageManager:
             return None
 
         try:
-            with open(rec_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(rec_path, 'rb') as f:
+                return orjson.loads(f.read())
         except Exception as e:
             logger.error(f"Failed to load recommendations {recommendation_id}: {e}")
             return None
@@ -199,8 +400,8 @@ class FileStorageManager:
         """List recommendations, optionally filtered by file"""
         recommendations = []
 
-        if file_id and file_id in self._file_registry:
-            file_info = self._file_registry[file_id]
+        file_info = self._file_registry.get(file_id) if file_id else None
+        if file_info:
             return file_info.get("recommendations", [])
 
         # Return all recommendations across all files
@@ -212,14 +413,11 @@ class FileStorageManager:
 
     def cleanup_old_files(self) -> int:
         """Clean up files older than retention period"""
-        cutoff_time = datetime.utcnow() - timedelta(hours=settings.file_retention_hours)
+        cutoff = time.time() - get_file_retention_seconds()
         deleted_count = 0
 
-        for file_id, file_info in list(self._file_registry.items()):
-            uploaded_at = datetime.fromisoformat(file_info["uploaded_at"])
-
-            if uploaded_at < cutoff_time:
-                self.delete_file(file_id)
+        for file_id in self._file_registry.uploaded_before(cutoff):
+            if self.delete_file(file_id):
                 deleted_count += 1
 
         if deleted_count > 0:
@@ -228,17 +426,13 @@ class FileStorageManager:
 
     def get_storage_stats(self) -> Dict[str, Any]:
         """Get storage usage statistics"""
-        total_files = len(self._file_registry)
-        total_size = sum(
-            file_info.get("file_size", 0)
-            for file_info in self._file_registry.values()
-        )
-
-        # Count recommendations
-        total_recommendations = sum(
-            len(file_info.get("recommendations", []))
-            for file_info in self._file_registry.values()
-        )
+        total_files = 0
+        total_size = 0
+        total_recommendations = 0
+        for file_info in self._file_registry.values():
+            total_files += 1
+            total_size += file_info.get("file_size", 0)
+            total_recommendations += len(file_info.get("recommendations", []))
 
         return {
             "total_files": total_files,
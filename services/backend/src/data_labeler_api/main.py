@@ -11,19 +11,17 @@ from datetime import datetime
 import logging
 
 from .core.config import get_settings, ensure_data_directories
+from .core.logging_config import configure_logging
 from .core.storage import storage_manager
-from .api.files import router as files_router
+from .api.files import router as files_router, shutdown_process_pool
 from .api.rules import router as rules_router
 from .api.recommendations import router as recommendations_router
 from .api.merchant_patterns import router as merchant_patterns_router
 from .api.configuration import router as configuration_router
-from .api.sessions import router as sessions_router
+from .api.sessions import router as sessions_router, flush_pending_sessions
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Get settings
@@ -49,6 +47,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info(f"Shutting down {settings.app_name}")
+    await flush_pending_sessions()
+    shutdown_process_pool()
 
 
 # Create FastAPI application
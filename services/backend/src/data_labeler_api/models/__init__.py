@@ -8,6 +8,7 @@ from .transaction import (
     TransactionCreate,
     TransactionUpdate,
     TransactionList,
+    TransactionColumns,
     ColumnMapping,
     FileProcessingOptions,
     ProcessedFile
@@ -27,6 +28,7 @@ from .label import (
 
 from .file import (
     FileInfo,
+    FileSummary,
     FileUploadResponse,
     FileProcessingStatus,
     ValidationError,
@@ -59,6 +61,7 @@ __all__ = [
     "TransactionCreate",
     "TransactionUpdate",
     "TransactionList",
+    "TransactionColumns",
     "ColumnMapping",
     "FileProcessingOptions",
     "ProcessedFile",
@@ -76,6 +79,7 @@ __all__ = [
 
     # File models
     "FileInfo",
+    "FileSummary",
     "FileUploadResponse",
     "FileProcessingStatus",
     "ValidationError",
@@ -0,0 +1,122 @@
+"""
+Shared base classes for API models
+"""
+
+import copy
+from typing import Callable, Dict, Type, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Marks keyword arguments the caller did not pass to a fast constructor
+_UNSET = object()
+
+# Default values that can be shared between instances without copying
+_IMMUTABLE_DEFAULTS = (type(None), bool, int, float, str, bytes, tuple, frozenset)
+
+# Source for fresh empty containers, much cheaper than deep-copying a default
+_EMPTY_CONTAINER_SOURCE = {list: "[]", dict: "{}", set: "set()"}
+
+# Generated constructors used by trusted(), one per model class
+_trusted_constructors: Dict[type, Callable[..., BaseModel]] = {}
+
+
+class DeferredModel(BaseModel):
+    """
+    Base for models that are rarely instantiated
+
+    The core schema is built on first use instead of at import time, so
+    stats, preview and import/export models cost nothing until a request
+    actually needs them.
+    """
+    model_config = ConfigDict(defer_build=True)
+
+
+def trusted(cls: Type[ModelT], **fields) -> ModelT:
+    """
+    Build a model from values produced by this service's own code
+
+    Validates normally, but skips validation when Python runs with -O, so
+    constraint checks on internal data only cost time in development.
+    Untrusted input (request bodies, uploads, files read from disk) must
+    always go through full validation instead.
+    """
+    if __debug__:
+        return cls(**fields)
+
+    construct = _trusted_constructors.get(cls)
+    if construct is None:
+        construct = _trusted_constructors[cls] = fast_constructor(cls)
+    return construct(**fields)
+
+
+def fast_constructor(cls: Type[ModelT]) -> Callable[..., ModelT]:
+    """
+    Generate a keyword-only constructor that fills a model without validation
+
+    The function is generated from cls.model_fields, so it assigns fields in
+    declaration order and tracks which were passed, like model_construct,
+    without model_construct's per-call default-factory introspection. Only
+    for values already of the declared types; validators do not run.
+    """
+    if cls.__private_attributes__ or cls.model_config.get("extra") == "allow":
+        raise TypeError(f"{cls.__name__} needs private or extra storage; use model_construct")
+
+    required, optional = [], []
+    factories, defaults = {}, {}
+    for name, field in cls.model_fields.items():
+        if field.is_required():
+            required.append(name)
+            continue
+        optional.append(name)
+        if field.default_factory is not None:
+            if field.default_factory_takes_validated_data:
+                raise TypeError(f"{cls.__name__}.{name} default factory needs validated data")
+            factories[name] = field.default_factory
+        else:
+            defaults[name] = field.default
+
+    params = ", ".join(required + [f"{name}=_UNSET" for name in optional])
+    lines = [
+        f"def construct(*, {params}):",
+        f"    fields_set = {{{', '.join(repr(name) for name in required)}}}" if required else "    fields_set = set()",
+    ]
+    for name in optional:
+        if name in factories:
+            default = f"_factories[{name!r}]()"
+        elif isinstance(defaults[name], _IMMUTABLE_DEFAULTS):
+            default = f"_defaults[{name!r}]"
+        elif type(defaults[name]) in _EMPTY_CONTAINER_SOURCE and not defaults[name]:
+            default = _EMPTY_CONTAINER_SOURCE[type(defaults[name])]
+        else:
+            default = f"_deepcopy(_defaults[{name!r}])"
+        lines += [
+            f"    if {name} is _UNSET:",
+            f"        {name} = {default}",
+            "    else:",
+            f"        fields_set.add({name!r})",
+        ]
+    values = ", ".join(f"{name!r}: {name}" for name in cls.model_fields)
+    lines += [
+        "    instance = _new(cls)",
+        f"    _setattr(instance, '__dict__', {{{values}}})",
+        "    _setattr(instance, '__pydantic_fields_set__', fields_set)",
+        "    _setattr(instance, '__pydantic_extra__', None)",
+        "    _setattr(instance, '__pydantic_private__', None)",
+        "    return instance",
+    ]
+
+    namespace = {
+        "cls": cls,
+        "_UNSET": _UNSET,
+        "_new": cls.__new__,
+        "_setattr": object.__setattr__,
+        "_factories": factories,
+        "_defaults": defaults,
+        "_deepcopy": copy.deepcopy,
+    }
+    exec(compile("\n".join(lines), f"<fast_constructor {cls.__name__}>", "exec"), namespace)
+    construct = namespace["construct"]
+    construct.__qualname__ = f"{cls.__name__}.fast_construct"
+    return construct
@@ -2,13 +2,17 @@
 Configuration models for domain-agnostic data labeling
 """
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Callable, List, Mapping
+from types import MappingProxyType
 from datetime import datetime
-from pydantic import BaseModel, Field
+import threading
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class CleaningPattern(BaseModel):
     """Configuration for text cleaning patterns"""
+    model_config = ConfigDict(frozen=True)
+
     pattern: str = Field(..., description="Regex pattern to match")
     replacement: str = Field("", description="Replacement string")
     description: Optional[str] = Field(None, description="Description of what this pattern does")
@@ -16,6 +20,9 @@ class CleaningPattern(BaseModel):
 
 class DomainConfiguration(BaseModel):
     """Domain-specific configuration for data processing"""
+    # Stored configs are shared by lock-free readers; changes go through model_copy
+    model_config = ConfigDict(frozen=True)
+
     domain_name: str = Field(..., description="Name of the data domain (e.g., 'financial', 'medical', 'ecommerce')")
     description: Optional[str] = Field(None, description="Description of this domain configuration")
 
@@ -37,28 +44,119 @@ class DomainConfiguration(BaseModel):
 
 
 class ConfigurationManager:
-    """Manages domain configurations"""
+    """
+    Manages domain configurations
+
+    The configuration map is copy-on-write: mutations build a new map under a
+    lock and publish it with a single reference swap, so readers never lock
+    and never observe a half-applied change. Stored configs are replaced, not
+    mutated in place.
+    """
 
     def __init__(self):
-        self.configs: Dict[str, DomainConfiguration] = {}
+        self._configs: Mapping[str, DomainConfiguration] = MappingProxyType({})
+        self._lock = threading.Lock()
+        # Name of the explicitly activated domain, so lookups skip the full scan
+        self.active_domain: Optional[str] = None
+
+    @property
+    def configs(self) -> Mapping[str, DomainConfiguration]:
+        """Read-only view of the current configuration map"""
+        return self._configs
+
+    def _publish(self, configs: Dict[str, DomainConfiguration]):
+        """Publish a new configuration map (caller must hold the lock)"""
+        self._configs = MappingProxyType(configs)
+
+    def _replace(self, domain_name: str,
+                 get_updates: Callable[[DomainConfiguration], Dict[str, Any]]
+                 ) -> Optional[DomainConfiguration]:
+        """Replace a stored config with a copy carrying get_updates(config)"""
+        with self._lock:
+            config = self._configs.get(domain_name)
+            if not config:
+                return None
+
+            updated = config.model_copy(update=get_updates(config))
+            self._publish({**self._configs, domain_name: updated})
+            return updated
 
     def add_config(self, config: DomainConfiguration) -> DomainConfiguration:
         """Add a domain configuration"""
-        self.configs[config.domain_name] = config
+        with self._lock:
+            self._publish({**self._configs, config.domain_name: config})
         return config
 
     def get_config(self, domain_name: str) -> Optional[DomainConfiguration]:
         """Get configuration for a domain"""
-        return self.configs.get(domain_name)
+        return self._configs.get(domain_name)
 
     def list_configs(self) -> List[DomainConfiguration]:
         """List all configurations"""
-        return list(self.configs.values())
+        return list(self._configs.values())
+
+    def activate_config(self, domain_name: str) -> Optional[DomainConfiguration]:
+        """Make a configuration the only active one"""
+        with self._lock:
+            if domain_name not in self._configs:
+                return None
+
+            self._publish({
+                name: config.model_copy(update={'is_active': name == domain_name})
+                if config.is_active != (name == domain_name) else config
+                for name, config in self._configs.items()
+            })
+            self.active_domain = domain_name
+            return self._configs[domain_name]
+
+    def deactivate_config(self, domain_name: str) -> Optional[DomainConfiguration]:
+        """Mark a configuration inactive"""
+        return self._replace(domain_name, lambda config: {'is_active': False})
+
+    def add_cleaning_pattern(self, domain_name: str,
+                             pattern: CleaningPattern) -> Optional[DomainConfiguration]:
+        """Append a cleaning pattern to a configuration"""
+        return self._replace(domain_name, lambda config: {
+            'cleaning_patterns': [*config.cleaning_patterns, pattern]
+        })
+
+    def remove_cleaning_pattern(self, domain_name: str, index: int) -> Optional[CleaningPattern]:
+        """Remove a cleaning pattern by index, returning it if it existed"""
+        with self._lock:
+            config = self._configs.get(domain_name)
+            if not config or not 0 <= index < len(config.cleaning_patterns):
+                return None
+
+            patterns = list(config.cleaning_patterns)
+            removed = patterns.pop(index)
+            updated = config.model_copy(update={'cleaning_patterns': patterns})
+            self._publish({**self._configs, domain_name: updated})
+            return removed
+
+    def add_entity_pattern(self, domain_name: str, entity: str,
+                           pattern: str) -> Optional[DomainConfiguration]:
+        """Append an entity extraction pattern to a configuration"""
+        return self._replace(domain_name, lambda config: {
+            'entity_patterns': {
+                **config.entity_patterns,
+                entity: [*config.entity_patterns.get(entity, []), pattern]
+            }
+        })
 
     def get_active_config(self) -> Optional[DomainConfiguration]:
         """Get the currently active configuration"""
-        active = [config for config in self.configs.values() if config.is_active]
-        return active[0] if active else None
+        configs = self._configs
+
+        if self.active_domain:
+            config = configs.get(self.active_domain)
+            if config and config.is_active:
+                return config
+
+        # Fall back to the first config flagged active
+        for config in configs.values():
+            if config.is_active:
+                return config
+        return None
 
 
 # Global configuration manager
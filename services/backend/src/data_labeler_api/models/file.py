@@ -2,10 +2,17 @@
 Pydantic models for file management
 """
 
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Literal
 from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
 from datetime import datetime
-from pathlib import Path
+from typing_extensions import TypedDict
+
+from .base import DeferredModel
+
+# Closed vocabulary of file processing states. Validated values come back as
+# these literal objects, so every model shares one string per status.
+FileStatus = Literal["uploaded", "processing", "completed", "failed"]
 
 
 class FileInfo(BaseModel):
@@ -16,11 +23,20 @@ class FileInfo(BaseModel):
     file_size: int = Field(..., description="File size in bytes")
     uploaded_at: datetime = Field(..., description="Upload timestamp")
     processed_at: Optional[datetime] = Field(None, description="Processing completion timestamp")
-    status: str = Field(default="uploaded", description="File processing status")
+    status: FileStatus = Field(default="uploaded", description="File processing status")
     mime_type: Optional[str] = Field(None, description="MIME type")
     encoding: Optional[str] = Field(None, description="Detected file encoding")
 
 
+class FileSummary(BaseModel):
+    """Lightweight file model for listings"""
+    file_id: str = Field(..., description="Unique file identifier")
+    filename: str = Field(..., description="Original filename")
+    file_size: int = Field(..., description="File size in bytes")
+    uploaded_at: datetime = Field(..., description="Upload timestamp")
+    status: FileStatus = Field(default="uploaded", description="File processing status")
+
+
 class FileUploadResponse(BaseModel):
     """Response after successful file upload"""
     file_id: str = Field(..., description="Unique file identifier")
@@ -28,20 +44,21 @@ class FileUploadResponse(BaseModel):
     session_id: str = Field(..., description="Upload session ID")
     file_size: int = Field(..., description="File size in bytes")
     uploaded_at: datetime = Field(..., description="Upload timestamp")
-    status: str = Field(..., description="Current status")
+    status: FileStatus = Field(..., description="Current status")
 
 
 class FileProcessingStatus(BaseModel):
     """File processing status"""
     file_id: str = Field(..., description="File identifier")
-    status: str = Field(..., description="Current status (uploaded, processing, completed, failed)")
+    status: FileStatus = Field(..., description="Current status (uploaded, processing, completed, failed)")
     progress: float = Field(0.0, ge=0.0, le=1.0, description="Processing progress (0.0-1.0)")
     message: Optional[str] = Field(None, description="Status message")
     estimated_completion: Optional[datetime] = Field(None, description="Estimated completion time")
 
 
-class ValidationError(BaseModel):
-    """Individual validation error"""
+@dataclass(frozen=True, slots=True)
+class ValidationError:
+    """Individual validation error, slotted since reports can hold one per row"""
     row: int = Field(..., description="Row number (1-based)")
     column: Optional[str] = Field(None, description="Column name")
     value: Any = Field(..., description="Invalid value")
@@ -49,7 +66,7 @@ class ValidationError(BaseModel):
     message: str = Field(..., description="Error message")
 
 
-class ValidationReport(BaseModel):
+class ValidationReport(DeferredModel):
     """CSV validation report"""
     is_valid: bool = Field(..., description="Overall validation result")
     total_rows: int = Field(..., description="Total number of rows")
@@ -76,22 +93,30 @@ class ValidationReport(BaseModel):
 
 class FileListResponse(BaseModel):
     """Response for listing files"""
-    files: List[FileInfo] = Field(..., description="List of uploaded files")
+    files: List[FileSummary] = Field(..., description="List of uploaded files")
     total: int = Field(..., description="Total number of files")
     page: int = Field(default=1, description="Current page")
     per_page: int = Field(default=20, description="Files per page")
     has_more: bool = Field(..., description="Whether there are more files")
 
 
-class FileStats(BaseModel):
+class FilesByStatus(TypedDict, total=False):
+    """File count per FileStatus value"""
+    uploaded: int
+    processing: int
+    completed: int
+    failed: int
+
+
+class FileStats(DeferredModel):
     """File statistics"""
     total_files: int = Field(..., description="Total number of uploaded files")
     total_size: int = Field(..., description="Total size of all files in bytes")
-    files_by_status: Dict[str, int] = Field(..., description="Files grouped by status")
+    files_by_status: FilesByStatus = Field(..., description="Files grouped by status")
     recent_uploads: List[FileInfo] = Field(default_factory=list, description="Recently uploaded files")
 
 
-class SessionInfo(BaseModel):
+class SessionInfo(DeferredModel):
     """Upload session information"""
     session_id: str = Field(..., description="Session identifier")
     created_at: datetime = Field(..., description="Session creation time")
@@ -107,16 +132,16 @@ class FileDeleteResponse(BaseModel):
     message: str = Field(..., description="Status message")
 
 
-class ExportOptions(BaseModel):
+class ExportOptions(DeferredModel):
     """Options for exporting labeled data"""
-    format: str = Field(default="csv", pattern=r'^(csv|parquet|json)$', description="Export format")
+    format: Literal["csv", "parquet", "json"] = Field(default="csv", description="Export format")
     include_headers: bool = Field(default=True, description="Include column headers")
     date_range: Optional[Dict[str, datetime]] = Field(None, description="Date range filter")
     labels: Optional[List[str]] = Field(None, description="Label filter")
     columns: Optional[List[str]] = Field(None, description="Columns to include")
 
 
-class ExportResult(BaseModel):
+class ExportResult(DeferredModel):
     """Result of data export operation"""
     export_id: str = Field(..., description="Export operation ID")
     file_id: str = Field(..., description="Source file ID")
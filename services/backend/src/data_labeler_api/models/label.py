@@ -2,12 +2,15 @@
 Pydantic models for label management
 """
 
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import Optional, List, Literal
+from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
 from datetime import datetime
 
+from .base import DeferredModel
 
-class LabelBase(BaseModel):
+
+class LabelBase(DeferredModel):
     """Base label model"""
     name: str = Field(..., min_length=1, max_length=100, description="Label name")
     color: str = Field(..., pattern=r'^#[0-9A-Fa-f]{6}$', description="Hex color code (e.g., #FF5733)")
@@ -29,7 +32,7 @@ class LabelCreate(LabelBase):
     pass
 
 
-class LabelUpdate(BaseModel):
+class LabelUpdate(DeferredModel):
     """Model for updating labels"""
     name: Optional[str] = Field(None, min_length=1, max_length=100)
     color: Optional[str] = Field(None, pattern=r'^#[0-9A-Fa-f]{6}$')
@@ -37,7 +40,7 @@ class LabelUpdate(BaseModel):
     category: Optional[str] = Field(None, max_length=100)
 
 
-class LabelStats(BaseModel):
+class LabelStats(DeferredModel):
     """Statistics for a label"""
     label_id: str = Field(..., description="Label identifier")
     usage_count: int = Field(..., description="Number of transactions with this label")
@@ -47,7 +50,7 @@ class LabelStats(BaseModel):
     last_used: Optional[datetime] = Field(None, description="Last time label was used")
 
 
-class LabelGroup(BaseModel):
+class LabelGroup(DeferredModel):
     """Group of related labels"""
     id: str = Field(..., description="Group identifier")
     name: str = Field(..., min_length=1, max_length=100, description="Group name")
@@ -56,7 +59,8 @@ class LabelGroup(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow, description="Creation timestamp")
 
 
-class LabelRecommendation(BaseModel):
+@dataclass(frozen=True, slots=True)
+class LabelRecommendation:
     """Recommendation for labeling a transaction"""
     label_id: str = Field(..., description="Recommended label ID")
     confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score (0.0-1.0)")
@@ -69,10 +73,10 @@ class BulkLabelOperation(BaseModel):
     """Bulk labeling operation"""
     transaction_ids: List[str] = Field(..., description="Transaction IDs to label")
     label_id: str = Field(..., description="Label to apply")
-    operation: str = Field(..., pattern=r'^(apply|remove)$', description="Operation type")
+    operation: Literal["apply", "remove"] = Field(..., description="Operation type")
 
 
-class LabelImportExport(BaseModel):
+class LabelImportExport(DeferredModel):
     """Import/export format for labels"""
     labels: List[Label] = Field(..., description="List of labels")
     groups: List[LabelGroup] = Field(default_factory=list, description="Label groups")
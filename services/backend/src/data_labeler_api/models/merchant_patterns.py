@@ -4,10 +4,12 @@ Merchant patterns configuration models
 
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
+from .base import DeferredModel
 
-class MerchantPatternBase(BaseModel):
+
+class MerchantPatternBase(DeferredModel):
     """Base merchant pattern model"""
     name: str = Field(..., description="Merchant name")
     pattern: str = Field(..., description="Regex pattern to match merchant")
@@ -18,7 +20,8 @@ class MerchantPatternBase(BaseModel):
 
 class MerchantPatternCreate(MerchantPatternBase):
     """Model for creating merchant patterns"""
-    pass
+    # Used on request paths, so built at import unlike the deferred base
+    model_config = ConfigDict(defer_build=False)
 
 
 class MerchantPatternUpdate(BaseModel):
@@ -32,6 +35,8 @@ class MerchantPatternUpdate(BaseModel):
 
 class MerchantPattern(MerchantPatternBase):
     """Complete merchant pattern model"""
+    model_config = ConfigDict(defer_build=False)
+
     id: str = Field(..., description="Unique pattern identifier")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
@@ -40,7 +45,7 @@ class MerchantPattern(MerchantPatternBase):
     success_rate: float = Field(0.0, description="Success rate of pattern matches")
 
 
-class MerchantPatternStats(BaseModel):
+class MerchantPatternStats(DeferredModel):
     """Statistics for merchant pattern performance"""
     total_patterns: int
     active_patterns: int
@@ -3,9 +3,12 @@ Pydantic models for recommendation system
 """
 
 from typing import Optional, Dict, List, Any
-from pydantic import BaseModel, Field
+from pydantic import Field
 from datetime import datetime
 from enum import Enum
+from typing_extensions import TypedDict
+
+from .base import DeferredModel
 
 
 class AlgorithmType(str, Enum):
@@ -17,7 +20,7 @@ class AlgorithmType(str, Enum):
     ML_MODEL = "ml_model"
 
 
-class RecommendationConfig(BaseModel):
+class RecommendationConfig(DeferredModel):
     """Configuration for recommendation generation"""
     exact_match_weight: float = Field(1.0, ge=0.0, le=1.0, description="Weight for exact match algorithm")
     fuzzy_match_weight: float = Field(0.8, ge=0.0, le=1.0, description="Weight for fuzzy match algorithm")
@@ -27,7 +30,7 @@ class RecommendationConfig(BaseModel):
     max_recommendations_per_row: int = Field(3, gt=0, description="Maximum recommendations per transaction")
 
 
-class TransactionRecommendation(BaseModel):
+class TransactionRecommendation(DeferredModel):
     """Recommendation for a single transaction"""
     transaction_id: str = Field(..., description="Transaction ID")
     recommendations: List[Dict[str, Any]] = Field(..., description="List of label recommendations")
@@ -35,7 +38,7 @@ class TransactionRecommendation(BaseModel):
     confidence_score: float = Field(..., ge=0.0, le=1.0, description="Overall confidence score")
 
 
-class RecommendationRequest(BaseModel):
+class RecommendationRequest(DeferredModel):
     """Request for generating recommendations"""
     file_id: str = Field(..., description="File ID to generate recommendations for")
     config: Optional[RecommendationConfig] = Field(None, description="Recommendation configuration")
@@ -44,7 +47,7 @@ class RecommendationRequest(BaseModel):
     include_similar: bool = Field(default=True, description="Include similarity-based recommendations")
 
 
-class RecommendationResponse(BaseModel):
+class RecommendationResponse(DeferredModel):
     """Response from recommendation generation"""
     recommendation_id: str = Field(..., description="Unique recommendation ID")
     file_id: str = Field(..., description="Source file ID")
@@ -54,7 +57,16 @@ class RecommendationResponse(BaseModel):
     stats: Dict[str, Any] = Field(..., description="Generation statistics")
 
 
-class RecommendationStats(BaseModel):
+class AlgorithmUsage(TypedDict, total=False):
+    """Usage count per AlgorithmType value"""
+    exact_match: int
+    fuzzy_match: int
+    merchant_pattern: int
+    amount_pattern: int
+    ml_model: int
+
+
+class RecommendationStats(DeferredModel):
     """Statistics about recommendation generation"""
     total_transactions: int = Field(..., description="Total transactions processed")
     recommendations_generated: int = Field(..., description="Total recommendations created")
@@ -62,11 +74,11 @@ class RecommendationStats(BaseModel):
     high_confidence_count: int = Field(..., description="Transactions with high confidence (>0.8)")
     medium_confidence_count: int = Field(..., description="Transactions with medium confidence (0.5-0.8)")
     low_confidence_count: int = Field(..., description="Transactions with low confidence (<0.5)")
-    algorithm_usage: Dict[str, int] = Field(..., description="Usage count by algorithm")
+    algorithm_usage: AlgorithmUsage = Field(..., description="Usage count by algorithm")
     processing_time_seconds: float = Field(..., description="Total processing time")
 
 
-class RecommendationFeedback(BaseModel):
+class RecommendationFeedback(DeferredModel):
     """User feedback on recommendations"""
     recommendation_id: str = Field(..., description="Recommendation ID")
     transaction_id: str = Field(..., description="Transaction ID")
@@ -76,14 +88,14 @@ class RecommendationFeedback(BaseModel):
     feedback_text: Optional[str] = Field(None, description="Additional feedback text")
 
 
-class BulkRecommendationUpdate(BaseModel):
+class BulkRecommendationUpdate(DeferredModel):
     """Bulk update of recommendations"""
     recommendation_id: str = Field(..., description="Recommendation ID")
     updates: List[Dict[str, Any]] = Field(..., description="List of transaction updates")
     applied_by: str = Field(..., description="User who applied the updates")
 
 
-class RecommendationList(BaseModel):
+class RecommendationList(DeferredModel):
     """List of recommendations"""
     recommendations: List[RecommendationResponse] = Field(..., description="List of recommendations")
     total: int = Field(..., description="Total number of recommendations")
@@ -91,7 +103,7 @@ class RecommendationList(BaseModel):
     per_page: int = Field(default=20, description="Recommendations per page")
 
 
-class RecommendationMetrics(BaseModel):
+class RecommendationMetrics(DeferredModel):
     """Metrics about recommendation system performance"""
     total_recommendations: int = Field(..., description="Total recommendations generated")
     acceptance_rate: float = Field(..., description="Percentage of recommendations accepted")
@@ -4,8 +4,10 @@ Rule models for the recommendation engine
 
 from typing import Optional, Dict, Any, List
 from datetime import datetime
-from pydantic import BaseModel, Field
-from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.dataclasses import dataclass
+
+from .base import DeferredModel
 
 
 class RuleCondition(BaseModel):
@@ -23,7 +25,7 @@ class RuleRegex(BaseModel):
     merchant: Optional[str] = None
 
 
-class RuleBase(BaseModel):
+class RuleBase(DeferredModel):
     """Base rule model"""
     name: str = Field(..., description="Rule name")
     description: Optional[str] = Field(None, description="Rule description")
@@ -37,7 +39,8 @@ class RuleBase(BaseModel):
 
 class RuleCreate(RuleBase):
     """Model for creating new rules"""
-    pass
+    # Used on request paths, so built at import unlike the deferred base
+    model_config = ConfigDict(defer_build=False)
 
 
 class RuleUpdate(BaseModel):
@@ -54,6 +57,8 @@ class RuleUpdate(BaseModel):
 
 class Rule(RuleBase):
     """Complete rule model"""
+    model_config = ConfigDict(defer_build=False)
+
     id: str = Field(..., description="Unique rule identifier")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
@@ -62,15 +67,16 @@ class Rule(RuleBase):
     transaction_ids: List[str] = Field(default_factory=list, description="Transactions this rule has been applied to")
 
 
-class RuleMatch(BaseModel):
-    """Result of rule matching"""
+@dataclass(frozen=True, slots=True)
+class RuleMatch:
+    """Result of rule matching, slotted since one is created per matching transaction"""
     rule_id: str
     transaction_id: str
     confidence: float
     matched_conditions: List[str] = Field(default_factory=list)
 
 
-class RulePreview(BaseModel):
+class RulePreview(DeferredModel):
     """Preview of rule matches"""
     rule: Rule
     matching_transactions: List[Dict[str, Any]] = Field(default_factory=list)
@@ -78,7 +84,7 @@ class RulePreview(BaseModel):
     sample_matches: List[Dict[str, Any]] = Field(default_factory=list, description="Sample of matching transactions")
 
 
-class RuleValidation(BaseModel):
+class RuleValidation(DeferredModel):
     """Rule validation result"""
     is_valid: bool
     errors: List[str] = Field(default_factory=list)
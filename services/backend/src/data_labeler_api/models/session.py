@@ -3,7 +3,7 @@ Session models for state persistence
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List, Any, Dict
+from typing import Optional, Any, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -39,6 +39,8 @@ class SessionMetadata(BaseModel):
     class Config:
         populate_by_name = True
         use_enum_values = True
+        # Instances are shared by the parse cache, pending saves and the metadata index
+        frozen = True
 
 
 class PersistedState(BaseModel):
@@ -52,6 +54,8 @@ class PersistedState(BaseModel):
 
     class Config:
         populate_by_name = True
+        # Instances are shared by the parse cache and pending saves
+        frozen = True
 
 
 class SessionCreate(BaseModel):
@@ -7,6 +7,10 @@ from pydantic import BaseModel, Field, validator
 from datetime import datetime
 from decimal import Decimal
 
+from ..utils.money import parse_money
+
+from .base import DeferredModel
+
 
 class TransactionBase(BaseModel):
     """Base transaction model"""
@@ -22,14 +26,7 @@ class TransactionBase(BaseModel):
     def parse_decimal(cls, v):
         """Parse string amounts to Decimal"""
         if isinstance(v, str):
-            # Remove currency symbols and commas, handle parentheses for negative amounts
-            v = v.replace('$', '').replace(',', '').strip()
-            if v.startswith('(') and v.endswith(')'):
-                v = f"-{v[1:-1]}"
-            try:
-                return Decimal(v)
-            except:
-                return None
+            return parse_money(v)
         return v
 
 
@@ -47,13 +44,13 @@ class Transaction(TransactionBase):
     merchant_name: Optional[str] = Field(None, description="Extracted merchant name")
 
 
-class TransactionCreate(BaseModel):
+class TransactionCreate(DeferredModel):
     """Model for creating transactions from CSV data"""
     transactions: List[TransactionBase] = Field(..., description="List of transactions to create")
     file_id: str = Field(..., description="Source file ID")
 
 
-class TransactionUpdate(BaseModel):
+class TransactionUpdate(DeferredModel):
     """Model for updating transaction data"""
     label_id: Optional[str] = Field(None, description="New label ID")
     category: Optional[str] = Field(None, description="New category")
@@ -69,6 +66,16 @@ class TransactionList(BaseModel):
     file_id: str = Field(..., description="Source file ID")
 
 
+class TransactionColumns(BaseModel):
+    """Page of transactions in columnar form, one list per Transaction field"""
+    columns: Dict[str, List[Any]] = Field(..., description="Values per field name, aligned by row")
+    row_count: int = Field(..., description="Number of rows in this page")
+    total: int = Field(..., description="Total number of transactions")
+    page: int = Field(default=1, description="Current page number")
+    per_page: int = Field(default=100, description="Items per page")
+    file_id: str = Field(..., description="Source file ID")
+
+
 class ColumnMapping(BaseModel):
     """Column mapping configuration for CSV parsing"""
     date_column: Optional[str] = Field(None, description="Column name for dates")
@@ -79,6 +86,15 @@ class ColumnMapping(BaseModel):
     account_column: Optional[str] = Field(None, description="Column name for accounts")
     reference_column: Optional[str] = Field(None, description="Column name for references")
 
+    def resolve(self, columns) -> Dict[str, str]:
+        """Map each target field (e.g. 'amount') to its source column, keeping only columns present"""
+        present = set(columns)
+        return {
+            name[:-len("_column")]: source
+            for name, source in self
+            if source and source in present
+        }
+
 
 class FileProcessingOptions(BaseModel):
     """Options for processing uploaded files"""
@@ -86,6 +102,7 @@ class FileProcessingOptions(BaseModel):
     skip_validation: bool = Field(default=False, description="Skip data validation")
     normalize_text: bool = Field(default=True, description="Normalize text for better matching")
     extract_merchants: bool = Field(default=True, description="Extract merchant names from descriptions")
+    chunk_size: int = Field(default=100_000, gt=0, description="Rows per chunk when streaming large files")
 
 
 class ProcessedFile(BaseModel):
@@ -2,10 +2,13 @@
 CSV processing service for financial transaction data
 """
 
+import codecs
 import csv
+import itertools
+import os
 import io
 import chardet
-from typing import List, Dict, Any, Optional, Tuple, Union
+from typing import List, Dict, Any, Optional, Tuple, Union, Callable, Iterator
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 import logging
@@ -14,6 +17,11 @@ import re
 import pandas as pd
 import numpy as np
 
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover - optional, parsing falls back to the C engine
+    pyarrow = None
+
 from ..models.transaction import (
     Transaction,
     TransactionBase,
@@ -21,10 +29,166 @@ from ..models.transaction import (
     FileProcessingOptions,
     ProcessedFile
 )
+from ..models.base import fast_constructor
 from ..models.file import ValidationError, ValidationReport
+from ..utils.memory import paused_gc
 
 logger = logging.getLogger(__name__)
 
+# Parse with pyarrow's multithreaded reader when it is installed (it has no low_memory option)
+_READ_CSV_ENGINE_OPTIONS = {'engine': 'pyarrow'} if pyarrow is not None else {'low_memory': False}
+
+# Unvalidated Transaction constructor for rows built by _extract_columns
+build_transaction = fast_constructor(Transaction)
+
+# Text normalization regexes, compiled once instead of per description
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+# Canonical spellings for financial transaction words. Words that already are
+# canonical need no entry; everything is substituted in one pass.
+_CANONICAL_WORDS = {
+    'stores': 'store',
+}
+_CANONICAL_WORD_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, _CANONICAL_WORDS)) + r')\b')
+
+# Common patterns for merchant extraction, tried in order
+_MERCHANT_PATTERNS = [
+    re.compile(r'^([^#]+)#?\d*'),  # "STARBUCKS #1234" -> "STARBUCKS"
+    re.compile(r'^([A-Z\s]+)\s+\d+'),  # "MCDONALDS 123 MAIN ST" -> "MCDONALDS"
+    re.compile(r'^([^0-9]+)\s*\d*$'),  # "AMAZON 123" -> "AMAZON"
+]
+
+# Extracted names too generic to be a merchant
+_GENERIC_MERCHANT_TERMS = frozenset({'the', 'and', 'for', 'with'})
+
+
+class StructureValidation:
+    """Accumulates a CSV validation report over consecutive chunks of one file"""
+
+    def __init__(self, processor: 'CSVProcessor', mapping: ColumnMapping):
+        self.processor = processor
+        self.mapping = mapping
+        self.total_rows = 0
+        self.columns: Optional[pd.Index] = None
+        self.date_errors: List[ValidationError] = []
+
+        # Only columns mapped to transaction fields get duplicate and uniqueness analysis
+        self.mapped_columns = {source for _, source in mapping if source}
+
+        # Per column: value count, null count, dtypes seen and, for mapped columns,
+        # distinct non-null values
+        self._column_stats: Dict[str, Dict[str, Any]] = {}
+
+    def add_chunk(self, df: pd.DataFrame) -> None:
+        """Fold the next chunk of rows into the report"""
+        if self.columns is None:
+            self.columns = df.columns
+
+        null_counts = df.isna().sum().tolist()
+        for col, nulls, dtype in zip(df.columns, null_counts, df.dtypes.tolist()):
+            stats = self._column_stats.setdefault(col, {
+                'total': 0,
+                'nulls': 0,
+                'distinct': set() if col in self.mapped_columns else None,
+                'dtypes': set()
+            })
+            stats['total'] += len(df)
+            stats['nulls'] += int(nulls)
+            stats['dtypes'].add(str(dtype))
+            if stats['distinct'] is not None:
+                stats['distinct'].update(df[col].dropna().unique().tolist())
+
+        # Validate date column if present
+        if self.mapping.date_column and self.mapping.date_column in df.columns:
+            date_validation = self.processor._validate_date_column(
+                df[self.mapping.date_column], row_offset=self.total_rows
+            )
+            self.date_errors.extend(date_validation['errors'])
+
+        self.total_rows += len(df)
+
+    def report(self) -> ValidationReport:
+        """Build the validation report for all chunks added so far"""
+        columns = self.columns if self.columns is not None else pd.Index([])
+        errors = []
+        warnings = []
+        column_info = {}
+
+        total_rows = self.total_rows
+
+        # Check for required columns
+        required_columns = ['description_column', 'amount_column']
+        for req_col in required_columns:
+            col_name = getattr(self.mapping, req_col, None)
+            if not col_name or col_name not in columns:
+                errors.append(ValidationError(
+                    row=0,
+                    column=None,
+                    value=None,
+                    error_type="missing_column",
+                    message=f"Required column '{req_col}' not found or not mapped"
+                ))
+
+        # Validate each column
+        for col in columns:
+            col_info = self._column_info(self._column_stats[col])
+            column_info[col] = col_info
+
+            # Add warnings for low data quality
+            if col_info['null_percentage'] > 50:
+                warnings.append(f"Column '{col}' has {col_info['null_percentage']:.1f}% missing values")
+
+            if col_info.get('duplicate_percentage', 0) > 30:
+                warnings.append(f"Column '{col}' has {col_info['duplicate_percentage']:.1f}% duplicate values")
+
+        # Check for minimum row count
+        if total_rows < 2:
+            errors.append(ValidationError(
+                row=0,
+                column=None,
+                value=total_rows,
+                error_type="insufficient_data",
+                message="CSV must contain at least 2 rows (header + data)"
+            ))
+
+        errors.extend(self.date_errors)
+
+        return ValidationReport(
+            is_valid=len(errors) == 0,
+            total_rows=total_rows,
+            valid_rows=max(0, total_rows - len(errors)),
+            invalid_rows=len(errors),
+            errors=errors,
+            warnings=warnings,
+            column_info=column_info
+        )
+
+    def _column_info(self, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize accumulated stats for a single column"""
+        total_values = stats['total']
+        null_count = stats['nulls']
+        dtypes = stats['dtypes']
+
+        info = {
+            'total_values': total_values,
+            'null_count': null_count,
+            'null_percentage': (null_count / total_values * 100) if total_values > 0 else 0,
+            # Chunks can infer different dtypes for the same column
+            'data_type': next(iter(dtypes)) if len(dtypes) == 1 else 'object'
+        }
+
+        if stats['distinct'] is not None:
+            unique_values = len(stats['distinct'])
+            # Every repeat of a value (all nulls counting as one value) is a duplicate
+            duplicate_count = total_values - unique_values - (1 if null_count else 0)
+            info.update({
+                'duplicate_count': duplicate_count,
+                'duplicate_percentage': (duplicate_count / total_values * 100) if total_values > 0 else 0,
+                'unique_values': unique_values,
+            })
+
+        return info
+
 
 class CSVProcessor:
     """Service for processing CSV files with financial transaction data"""
@@ -65,22 +229,58 @@ class CSVProcessor:
         ]
     }
 
+    # One case-insensitive alternation per field; any alternative matching assigns the field
+    COMPILED_COLUMN_PATTERNS = {
+        field: re.compile('|'.join(patterns), re.IGNORECASE)
+        for field, patterns in COLUMN_PATTERNS.items()
+    }
+
+    # Byte order marks that identify an encoding without running detection
+    BYTE_ORDER_MARKS = [
+        (codecs.BOM_UTF8, 'utf-8-sig'),
+        (codecs.BOM_UTF32_LE, 'utf-32'),
+        (codecs.BOM_UTF32_BE, 'utf-32'),
+        (codecs.BOM_UTF16_LE, 'utf-16'),
+        (codecs.BOM_UTF16_BE, 'utf-16'),
+    ]
+
+    # Files larger than this are streamed in chunks instead of read whole
+    STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024
+
     def __init__(self):
         """Initialize CSV processor"""
         pass
 
-    def detect_encoding(self, file_path: str) -> str:
+    def detect_encoding(self, file_path: str, data: Optional[bytes] = None) -> str:
         """
-        Detect file encoding using chardet
+        Detect file encoding, using chardet only when the bytes are not BOM-marked or UTF-8
 
         Args:
             file_path: Path to the file
+            data: File contents if already read, sampled instead of reopening the file
 
         Returns:
             Detected encoding
         """
-        with open(file_path, 'rb') as f:
-            raw_data = f.read(10000)  # Read first 10KB for detection
+        if data is not None:
+            raw_data = data[:10000]
+        else:
+            with open(file_path, 'rb') as f:
+                raw_data = f.read(10000)  # Read first 10KB for detection
+
+        for bom, encoding in self.BYTE_ORDER_MARKS:
+            if raw_data.startswith(bom):
+                logger.info(f"Detected encoding for {file_path}: {encoding} (byte order mark)")
+                return encoding
+
+        try:
+            # Incremental decoding tolerates a multi-byte character cut off at the 10KB boundary
+            codecs.getincrementaldecoder('utf-8')().decode(raw_data, final=False)
+        except UnicodeDecodeError:
+            pass
+        else:
+            logger.info(f"Detected encoding for {file_path}: utf-8")
+            return 'utf-8'
 
         result = chardet.detect(raw_data)
         encoding = result.get('encoding', 'utf-8')
@@ -88,13 +288,19 @@ class CSVProcessor:
         logger.info(f"Detected encoding for {file_path}: {encoding} (confidence: {result.get('confidence', 0):.2f})")
         return encoding
 
-    def read_csv_with_encoding(self, file_path: str, encoding: Optional[str] = None) -> pd.DataFrame:
+    def read_csv_with_encoding(
+        self,
+        file_path: str,
+        encoding: Optional[str] = None,
+        data: Optional[bytes] = None
+    ) -> pd.DataFrame:
         """
         Read CSV file with automatic encoding detection
 
         Args:
             file_path: Path to CSV file
             encoding: Optional encoding override
+            data: File contents if already read, parsed instead of reopening the file
 
         Returns:
             Pandas DataFrame with CSV data
@@ -109,10 +315,10 @@ class CSVProcessor:
         for enc in encodings_to_try:
             try:
                 df = pd.read_csv(
-                    file_path,
+                    io.BytesIO(data) if data is not None else file_path,
                     encoding=enc,
-                    low_memory=False,
-                    on_bad_lines='skip'  # Skip malformed lines
+                    on_bad_lines='skip',  # Skip malformed lines
+                    **_READ_CSV_ENGINE_OPTIONS
                 )
                 logger.info(f"Successfully read {file_path} with encoding: {enc}")
                 return df
@@ -129,9 +335,9 @@ class CSVProcessor:
         # If all encodings failed, try with error handling
         try:
             df = pd.read_csv(
-                file_path,
+                io.BytesIO(data) if data is not None else file_path,
                 encoding='utf-8',
-                errors='replace',  # Replace invalid characters
+                encoding_errors='replace',  # Replace invalid characters
                 low_memory=False
             )
             logger.warning(f"Read {file_path} with error replacement")
@@ -140,6 +346,44 @@ class CSVProcessor:
             logger.error(f"Failed to read {file_path} with all encodings: {last_error}")
             raise Exception(f"Could not read CSV file {file_path}: {last_error}")
 
+    def read_csv_chunks(
+        self,
+        file_path: str,
+        encoding: str,
+        chunk_size: int,
+        data: Optional[bytes] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read a CSV file as consecutive DataFrame chunks
+
+        Files up to STREAMING_THRESHOLD_BYTES, or already read into data, are parsed
+        whole by read_csv_with_encoding; larger ones are streamed chunk_size rows at
+        a time so memory stays bounded.
+
+        Args:
+            file_path: Path to CSV file
+            encoding: Encoding from detect_encoding
+            chunk_size: Rows per chunk when streaming
+            data: File contents if already read
+
+        Returns:
+            Iterator of DataFrames with a continuous row index
+        """
+        if data is not None or os.path.getsize(file_path) <= self.STREAMING_THRESHOLD_BYTES:
+            yield self.read_csv_with_encoding(file_path, encoding, data=data)
+            return
+
+        # The pyarrow engine cannot stream, and detection only sampled the start of the
+        # file, so undecodable bytes further in are replaced rather than failing mid-read
+        with pd.read_csv(
+            file_path,
+            encoding=encoding,
+            encoding_errors='replace',
+            on_bad_lines='skip',
+            chunksize=chunk_size
+        ) as reader:
+            yield from reader
+
     def detect_column_types(self, df: pd.DataFrame) -> Dict[str, str]:
         """
         Detect column data types
@@ -166,11 +410,9 @@ class CSVProcessor:
             # Check for numeric patterns
             elif self._is_numeric_column(sample):
                 column_types[column] = 'numeric'
-            # Check for text patterns
-            elif self._is_text_column(sample):
-                column_types[column] = 'text'
+            # Neither dates nor numbers, which is what _is_text_column checks
             else:
-                column_types[column] = 'mixed'
+                column_types[column] = 'text'
 
         return column_types
 
@@ -179,11 +421,17 @@ class CSVProcessor:
         if len(series) == 0:
             return False
 
+        # Typed columns answer from their dtype; numbers would parse as epoch offsets
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return True
+        if pd.api.types.is_numeric_dtype(series):
+            return False
+
         # Try to parse as dates
         try:
-            pd.to_datetime(series.head(10), infer_datetime_format=True)
+            pd.to_datetime(series.head(10), format='mixed')
             return True
-        except:
+        except (ValueError, TypeError, OverflowError):
             return False
 
     def _is_numeric_column(self, series: pd.Series) -> bool:
@@ -191,11 +439,14 @@ class CSVProcessor:
         if len(series) == 0:
             return False
 
+        if pd.api.types.is_numeric_dtype(series):
+            return True
+
         # Check if values can be converted to numeric
         try:
             pd.to_numeric(series.head(10))
             return True
-        except:
+        except (ValueError, TypeError):
             return False
 
     def _is_text_column(self, series: pd.Series) -> bool:
@@ -216,18 +467,15 @@ class CSVProcessor:
         Returns:
             ColumnMapping with identified columns
         """
-        column_names = {col.lower().strip() for col in df.columns}
         mapping = ColumnMapping()
 
         # Match column patterns
         for col in df.columns:
             col_lower = col.lower().strip()
 
-            for field, patterns in self.COLUMN_PATTERNS.items():
-                for pattern in patterns:
-                    if re.search(pattern, col_lower, re.IGNORECASE):
-                        setattr(mapping, f"{field}_column", col)
-                        break
+            for field, pattern in self.COMPILED_COLUMN_PATTERNS.items():
+                if pattern.search(col_lower):
+                    setattr(mapping, f"{field}_column", col)
 
         return mapping
 
@@ -242,101 +490,33 @@ class CSVProcessor:
         Returns:
             ValidationReport with results
         """
+        validation = StructureValidation(self, mapping)
+        validation.add_chunk(df)
+        return validation.report()
+
+    def _validate_date_column(self, series: pd.Series, row_offset: int = 0) -> Dict[str, Any]:
+        """Validate date column specifically, numbering rows from row_offset"""
+        # Parse the whole column in one call; format='mixed' parses each value
+        # on its own like a scalar to_datetime, and utc=True lets mixed offsets
+        # coexist since only validity matters here
+        parsed = pd.to_datetime(series, errors='coerce', format='mixed', utc=True)
+        present = series.notna().to_numpy()
+        invalid = present & parsed.isna().to_numpy()
+        valid_dates = int(present.sum() - invalid.sum())
+
+        # Only the failing rows get an error object
+        values = series.to_numpy()
         errors = []
-        warnings = []
-        column_info = {}
-
-        total_rows = len(df)
-
-        # Check for required columns
-        required_columns = ['description_column', 'amount_column']
-        for req_col in required_columns:
-            col_name = getattr(mapping, req_col, None)
-            if not col_name or col_name not in df.columns:
-                errors.append(ValidationError(
-                    row=0,
-                    column=None,
-                    value=None,
-                    error_type="missing_column",
-                    message=f"Required column '{req_col}' not found or not mapped"
-                ))
-
-        # Validate each column
-        for col in df.columns:
-            col_info = self._validate_column(df[col], col)
-            column_info[col] = col_info
-
-            # Add warnings for low data quality
-            if col_info['null_percentage'] > 50:
-                warnings.append(f"Column '{col}' has {col_info['null_percentage']:.1f}% missing values")
-
-            if col_info['duplicate_percentage'] > 30:
-                warnings.append(f"Column '{col}' has {col_info['duplicate_percentage']:.1f}% duplicate values")
-
-        # Check for minimum row count
-        if total_rows < 2:
+        for i in np.flatnonzero(invalid):
+            value = values[i]
             errors.append(ValidationError(
-                row=0,
+                row=row_offset + int(i) + 2,  # +2 because row numbers are 1-based and we skip header
                 column=None,
-                value=total_rows,
-                error_type="insufficient_data",
-                message="CSV must contain at least 2 rows (header + data)"
+                value=str(value),
+                error_type="invalid_date",
+                message=f"Could not parse date: {value}"
             ))
 
-        # Validate date column if present
-        if mapping.date_column and mapping.date_column in df.columns:
-            date_validation = self._validate_date_column(df[mapping.date_column])
-            if not date_validation['is_valid']:
-                errors.extend(date_validation['errors'])
-
-        return ValidationReport(
-            is_valid=len(errors) == 0,
-            total_rows=total_rows,
-            valid_rows=max(0, total_rows - len(errors)),
-            invalid_rows=len(errors),
-            errors=errors,
-            warnings=warnings,
-            column_info=column_info
-        )
-
-    def _validate_column(self, series: pd.Series, column_name: str) -> Dict[str, Any]:
-        """Validate a single column"""
-        total_values = len(series)
-        null_count = series.isnull().sum()
-        duplicate_count = series.duplicated().sum()
-
-        return {
-            'total_values': total_values,
-            'null_count': int(null_count),
-            'null_percentage': (null_count / total_values * 100) if total_values > 0 else 0,
-            'duplicate_count': int(duplicate_count),
-            'duplicate_percentage': (duplicate_count / total_values * 100) if total_values > 0 else 0,
-            'unique_values': series.nunique(),
-            'data_type': str(series.dtype)
-        }
-
-    def _validate_date_column(self, series: pd.Series) -> Dict[str, Any]:
-        """Validate date column specifically"""
-        errors = []
-        valid_dates = 0
-
-        for i, value in enumerate(series):
-            if pd.isnull(value):
-                continue
-
-            try:
-                # Try to parse as date
-                pd.to_datetime(value)
-                valid_dates += 1
-            except:
-                errors.append(ValidationError(
-                    row=i + 2,  # +2 because row numbers are 1-based and we skip header
-                    column=None,
-                    value=str(value),
-                    error_type="invalid_date",
-                    message=f"Could not parse date: {value}"
-                ))
-
         return {
             'is_valid': len(errors) == 0,
             'valid_dates': valid_dates,
@@ -367,32 +547,46 @@ class CSVProcessor:
         if options is None:
             options = FileProcessingOptions()
 
-        # Detect encoding and read file
-        encoding = self.detect_encoding(file_path)
-        df = self.read_csv_with_encoding(file_path, encoding)
+        # Files that are parsed whole are read once; detection and parsing share the bytes
+        data = None
+        if os.path.getsize(file_path) <= self.STREAMING_THRESHOLD_BYTES:
+            with open(file_path, 'rb') as f:
+                data = f.read()
 
-        # Detect column types
-        column_types = self.detect_column_types(df)
+        # Detect encoding and start reading the file
+        encoding = self.detect_encoding(file_path, data)
+        chunks = self.read_csv_chunks(file_path, encoding, options.chunk_size, data)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            first_chunk = pd.DataFrame()
+
+        # Detect column types from the first chunk
+        column_types = self.detect_column_types(first_chunk)
 
         # Identify financial columns
-        column_mapping = self.identify_financial_columns(df)
+        column_mapping = self.identify_financial_columns(first_chunk)
 
         # Override with user-provided mapping if available
         if options.column_mapping:
             column_mapping = options.column_mapping
 
-        # Validate structure
-        validation_report = self.validate_csv_structure(df, column_mapping)
-
-        # Convert to transactions
-        transactions = self._convert_to_transactions(df, column_mapping, file_id, options)
+        # Validate and convert chunk by chunk, so only one chunk is held as a DataFrame
+        validation = StructureValidation(self, column_mapping)
+        transactions = []
+        for chunk in itertools.chain([first_chunk], chunks):
+            row_offset = validation.total_rows
+            validation.add_chunk(chunk)
+            transactions.extend(
+                self._convert_to_transactions(chunk, column_mapping, file_id, options, row_offset)
+            )
+        validation_report = validation.report()
 
         processing_time = time.time() - start_time
 
         processed_file = ProcessedFile(
             file_id=file_id,
             filename=file_path.split('/')[-1],
-            total_rows=len(df),
+            total_rows=validation.total_rows,
             valid_transactions=len([t for t in transactions if t.is_valid]),
             invalid_rows=len([t for t in transactions if not t.is_valid]),
             columns_detected=column_types,
@@ -406,93 +600,123 @@ class CSVProcessor:
         df: pd.DataFrame,
         mapping: ColumnMapping,
         file_id: str,
-        options: FileProcessingOptions
+        options: FileProcessingOptions,
+        row_offset: int = 0
     ) -> List[Transaction]:
-        """Convert DataFrame rows to Transaction objects"""
+        """Convert DataFrame rows to Transaction objects, numbering rows from row_offset"""
         transactions = []
 
-        for row_idx, (_, row) in enumerate(df.iterrows()):
-            try:
-                # Extract data using column mapping
-                transaction_data = self._extract_transaction_data(row, mapping, row_idx + 2)  # +2 for 1-based row numbers
-
-                # Create transaction object
-                transaction = Transaction(
-                    id=f"{file_id}_row_{row_idx + 2}",
-                    row_number=row_idx + 2,
-                    file_id=file_id,
-                    **transaction_data
-                )
-
-                # Apply text normalization if enabled
-                if options.normalize_text and transaction.description:
-                    transaction.normalized_description = self._normalize_text(transaction.description)
-
-                # Extract merchant name if enabled
-                if options.extract_merchants and transaction.description:
-                    transaction.merchant_name = self._extract_merchant_name(transaction.description)
-
-                transactions.append(transaction)
-
-            except Exception as e:
-                logger.error(f"Error processing row {row_idx + 2}: {e}")
-                # Create invalid transaction
-                transactions.append(Transaction(
-                    id=f"{file_id}_row_{row_idx + 2}",
-                    row_number=row_idx + 2,
-                    file_id=file_id,
-                    is_valid=False,
-                    validation_errors=[str(e)]
-                ))
+        # Resolve the mapping against the header once instead of per row
+        columns = mapping.resolve(df.columns)
+
+        # Convert each mapped column in one pass rather than building a Series per row
+        field_values = self._extract_columns(df, columns)
+
+        # Descriptions repeat heavily, so normalize and extract merchants once per distinct value
+        descriptions = field_values.get('description')
+        if descriptions is not None:
+            if options.normalize_text:
+                field_values['normalized_description'] = self._map_descriptions(self._normalize_text, descriptions)
+            if options.extract_merchants:
+                field_values['merchant_name'] = self._map_descriptions(self._extract_merchant_name, descriptions)
+
+        fields = list(field_values)
+        # With no mapped columns there is still one (empty) transaction per row
+        rows = zip(*field_values.values()) if fields else [()] * len(df)
+
+        # Rows allocate several acyclic objects each, which would otherwise trigger
+        # repeated collections that rescan every transaction built so far
+        with paused_gc():
+            for row_idx, values in enumerate(rows, start=row_offset):
+                try:
+                    # Extracted values already have the field types, so skip validation
+                    transaction = build_transaction(
+                        id=f"{file_id}_row_{row_idx + 2}",  # +2 for 1-based row numbers
+                        row_number=row_idx + 2,
+                        file_id=file_id,
+                        **dict(zip(fields, values))
+                    )
+                    transactions.append(transaction)
+
+                except Exception as e:
+                    logger.error(f"Error processing row {row_idx + 2}: {e}")
+                    # Create invalid transaction
+                    transactions.append(Transaction(
+                        id=f"{file_id}_row_{row_idx + 2}",
+                        row_number=row_idx + 2,
+                        file_id=file_id,
+                        is_valid=False,
+                        validation_errors=[str(e)]
+                    ))
 
         return transactions
 
-    def _extract_transaction_data(self, row: pd.Series, mapping: ColumnMapping, row_number: int) -> Dict[str, Any]:
-        """Extract transaction data from a DataFrame row"""
-        data = {}
-
-        # Extract date
-        if mapping.date_column and mapping.date_column in row:
-            try:
-                data['date'] = pd.to_datetime(row[mapping.date_column]).to_pydantic()
-            except:
-                data['date'] = None
+    def _extract_columns(self, df: pd.DataFrame, columns: Dict[str, str]) -> Dict[str, List[Any]]:
+        """
+        Extract transaction field values from the mapped DataFrame columns
 
-        # Extract description
-        if mapping.description_column and mapping.description_column in row:
-            data['description'] = str(row[mapping.description_column]).strip()
+        Args:
+            df: Pandas DataFrame
+            columns: Target field to source column, from ColumnMapping.resolve
 
-        # Extract amount
-        if mapping.amount_column and mapping.amount_column in row:
-            try:
-                amount_str = str(row[mapping.amount_column]).strip()
-                # Handle parentheses for negative amounts
-                if amount_str.startswith('(') and amount_str.endswith(')'):
-                    amount_str = f"-{amount_str[1:-1]}"
-                data['amount'] = Decimal(amount_str)
-            except (InvalidOperation, ValueError):
-                data['amount'] = None
-
-        # Extract balance
-        if mapping.balance_column and mapping.balance_column in row:
-            try:
-                data['balance'] = Decimal(str(row[mapping.balance_column]).strip())
-            except (InvalidOperation, ValueError):
-                data['balance'] = None
+        Returns:
+            Values per transaction field, aligned with the DataFrame rows
+        """
+        data = {}
 
-        # Extract category
-        if mapping.category_column and mapping.category_column in row:
-            data['category'] = str(row[mapping.category_column]).strip()
+        for field, column in columns.items():
+            series = df[column]
+            if field == 'date':
+                data[field] = self._parse_dates(series)
+            elif field == 'amount':
+                data[field] = self._parse_numbers(series, self._parse_amount)
+            elif field == 'balance':
+                data[field] = self._parse_numbers(series, self._parse_decimal)
+            else:
+                data[field] = [str(value).strip() for value in series.tolist()]
 
-        # Extract account
-        if mapping.account_column and mapping.account_column in row:
-            data['account'] = str(row[mapping.account_column]).strip()
+        return data
 
-        # Extract reference
-        if mapping.reference_column and mapping.reference_column in row:
-            data['reference'] = str(row[mapping.reference_column]).strip()
+    def _map_descriptions(self, func: Callable[[str], Optional[str]],
+                          descriptions: List[str]) -> List[Optional[str]]:
+        """Apply func once per distinct non-empty description, None for empty ones"""
+        results = {description: func(description) for description in set(descriptions) if description}
+        return [results.get(description) for description in descriptions]
 
-        return data
+    def _parse_dates(self, series: pd.Series) -> List[Optional[datetime]]:
+        """Parse a date column, with None for values that are not dates"""
+        try:
+            parsed = pd.to_datetime(series, errors='coerce', format='mixed')
+        except (ValueError, TypeError):
+            # Offsets differ between rows, so normalize everything to UTC
+            parsed = pd.to_datetime(series, errors='coerce', format='mixed', utc=True)
+
+        return [None if timestamp is pd.NaT else timestamp.to_pydatetime() for timestamp in parsed]
+
+    def _parse_numbers(self, series: pd.Series,
+                       parse: Callable[[Any], Optional[Decimal]]) -> List[Optional[Decimal]]:
+        """Parse a money column, converting each distinct value once"""
+        values = series.tolist()
+        # Amounts repeat heavily, and Decimal parsing dominates the cost per value
+        parsed = {value: parse(value) for value in set(values)}
+        return [parsed[value] for value in values]
+
+    def _parse_amount(self, value: Any) -> Optional[Decimal]:
+        """Parse an amount, treating parenthesised values as negative"""
+        amount_str = str(value).strip()
+        # Handle parentheses for negative amounts
+        if amount_str.startswith('(') and amount_str.endswith(')'):
+            amount_str = f"-{amount_str[1:-1]}"
+        return self._parse_decimal(amount_str)
+
+    def _parse_decimal(self, value: Any) -> Optional[Decimal]:
+        """Parse a decimal value, or None if it is not a finite number"""
+        try:
+            number = Decimal(str(value).strip())
+        except (InvalidOperation, ValueError):
+            return None
+        # Missing cells arrive as float NaN, which Decimal would accept as 'nan'
+        return number if number.is_finite() else None
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text for better matching"""
@@ -503,27 +727,13 @@ class CSVProcessor:
         normalized = text.lower()
 
         # Remove extra whitespace
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
+        normalized = _WHITESPACE_RE.sub(' ', normalized).strip()
 
         # Remove special characters but keep letters, numbers, and spaces
-        normalized = re.sub(r'[^\w\s]', '', normalized)
+        normalized = _NON_WORD_RE.sub('', normalized)
 
         # Common text normalizations for financial transactions
-        replacements = [
-            (r'\bstores?\b', 'store'),
-            (r'\bmarket\b', 'market'),
-            (r'\bgrocery\b', 'grocery'),
-            (r'\bgas\b', 'gas'),
-            (r'\brestaurant\b', 'restaurant'),
-            (r'\bpharmacy\b', 'pharmacy'),
-            (r'\batm\b', 'atm'),
-            (r'\bonline\b', 'online'),
-            (r'\bpayment\b', 'payment'),
-            (r'\btransfer\b', 'transfer'),
-        ]
-
-        for pattern, replacement in replacements:
-            normalized = re.sub(pattern, replacement, normalized)
+        normalized = _CANONICAL_WORD_RE.sub(lambda m: _CANONICAL_WORDS[m.group(0)], normalized)
 
         return normalized
 
@@ -532,19 +742,13 @@ class CSVProcessor:
         if not description:
             return None
 
-        # Common patterns for merchant extraction
-        patterns = [
-            r'^([^#]+)#?\d*',  # "STARBUCKS #1234" -> "STARBUCKS"
-            r'^([A-Z\s]+)\s+\d+',  # "MCDONALDS 123 MAIN ST" -> "MCDONALDS"
-            r'^([^0-9]+)\s*\d*$',  # "AMAZON 123" -> "AMAZON"
-        ]
-
-        for pattern in patterns:
-            match = re.match(pattern, description.strip())
+        stripped = description.strip()
+        for pattern in _MERCHANT_PATTERNS:
+            match = pattern.match(stripped)
             if match:
                 merchant = match.group(1).strip()
                 # Filter out very short or generic terms
-                if len(merchant) > 2 and merchant.lower() not in ['the', 'and', 'for', 'with']:
+                if len(merchant) > 2 and merchant.lower() not in _GENERIC_MERCHANT_TERMS:
                     return merchant
 
         return None
@@ -4,9 +4,10 @@ Merchant patterns management service
 
 import re
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, NamedTuple
 from datetime import datetime
 import uuid
+from collections import Counter
 
 from ..models.merchant_patterns import (
     MerchantPattern, MerchantPatternCreate, MerchantPatternUpdate,
@@ -15,14 +16,51 @@ from ..models.merchant_patterns import (
 
 logger = logging.getLogger(__name__)
 
+# Numbered backreference such as \1 inside a regex pattern
+_BACKREFERENCE = re.compile(r'\\[1-9]')
+
+# Words considered when generating patterns from descriptions
+_WORD = re.compile(r'\b\w+\b')
+
+
+class RankedPattern(NamedTuple):
+    """Active pattern with the values matching needs, precomputed once per pattern change"""
+    position: int  # Index in patterns_db, for tie-breaking
+    pattern: MerchantPattern
+    compiled: re.Pattern
+    confidence: float
+    boosted_confidence: float  # Confidence after the exact-match boost
+    exact_text: str  # Pattern text a description must equal to get the boost
+
 
 class MerchantPatternManager:
     """Service for managing merchant patterns"""
 
+    # Upper bound on cached description lookups; the cache is simply reset when it fills up
+    MAX_CACHED_DESCRIPTIONS = 8192
+
     def __init__(self):
         # In-memory storage for MVP (could be replaced with database)
         self.patterns_db: Dict[str, MerchantPattern] = {}
 
+        # Compiled regex per pattern ID, kept in sync on create/update/delete
+        self._compiled_patterns: Dict[str, re.Pattern] = {}
+
+        # Patterns tied on the best match confidence per lowercased description.
+        # Ties are re-ranked by live usage on each hit, since every extraction
+        # changes it; cleared whenever patterns change.
+        self._match_cache: Dict[str, Tuple[RankedPattern, ...]] = {}
+
+        # One alternation of all active patterns, used to reject descriptions
+        # that match nothing in a single scan. Rebuilt lazily after changes;
+        # None when the patterns cannot be safely combined.
+        self._prefilter: Optional[re.Pattern] = None
+        self._prefilter_built = False
+
+        # Active patterns with their storage position, by descending confidence.
+        # Rebuilt lazily after changes.
+        self._ranked_patterns: Optional[List[RankedPattern]] = None
+
         # Default patterns to bootstrap the system
         self._initialize_default_patterns()
 
@@ -43,11 +81,13 @@ class MerchantPatternManager:
 
         # Validate pattern
         try:
-            re.compile(pattern.pattern, re.IGNORECASE)
+            compiled = re.compile(pattern.pattern, re.IGNORECASE)
         except re.error as e:
             raise ValueError(f"Invalid regex pattern: {e}")
 
         self.patterns_db[pattern.id] = pattern
+        self._compiled_patterns[pattern.id] = compiled
+        self._invalidate_matches()
         logger.info(f"Created merchant pattern: {pattern.name}")
         return pattern
 
@@ -61,19 +101,24 @@ class MerchantPatternManager:
         if not pattern:
             raise ValueError(f"Pattern {pattern_id} not found")
 
-        # Apply updates
         update_data = updates.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            if hasattr(pattern, field):
-                setattr(pattern, field, value)
 
-        # Validate pattern if it was updated
+        # Validate pattern before applying anything, so a bad regex leaves the pattern intact
+        compiled = None
         if 'pattern' in update_data:
             try:
-                re.compile(pattern.pattern, re.IGNORECASE)
+                compiled = re.compile(update_data['pattern'], re.IGNORECASE)
             except re.error as e:
                 raise ValueError(f"Invalid regex pattern: {e}")
 
+        # Apply updates
+        for field, value in update_data.items():
+            if hasattr(pattern, field):
+                setattr(pattern, field, value)
+        if compiled is not None:
+            self._compiled_patterns[pattern_id] = compiled
+        self._invalidate_matches()
+
         pattern.updated_at = datetime.utcnow()
         logger.info(f"Updated merchant pattern: {pattern.name}")
         return pattern
@@ -83,6 +128,8 @@ class MerchantPatternManager:
         if pattern_id in self.patterns_db:
             pattern = self.patterns_db[pattern_id]
             del self.patterns_db[pattern_id]
+            self._compiled_patterns.pop(pattern_id, None)
+            self._invalidate_matches()
             logger.info(f"Deleted merchant pattern: {pattern.name}")
             return True
         return False
@@ -103,37 +150,172 @@ class MerchantPatternManager:
         if not description:
             return 'UNKNOWN'
 
-        description_lower = description.lower()
-        best_match = None
-        best_confidence = 0.0
-
-        # Test each active pattern
-        for pattern in self.list_patterns():
-            try:
-                if re.search(pattern.pattern, description_lower, re.IGNORECASE):
-                    # Calculate match confidence
-                    match_confidence = pattern.confidence
-
-                    # Boost confidence for exact matches
-                    if pattern.pattern.strip(r'\b') == description_lower.strip():
-                        match_confidence = min(1.0, match_confidence + 0.1)
-
-                    if match_confidence > best_confidence:
-                        best_confidence = match_confidence
-                        best_match = pattern
-
-            except re.error:
-                logger.warning(f"Invalid regex pattern for {pattern.name}: {pattern.pattern}")
-                continue
+        best_match = self._match_description(description)
 
         if best_match:
             # Update usage statistics
             best_match.usage_count += 1
-            self.patterns_db[best_match.id] = best_match
             return best_match.name
 
         return 'UNKNOWN'
 
+    def extract_merchants(self, descriptions: List[str]) -> List[str]:
+        """
+        Extract merchant names for many descriptions at once
+
+        Each distinct description is matched once and usage statistics are
+        credited for every occurrence, so results and counts match calling
+        extract_merchant_from_description per description.
+
+        Args:
+            descriptions: Transaction descriptions
+
+        Returns:
+            Merchant name (or 'UNKNOWN') for each description, in order
+        """
+        merchants: Dict[str, str] = {}
+
+        for description, occurrences in Counter(descriptions).items():
+            best_match = self._match_description(description) if description else None
+            if best_match:
+                best_match.usage_count += occurrences
+                merchants[description] = best_match.name
+            else:
+                merchants[description] = 'UNKNOWN'
+
+        return [merchants[description] for description in descriptions]
+
+    def _match_description(self, description: str) -> Optional[MerchantPattern]:
+        """Find the best pattern for a description, reusing cached lookups"""
+        description_lower = description.lower()
+
+        candidates = self._match_cache.get(description_lower)
+        if candidates is None:
+            prefilter = self._get_prefilter()
+            if prefilter is not None and not prefilter.search(description_lower):
+                candidates = ()
+            else:
+                candidates = tuple(self._find_top_matches(description_lower))
+
+            if len(self._match_cache) >= self.MAX_CACHED_DESCRIPTIONS:
+                self._match_cache.clear()
+            self._match_cache[description_lower] = candidates
+
+        return self._break_tie(candidates)
+
+    def _invalidate_matches(self) -> None:
+        """Drop cached lookups and the prefilter after a pattern change"""
+        self._match_cache.clear()
+        self._prefilter = None
+        self._prefilter_built = False
+        self._ranked_patterns = None
+
+    def _get_ranked_patterns(self) -> List[RankedPattern]:
+        """Get active patterns by descending confidence, ties kept in storage order"""
+        if self._ranked_patterns is None:
+            ranked = []
+            for position, pattern in enumerate(self.patterns_db.values()):
+                if not pattern.is_active:
+                    continue
+
+                compiled = self._compiled_patterns.get(pattern.id)
+                if compiled is None:
+                    try:
+                        compiled = re.compile(pattern.pattern, re.IGNORECASE)
+                    except re.error:
+                        logger.warning(f"Invalid regex pattern for {pattern.name}: {pattern.pattern}")
+                        continue
+                    self._compiled_patterns[pattern.id] = compiled
+
+                ranked.append(RankedPattern(
+                    position=position,
+                    pattern=pattern,
+                    compiled=compiled,
+                    confidence=pattern.confidence,
+                    boosted_confidence=min(1.0, pattern.confidence + 0.1),
+                    exact_text=pattern.pattern.strip(r'\b')
+                ))
+            ranked.sort(key=lambda entry: -entry.confidence)
+            self._ranked_patterns = ranked
+        return self._ranked_patterns
+
+    def _get_prefilter(self) -> Optional[re.Pattern]:
+        """Get the combined active-pattern regex, building it on first use"""
+        if not self._prefilter_built:
+            self._prefilter = self._build_prefilter(
+                [entry.pattern for entry in self._get_ranked_patterns()]
+            )
+            self._prefilter_built = True
+        return self._prefilter
+
+    def _build_prefilter(self, patterns: List[MerchantPattern]) -> Optional[re.Pattern]:
+        """Combine patterns into one alternation, or None if that could change matches"""
+        if not patterns:
+            return None
+
+        sources = [pattern.pattern for pattern in patterns]
+        # Numbered backreferences would point at the wrong group once combined
+        if any(_BACKREFERENCE.search(source) for source in sources):
+            return None
+
+        try:
+            return re.compile('|'.join(f'(?:{source})' for source in sources), re.IGNORECASE)
+        except re.error:
+            # e.g. a group name reused across patterns
+            return None
+
+    def _find_best_pattern(self, description_lower: str) -> Optional[MerchantPattern]:
+        """
+        Find the highest-confidence pattern matching a lowercased description
+
+        Ties go to the pattern listed first by list_patterns (most used, then most
+        confident, then oldest).
+        """
+        return self._break_tie(self._find_top_matches(description_lower))
+
+    def _find_top_matches(self, description_lower: str) -> List[RankedPattern]:
+        """Find every pattern matching a lowercased description at the best match confidence"""
+        top_matches: List[RankedPattern] = []
+        best_confidence: Optional[float] = None
+        description_key = description_lower.strip()
+
+        # Test active patterns from most to least confident
+        for entry in self._get_ranked_patterns():
+            # Once even the exact-match boost cannot reach the best confidence found,
+            # no remaining pattern can tie
+            if best_confidence is not None and entry.boosted_confidence < best_confidence:
+                break
+
+            if entry.compiled.search(description_lower):
+                # Boost confidence for exact matches
+                if entry.exact_text == description_key:
+                    match_confidence = entry.boosted_confidence
+                else:
+                    match_confidence = entry.confidence
+
+                if match_confidence <= 0.0:
+                    continue
+
+                if best_confidence is None or match_confidence > best_confidence:
+                    best_confidence = match_confidence
+                    top_matches = [entry]
+                elif match_confidence == best_confidence:
+                    top_matches.append(entry)
+
+        return top_matches
+
+    @staticmethod
+    def _break_tie(candidates) -> Optional[MerchantPattern]:
+        """Pick the most used, then most confident, then oldest of equally confident matches"""
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0].pattern
+        return max(
+            candidates,
+            key=lambda entry: (entry.pattern.usage_count, entry.confidence, -entry.position)
+        ).pattern
+
     def get_stats(self) -> MerchantPatternStats:
         """Get statistics about merchant patterns"""
         patterns = self.list_patterns(active_only=False)
@@ -175,16 +357,15 @@ class MerchantPatternManager:
         """Learn new patterns from labeled transaction data"""
         new_patterns = []
 
-        # Group transactions by merchant and label
-        merchant_labels = {}
-        for transaction in transactions:
-            if not transaction.get('label'):
-                continue
-
-            merchant = self.extract_merchant_from_description(
-                str(transaction.get('Description', transaction.get('description', '')))
-            )
+        labeled = [transaction for transaction in transactions if transaction.get('label')]
+        descriptions = [
+            str(transaction.get('Description', transaction.get('description', '')))
+            for transaction in labeled
+        ]
 
+        # Group transactions by merchant and label, matching each distinct description once
+        merchant_labels = {}
+        for transaction, description, merchant in zip(labeled, descriptions, self.extract_merchants(descriptions)):
             if merchant != 'UNKNOWN':
                 key = f"{merchant}_{transaction['label']}"
                 if key not in merchant_labels:
@@ -195,9 +376,7 @@ class MerchantPatternManager:
                         'count': 0
                     }
 
-                merchant_labels[key]['descriptions'].append(
-                    str(transaction.get('Description', transaction.get('description', '')))
-                )
+                merchant_labels[key]['descriptions'].append(description)
                 merchant_labels[key]['count'] += 1
 
         # Create patterns for frequently occurring merchant-label combinations
@@ -224,20 +403,17 @@ class MerchantPatternManager:
         if len(descriptions) < 2:
             return None
 
-        # Find common words across descriptions
-        word_counts = {}
-        for desc in descriptions:
-            words = set(re.findall(r'\b\w+\b', desc.lower()))
-            for word in words:
-                if len(word) > 2:  # Only consider words longer than 2 characters
-                    word_counts[word] = word_counts.get(word, 0) + 1
-
-        # Find words that appear in most descriptions
-        total_descs = len(descriptions)
-        common_words = [
-            word for word, count in word_counts.items()
-            if count >= max(2, total_descs * 0.5)  # Appear in at least 50% of descriptions
-        ]
+        # Count the descriptions each word appears in, taking words in order of first use
+        word_counts = Counter(
+            word
+            for desc in descriptions
+            for word in dict.fromkeys(_WORD.findall(desc.lower()))
+            if len(word) > 2  # Only consider words longer than 2 characters
+        )
+
+        # Find words that appear in most descriptions, most frequent first
+        threshold = max(2, len(descriptions) * 0.5)  # Appear in at least 50% of descriptions
+        common_words = [word for word, count in word_counts.most_common() if count >= threshold]
 
         if len(common_words) >= 2:
             # Create pattern with common words
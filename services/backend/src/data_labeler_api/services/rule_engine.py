@@ -4,23 +4,63 @@ Enhanced rule engine service for server-side rule matching and recommendations
 
 import re
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import secrets
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
-import uuid
 
 from ..models.rule import Rule, RuleMatch, RulePreview, RuleValidation
 from ..models.transaction import Transaction
-from ..models.configuration import config_manager
+from ..models.configuration import DomainConfiguration, config_manager
 from ..services.merchant_patterns import pattern_manager
+from ..utils.dates import parse_iso_datetime
 
 logger = logging.getLogger(__name__)
 
+# Runs of word characters, in condition text and transaction fields
+_WORD = re.compile(r'\w+')
+
+# Generic description cleanup used when no domain config has cleaning patterns
+_TRAILING_NUMBERS_RE = re.compile(r'\s*[\d*#]+\s*$')
+_REFERENCE_RE = re.compile(r'\s+REF\s*[:#]?\s*\w+.*$', re.IGNORECASE)
+
+# Rule conditions matched as text against the transaction field of the same name
+_TEXT_CONDITIONS = ('merchant', 'description', 'category')
+
+# Word index for find_matches_bulk: rules that must always be evaluated, and
+# per field the rules a transaction word makes candidates
+AnchorIndex = Tuple[List[int], Dict[str, Dict[str, List[int]]]]
+
 
 class RuleEngine:
     """Enhanced rule engine for server-side processing"""
 
+    # Upper bounds on cached regexes and rule matchers; caches are simply reset when they fill up
+    MAX_COMPILED_PATTERNS = 1024
+    MAX_COMPILED_RULES = 1024
+
+    # Fewest narrowable rules for which find_matches_bulk builds a word index
+    MIN_INDEXED_RULES = 8
+
     def __init__(self):
-        self.compiled_patterns = {}  # Cache for compiled regex patterns
+        self.compiled_patterns: Dict[Tuple[str, int], re.Pattern] = {}  # Cache for compiled regex patterns
+        self.compiled_rules: Dict[str, Tuple[datetime, Callable]] = {}  # Rule ID -> (updated_at, matcher)
+        # Domain name -> (config, compiled cleaning patterns); configs are replaced, not mutated, on change
+        self.cleaning_pipelines: Dict[str, Tuple[DomainConfiguration, List[Tuple[re.Pattern, str]]]] = {}
+
+    def _compile(self, pattern: str, flags: int = re.IGNORECASE) -> re.Pattern:
+        """Compile a regex pattern, reusing a cached instance when available"""
+        key = (pattern, flags)
+        compiled = self.compiled_patterns.get(key)
+        if compiled is None:
+            if len(self.compiled_patterns) >= self.MAX_COMPILED_PATTERNS:
+                self.compiled_patterns.clear()
+            compiled = re.compile(pattern, flags)
+            self.compiled_patterns[key] = compiled
+        return compiled
+
+    def generate_rule_id(self) -> str:
+        """Generate a unique rule ID"""
+        return f"rule_{secrets.token_hex(4)}"
 
     def extract_merchant(self, description: str) -> str:
         """Extract merchant name from transaction description using configurable patterns"""
@@ -30,6 +70,10 @@ class RuleEngine:
         # Use the pattern manager to extract merchant
         return pattern_manager.extract_merchant_from_description(description)
 
+    def extract_merchants(self, descriptions: List[str]) -> List[str]:
+        """Extract merchant names for many descriptions, matching each distinct one once"""
+        return pattern_manager.extract_merchants(descriptions)
+
     def _clean_description(self, description: str, domain_config: str = None) -> str:
         """Clean description using domain-specific configuration"""
         if not description:
@@ -42,19 +86,30 @@ class RuleEngine:
 
         if config and config.cleaning_patterns:
             # Apply domain-specific cleaning patterns
-            for cleaning_pattern in config.cleaning_patterns:
-                try:
-                    cleaned = re.sub(cleaning_pattern.pattern, cleaning_pattern.replacement, cleaned, flags=re.IGNORECASE)
-                except re.error:
-                    logger.warning(f"Invalid cleaning pattern: {cleaning_pattern.pattern}")
-                    continue
+            for pattern, replacement in self._cleaning_pipeline(config):
+                cleaned = pattern.sub(replacement, cleaned)
         else:
             # Apply minimal generic cleaning if no domain config
-            cleaned = re.sub(r'\s*[\d*#]+\s*$', '', cleaned)  # Remove trailing numbers/special chars
-            cleaned = re.sub(r'\s+REF\s*[:#]?\s*\w+.*$', '', cleaned, flags=re.IGNORECASE)  # Remove references
+            cleaned = _TRAILING_NUMBERS_RE.sub('', cleaned)  # Remove trailing numbers/special chars
+            cleaned = _REFERENCE_RE.sub('', cleaned)  # Remove references
 
         return cleaned.strip()
 
+    def _cleaning_pipeline(self, config: DomainConfiguration) -> List[Tuple[re.Pattern, str]]:
+        """Get a config's cleaning patterns compiled, skipping (and logging once) invalid ones"""
+        cached = self.cleaning_pipelines.get(config.domain_name)
+        if cached and cached[0] is config:
+            return cached[1]
+
+        pipeline = []
+        for cleaning_pattern in config.cleaning_patterns:
+            try:
+                pipeline.append((self._compile(cleaning_pattern.pattern), cleaning_pattern.replacement))
+            except re.error:
+                logger.warning(f"Invalid cleaning pattern: {cleaning_pattern.pattern}")
+        self.cleaning_pipelines[config.domain_name] = (config, pipeline)
+        return pipeline
+
     def generate_regex_pattern(self, text: str, fuzzy: bool = True) -> str:
         """Generate regex pattern from text with smart escaping"""
         if not text:
@@ -65,11 +120,11 @@ class RuleEngine:
 
         if fuzzy:
             # For fuzzy matching, use word boundaries
-            flexible = escaped.replace(r'\ ', r'[\\s\\-_]+')
+            flexible = escaped.replace(r'\ ', r'[\s\-_]+')
             return f'\\b{flexible}\\b'
         else:
             # For exact matching, use strict word boundaries
-            semi_flexible = escaped.replace(r'\ ', r'[\\s\\-_]*')
+            semi_flexible = escaped.replace(r'\ ', r'[\s\-_]*')
             return f'\\b{semi_flexible}\\b'
 
     def match_rule_against_transaction(self, rule: Rule, transaction: Dict[str, Any]) -> Optional[RuleMatch]:
@@ -77,96 +132,278 @@ class RuleEngine:
         if not rule.is_active:
             return None
 
-        description = str(transaction.get('Description', transaction.get('description', '')))
-        amount = float(transaction.get('Amount', transaction.get('amount', 0)) or 0)
-        date_str = transaction.get('Date', transaction.get('date', ''))
-        category = str(transaction.get('Category', transaction.get('category', '')))
+        features = self._transaction_features(transaction, with_merchant=bool(rule.conditions.merchant))
+        return self.compile_rule(rule)(features)
 
-        date = None
-        if date_str:
-            try:
-                date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                pass
+    def find_matching_transactions(self, rule: Rule, transactions: List[Dict[str, Any]]) -> List[RuleMatch]:
+        """Find all transactions that match a rule"""
+        return self.find_matches_bulk([rule], transactions)
+
+    def find_matches_bulk(self, rules: List[Rule], transactions: List[Dict[str, Any]]) -> List[RuleMatch]:
+        """
+        Find matches for many rules in a single pass over the transactions
+
+        Each transaction's fields (and merchant, if any rule needs it) are
+        extracted once and shared by every rule, and each rule is evaluated
+        through its compiled matcher (see compile_rule).
+
+        Args:
+            rules: Rules to evaluate; inactive rules never match
+            transactions: Transactions to match against
+
+        Returns:
+            Matches grouped by rule, in the order the rules were given
+        """
+        active_rules = [rule for rule in rules if rule.is_active]
+        if not active_rules:
+            return []
+
+        matchers = [self.compile_rule(rule) for rule in active_rules]
+        with_merchant = any(rule.conditions.merchant for rule in active_rules)
+        matches_by_rule: List[List[RuleMatch]] = [[] for _ in matchers]
+
+        # With many rules, look up the rules a transaction's words can satisfy
+        # instead of running every rule's regexes against it
+        anchors = [self._rule_anchors(rule) for rule in active_rules]
+        index = None
+        if sum(rule_anchors is not None for rule_anchors in anchors) >= self.MIN_INDEXED_RULES:
+            index = self._build_anchor_index(anchors)
+        all_rules = range(len(matchers))
 
-        matched_conditions = []
+        for transaction in transactions:
+            features = self._transaction_features(transaction, with_merchant=with_merchant)
+            candidates = self._candidate_rules(index, features) if index is not None else None
+            for rule_index in all_rules if candidates is None else candidates:
+                match = matchers[rule_index](features)
+                if match:
+                    matches_by_rule[rule_index].append(match)
+
+        return [match for rule_matches in matches_by_rule for match in rule_matches]
+
+    def _condition_anchor(self, text: str) -> Optional[str]:
+        """
+        Find a lowercased word that every match of a text condition contains as a whole word
+
+        generate_regex_pattern escapes the text, joins its space-separated pieces
+        with separator classes that may be empty or hold word characters, and
+        wraps it in \\b. A run of word characters is thus a whole word of the
+        matched text only if each side meets a non-word character of its own
+        piece or an end of the text. Prefers the longest such ASCII run.
+        """
+        pieces = text.split(' ')
+        anchor = None
+        for position, piece in enumerate(pieces):
+            for run in _WORD.finditer(piece):
+                word = run.group()
+                bounded_left = run.start() > 0 or position == 0
+                bounded_right = run.end() < len(piece) or position == len(pieces) - 1
+                if bounded_left and bounded_right and word.isascii():
+                    if anchor is None or len(word) > len(anchor):
+                        anchor = word
+        return anchor.lower() if anchor else None
+
+    def _rule_anchors(self, rule: Rule) -> Optional[List[Tuple[str, str]]]:
+        """
+        Get (field, word) pairs of which a transaction needs at least one for the rule to match
+
+        None when a rule cannot be narrowed this way: an amount or date condition
+        matches on its own, and a text condition may have no anchor word.
+        """
+        conditions = rule.conditions
+        amount_conditions = conditions.amount or {}
+        date_range = conditions.date_range or {}
+        if any(amount_conditions.get(bound) is not None for bound in ('exact', 'min', 'max')):
+            return None
+        if date_range.get('start') or date_range.get('end'):
+            return None
 
-        # Check merchant condition
-        if rule.conditions.merchant:
-            merchant = self.extract_merchant(description)
-            merchant_pattern = self.generate_regex_pattern(rule.conditions.merchant, False)
-            if re.search(merchant_pattern, merchant, re.IGNORECASE):
-                matched_conditions.append('merchant')
+        anchors = []
+        for field in _TEXT_CONDITIONS:
+            text = getattr(conditions, field)
+            if text:
+                anchor = self._condition_anchor(text)
+                if anchor is None:
+                    return None
+                anchors.append((field, anchor))
+        return anchors
+
+    def _build_anchor_index(self, anchors: List[Optional[List[Tuple[str, str]]]]) -> AnchorIndex:
+        """Index rule positions by the anchor words from _rule_anchors"""
+        always = []
+        by_field: Dict[str, Dict[str, List[int]]] = {}
+        for rule_index, rule_anchors in enumerate(anchors):
+            if rule_anchors is None:
+                always.append(rule_index)
+                continue
+            for field, word in rule_anchors:
+                by_field.setdefault(field, {}).setdefault(word, []).append(rule_index)
+        return always, by_field
+
+    def _candidate_rules(self, index: AnchorIndex, features: Dict[str, Any]) -> Optional[List[int]]:
+        """Get positions of the rules that can match a transaction, or None for all of them"""
+        always, by_field = index
+        candidates = set()
+        for field, rules_by_word in by_field.items():
+            text = features[field] or ''
+            # Anchors are compared lowercased, which only mirrors IGNORECASE for ASCII
+            if not text.isascii():
+                return None
+            for word in _WORD.findall(features[f'{field}_lower']):
+                rule_indexes = rules_by_word.get(word)
+                if rule_indexes:
+                    candidates.update(rule_indexes)
+        return always + list(candidates) if candidates else always
+
+    def _transaction_features(self, transaction: Dict[str, Any], with_merchant: bool = False) -> Dict[str, Any]:
+        """Extract the fields rules are matched on from a transaction, with lowercased text fields"""
+        description = str(transaction.get('description') or '')
+        category = str(transaction.get('category') or '')
+        merchant = self.extract_merchant(description) if with_merchant else None
+        return {
+            'id': str(transaction.get('id', '')),
+            'description': description,
+            'description_lower': description.lower(),
+            'amount': float(transaction.get('amount') or 0),
+            'date': parse_iso_datetime(transaction.get('date')),
+            'category': category,
+            'category_lower': category.lower(),
+            'merchant': merchant,
+            'merchant_lower': merchant.lower() if merchant is not None else None,
+        }
 
-        # Check description condition
-        if rule.conditions.description:
-            description_pattern = self.generate_regex_pattern(rule.conditions.description, False)
-            if re.search(description_pattern, description, re.IGNORECASE):
-                matched_conditions.append('description')
+    def compile_rule(self, rule: Rule) -> Callable[[Dict[str, Any]], Optional[RuleMatch]]:
+        """
+        Specialize a rule into a matcher over extracted transaction features
+
+        Condition patterns are compiled, and amount thresholds and date bounds
+        parsed, once per rule rather than once per transaction. Matchers are
+        cached by rule ID and invalidated when the rule's updated_at changes.
+
+        Args:
+            rule: Rule to compile; is_active is not checked by the matcher
+
+        Returns:
+            Function mapping transaction features to a RuleMatch or None
+        """
+        cached = self.compiled_rules.get(rule.id)
+        if cached and cached[0] == rule.updated_at:
+            return cached[1]
+
+        matcher = self._build_matcher(rule)
+        if len(self.compiled_rules) >= self.MAX_COMPILED_RULES:
+            self.compiled_rules.clear()
+        self.compiled_rules[rule.id] = (rule.updated_at, matcher)
+        return matcher
+
+    def invalidate_rule(self, rule_id: str) -> None:
+        """Drop a rule's compiled matcher"""
+        self.compiled_rules.pop(rule_id, None)
+
+    def _text_search(self, text: str) -> Callable[[str, str], bool]:
+        """
+        Build a check for whether a text condition matches a transaction field
+
+        The check takes the field and its lowercased form. For ASCII fields,
+        where lowercasing agrees with IGNORECASE, it first tests for the
+        condition's longest literal piece as a substring, an order of magnitude
+        cheaper than a miss in the regex engine, then searches the lowercased
+        field with a case-sensitive pattern.
+        """
+        pattern = self._compile(self.generate_regex_pattern(text, False))
+        literal = max(text.split(' '), key=len).lower()
+        if not literal or not text.isascii():
+            return lambda value, value_lower: pattern.search(value) is not None
+
+        lower_pattern = self._compile(self.generate_regex_pattern(text.lower(), False), 0)
+
+        def search(value: str, value_lower: str) -> bool:
+            if not value.isascii():
+                return pattern.search(value) is not None
+            return literal in value_lower and lower_pattern.search(value_lower) is not None
+
+        return search
+
+    def _build_matcher(self, rule: Rule) -> Callable[[Dict[str, Any]], Optional[RuleMatch]]:
+        """
+        Generate a matcher function with the rule's checks inlined
+
+        Each check is a condition name and a Python expression over the features
+        `f`. Values the expressions need are bound in the function's namespace by
+        name and never formatted into the source.
+        """
+        conditions = rule.conditions
+        checks: List[Tuple[str, str]] = []
+        namespace: Dict[str, Any] = {'_RuleMatch': RuleMatch}
 
-        # Check amount conditions
-        if rule.conditions.amount:
-            amount_conditions = rule.conditions.amount
+        # Check merchant condition
+        if conditions.merchant:
+            merchant_search = self._text_search(conditions.merchant)
 
-            if 'exact' in amount_conditions and amount_conditions['exact'] is not None:
-                exact = float(amount_conditions['exact'])
-                if abs(amount - exact) <= 0.01:  # Small tolerance for floating point
-                    matched_conditions.append('amount_exact')
+            def merchant_matches(features: Dict[str, Any]) -> bool:
+                merchant = features['merchant']
+                if merchant is None:
+                    merchant = self.extract_merchant(features['description'])
+                    return merchant_search(merchant, merchant.lower())
+                return merchant_search(merchant, features['merchant_lower'])
 
-            if 'min' in amount_conditions and amount_conditions['min'] is not None:
-                min_amount = float(amount_conditions['min'])
-                if amount >= min_amount:
-                    matched_conditions.append('amount_min')
+            namespace['_merchant_matches'] = merchant_matches
+            checks.append(('merchant', "_merchant_matches(f)"))
+
+        # Check description condition
+        if conditions.description:
+            namespace['_description_search'] = self._text_search(conditions.description)
+            checks.append(('description', "_description_search(f['description'], f['description_lower'])"))
 
-            if 'max' in amount_conditions and amount_conditions['max'] is not None:
-                max_amount = float(amount_conditions['max'])
-                if amount <= max_amount:
-                    matched_conditions.append('amount_max')
+        # Check amount conditions
+        amount_conditions = conditions.amount or {}
+        if amount_conditions.get('exact') is not None:
+            namespace['_exact_amount'] = float(amount_conditions['exact'])
+            # Small tolerance for floating point
+            checks.append(('amount_exact', "abs(f['amount'] - _exact_amount) <= 0.01"))
+        if amount_conditions.get('min') is not None:
+            namespace['_min_amount'] = float(amount_conditions['min'])
+            checks.append(('amount_min', "f['amount'] >= _min_amount"))
+        if amount_conditions.get('max') is not None:
+            namespace['_max_amount'] = float(amount_conditions['max'])
+            checks.append(('amount_max', "f['amount'] <= _max_amount"))
 
         # Check category condition
-        if rule.conditions.category:
-            category_pattern = self.generate_regex_pattern(rule.conditions.category, False)
-            if re.search(category_pattern, category, re.IGNORECASE):
-                matched_conditions.append('category')
+        if conditions.category:
+            namespace['_category_search'] = self._text_search(conditions.category)
+            checks.append(('category', "_category_search(f['category'], f['category_lower'])"))
 
         # Check date range conditions
-        if rule.conditions.date_range and date:
-            date_conditions = rule.conditions.date_range
-
-            if 'start' in date_conditions and date_conditions['start']:
-                start_date = datetime.fromisoformat(date_conditions['start'])
-                if date >= start_date:
-                    matched_conditions.append('date_start')
-
-            if 'end' in date_conditions and date_conditions['end']:
-                end_date = datetime.fromisoformat(date_conditions['end'])
-                if date <= end_date:
-                    matched_conditions.append('date_end')
-
-        # If any conditions matched, return the match result
-        if matched_conditions:
-            # Calculate confidence based on how many conditions matched
-            confidence = len(matched_conditions) / max(len([c for c in rule.conditions.__dict__.values() if c]), 1)
-
-            return RuleMatch(
-                rule_id=rule.id,
-                transaction_id=str(transaction.get('id', '')),
-                confidence=min(confidence, rule.confidence),
-                matched_conditions=matched_conditions
-            )
-
-        return None
-
-    def find_matching_transactions(self, rule: Rule, transactions: List[Dict[str, Any]]) -> List[RuleMatch]:
-        """Find all transactions that match a rule"""
-        matches = []
-
-        for transaction in transactions:
-            match = self.match_rule_against_transaction(rule, transaction)
-            if match:
-                matches.append(match)
-
-        return matches
+        date_range = conditions.date_range or {}
+        if date_range.get('start'):
+            namespace['_start_date'] = datetime.fromisoformat(date_range['start'])
+            checks.append(('date_start', "f['date'] is not None and f['date'] >= _start_date"))
+        if date_range.get('end'):
+            namespace['_end_date'] = datetime.fromisoformat(date_range['end'])
+            checks.append(('date_end', "f['date'] is not None and f['date'] <= _end_date"))
+
+        # Confidence is the fraction of the rule's conditions that matched
+        namespace['_condition_count'] = max(len([c for c in conditions.__dict__.values() if c]), 1)
+        namespace['_rule_id'] = rule.id
+        namespace['_max_confidence'] = rule.confidence
+
+        # Matched checks are collected as bits, and names only built for actual matches
+        namespace['_bit_names'] = [(1 << position, name) for position, (name, _) in enumerate(checks)]
+        source = ["def matcher(f):", "    matched = 0"]
+        for position, (_, expression) in enumerate(checks):
+            source += [f"    if {expression}:", f"        matched |= {1 << position}"]
+        source += [
+            "    if not matched:",
+            "        return None",
+            "    return _RuleMatch(",
+            "        rule_id=_rule_id,",
+            "        transaction_id=f['id'],",
+            "        confidence=min(matched.bit_count() / _condition_count, _max_confidence),",
+            "        matched_conditions=[name for bit, name in _bit_names if matched & bit]",
+            "    )",
+        ]
+
+        exec(compile("\n".join(source), f"<rule matcher {rule.id!r}>", "exec"), namespace)
+        return namespace['matcher']
 
     def preview_rule(self, rule: Rule, transactions: List[Dict[str, Any]], max_samples: int = 10) -> RulePreview:
         """Preview what transactions would match a rule"""
@@ -174,8 +411,9 @@ class RuleEngine:
 
         # Get sample matches for preview
         sample_matches = []
+        tx_by_id = {str(t.get('id', '')): t for t in transactions} if matches else {}
         for match in matches[:max_samples]:
-            transaction = next((t for t in transactions if str(t.get('id', '')) == match.transaction_id), None)
+            transaction = tx_by_id.get(match.transaction_id)
             if transaction:
                 sample_matches.append(transaction)
 
@@ -250,8 +488,7 @@ class RuleEngine:
 
     def create_rule_from_transaction(self, transaction: Dict[str, Any], label_id: str, rule_name: str = None) -> Rule:
         """Create a rule based on a labeled transaction"""
-        description = str(transaction.get('Description', transaction.get('description', '')))
-        amount = float(transaction.get('Amount', transaction.get('amount', 0)) or 0)
+        description = str(transaction.get('description') or '')
 
         merchant = self.extract_merchant(description)
 
@@ -260,10 +497,11 @@ class RuleEngine:
             rule_name = f"Auto-rule for {merchant or 'transaction'}"
 
         # Analyze patterns for the transaction
-        patterns = self._analyze_transaction_patterns(transaction)
+        patterns = self._analyze_transaction_patterns(transaction, merchant)
 
+        now = datetime.utcnow()
         return Rule(
-            id=f"rule_{uuid.uuid4().hex[:8]}",
+            id=self.generate_rule_id(),
             name=rule_name,
             conditions={
                 'merchant': merchant,
@@ -271,26 +509,27 @@ class RuleEngine:
                 'description': description,
             },
             regex={
-                'merchant': patterns.get('merchant_patterns', [None])[0],
-                'description': patterns.get('description_patterns', [None])[0],
+                'merchant': (patterns['merchant_patterns'] or [None])[0],
+                'description': (patterns['description_patterns'] or [None])[0],
             },
             label_id=label_id,
             priority=0,
             is_active=True,
             confidence=0.7,  # Default confidence
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
+            created_at=now,
+            updated_at=now,
             created_from=str(transaction.get('id', '')),
             match_count=0,
             transaction_ids=[]
         )
 
-    def _analyze_transaction_patterns(self, transaction: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze transaction to extract patterns for rule creation"""
-        description = str(transaction.get('Description', transaction.get('description', '')))
-        amount = float(transaction.get('Amount', transaction.get('amount', 0)) or 0)
+    def _analyze_transaction_patterns(self, transaction: Dict[str, Any], merchant: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze transaction to extract patterns for rule creation, reusing an already extracted merchant"""
+        description = str(transaction.get('description') or '')
+        amount = float(transaction.get('amount') or 0)
 
-        merchant = self.extract_merchant(description)
+        if merchant is None:
+            merchant = self.extract_merchant(description)
 
         patterns = {
             'merchant_patterns': [],
@@ -306,10 +545,12 @@ class RuleEngine:
         # Amount pattern
         if amount != 0:
             rounded_amount = round(amount * 100) / 100
+            # 5% tolerance around the amount's magnitude, so debits get min <= max too
+            tolerance = abs(rounded_amount) * 0.05
             patterns['amount_pattern'] = {
                 'exact': rounded_amount,
-                'min': rounded_amount * 0.95,  # 5% tolerance
-                'max': rounded_amount * 1.05,
+                'min': rounded_amount - tolerance,
+                'max': rounded_amount + tolerance,
             }
 
         return patterns
@@ -0,0 +1,24 @@
+"""
+Date parsing helpers
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_string(date_str: str) -> Optional[datetime]:
+    """Parse one ISO 8601 string, memoized since exports repeat the same dates"""
+    try:
+        # Python 3.11+ accepts a trailing 'Z', so no '+00:00' rewrite is needed
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        return None
+
+
+def parse_iso_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 date string, returning None for empty or invalid values"""
+    if not value or not isinstance(value, str):
+        return None
+    return _parse_iso_string(value)
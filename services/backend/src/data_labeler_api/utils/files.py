@@ -0,0 +1,53 @@
+"""
+File writing helpers
+"""
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+# Process umask, read once at import since reading it means briefly replacing it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Permissions open() would give a new file under the process umask
+DEFAULT_FILE_MODE = 0o666 & ~_UMASK
+
+
+def _new_file_mode(path: Path) -> int:
+    """Get the permissions a rewritten file should keep: its current ones, or the umask default"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return DEFAULT_FILE_MODE
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write bytes to a file so readers see either the old or the new contents
+
+    The data goes to a temp file in the same directory, is fsynced, and is
+    then renamed over the destination, so a crash mid-write never leaves a
+    truncated file behind. The file keeps its existing permissions, or gets
+    the umask default if new, rather than mkstemp's 0600.
+
+    Args:
+        path: Destination file path
+        data: Complete file contents
+    """
+    mode = _new_file_mode(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        os.chmod(temp_path, mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
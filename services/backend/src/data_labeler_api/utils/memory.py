@@ -0,0 +1,26 @@
+"""
+Memory management helpers
+"""
+
+import gc
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """
+    Suspend automatic garbage collection for the duration of the block
+
+    Meant for loops that allocate many acyclic objects: every collection
+    would rescan everything allocated so far while finding nothing to free.
+    Reference counting still releases objects as usual, and collection is
+    only re-enabled if it was enabled on entry.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
@@ -0,0 +1,27 @@
+"""
+Money amount parsing helpers
+"""
+
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Optional
+
+# Currency symbols and thousands separators dropped before parsing
+_STRIP_CHARS = str.maketrans("", "", "$,")
+
+
+@lru_cache(maxsize=8192)
+def parse_money(value: str) -> Optional[Decimal]:
+    """
+    Parse a money string such as "$1,234.56" or "(12.00)" to a Decimal
+
+    Memoized since statements repeat the same amounts; Decimal is immutable,
+    so cached results are safe to share. Returns None for unparseable values.
+    """
+    value = value.translate(_STRIP_CHARS).strip()
+    if value.startswith('(') and value.endswith(')'):
+        value = f"-{value[1:-1]}"
+    try:
+        return Decimal(value)
+    except (InvalidOperation, ValueError):
+        return None
@@ -0,0 +1,38 @@
+"""
+Shared test fixtures
+"""
+
+import os
+
+import pytest
+
+from data_labeler_api.api import sessions
+from data_labeler_api.core.config import get_settings
+from data_labeler_api.core.registry import FileRegistry
+from data_labeler_api.core.storage import storage_manager
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path_factory, monkeypatch):
+    """Point settings, file storage and session storage at a per-test data directory"""
+    root = tmp_path_factory.mktemp("data")
+    monkeypatch.setattr(get_settings(), "data_dir", root)
+
+    for name in ("uploads", "processed", "recommendations"):
+        directory = root / name
+        directory.mkdir()
+        monkeypatch.setattr(storage_manager, f"{name}_dir", directory)
+    monkeypatch.setattr(storage_manager, "_file_registry", FileRegistry())
+    monkeypatch.setattr(storage_manager, "_processed_cache", {})
+    monkeypatch.setattr(storage_manager, "_known_session_dirs", set())
+
+    sessions_dir = root / "sessions"
+    sessions_dir.mkdir()
+    monkeypatch.setattr(sessions, "SESSIONS_DIR", sessions_dir)
+    monkeypatch.setattr(sessions, "_SESSIONS_PATH_PREFIX", f"{sessions_dir}{os.sep}")
+    monkeypatch.setattr(sessions, "ACTIVE_SESSION_FILE", sessions_dir / "active_session.txt")
+    monkeypatch.setattr(sessions, "SESSIONS_INDEX_FILE", sessions_dir / "_index.json")
+    monkeypatch.setattr(sessions, "SESSIONS_INDEX_LOCK_FILE", sessions_dir / "_index.lock")
+    monkeypatch.setattr(sessions, "_index_cache", None)
+    monkeypatch.setattr(sessions, "_active_session_cache", None)
+    return root
@@ -0,0 +1,90 @@
+"""
+Test suite for domain configuration management
+"""
+
+from fastapi.testclient import TestClient
+from data_labeler_api.main import app
+from data_labeler_api.models.configuration import (
+    CleaningPattern,
+    ConfigurationManager,
+    DomainConfiguration,
+    config_manager
+)
+
+client = TestClient(app)
+
+
+def test_activate_config_deactivates_others():
+    """Test that activating a domain leaves it as the only active config"""
+    manager = ConfigurationManager()
+    manager.add_config(DomainConfiguration(domain_name="financial"))
+    manager.add_config(DomainConfiguration(domain_name="medical"))
+
+    activated = manager.activate_config("medical")
+
+    assert activated is not None
+    assert manager.get_active_config().domain_name == "medical"
+    assert [c.domain_name for c in manager.list_configs() if c.is_active] == ["medical"]
+
+
+def test_active_config_falls_back_when_deactivated():
+    """Test that a deactivated pointer falls back to any remaining active config"""
+    manager = ConfigurationManager()
+    manager.add_config(DomainConfiguration(domain_name="financial"))
+    manager.add_config(DomainConfiguration(domain_name="medical"))
+    manager.activate_config("medical")
+
+    manager.deactivate_config("medical")
+    manager.add_config(manager.get_config("financial").model_copy(update={"is_active": True}))
+
+    assert manager.get_active_config().domain_name == "financial"
+    assert manager.activate_config("missing") is None
+
+
+def test_update_domain_config_replaces_fields():
+    """Test that updating a domain keeps its name and stores the new fields"""
+    client.post("/api/v1/configuration/domains", json={"domain_name": "update_test"})
+
+    response = client.put(
+        "/api/v1/configuration/domains/update_test",
+        json={
+            "domain_name": "ignored",
+            "description": "Updated",
+            "cleaning_patterns": [{"pattern": r"\s*#\d+", "replacement": ""}]
+        }
+    )
+
+    assert response.status_code == 200
+    stored = config_manager.get_config("update_test")
+    assert stored.domain_name == "update_test"
+    assert stored.description == "Updated"
+    assert stored.cleaning_patterns[0].pattern == r"\s*#\d+"
+    assert config_manager.get_config("ignored") is None
+
+
+def test_get_active_domain_config_endpoint():
+    """Test that /domains/active returns the activated domain"""
+    client.post("/api/v1/configuration/domains", json={"domain_name": "active_test"})
+    client.post("/api/v1/configuration/domains/active_test/activate")
+
+    response = client.get("/api/v1/configuration/domains/active")
+
+    assert response.status_code == 200
+    assert response.json()["domain_name"] == "active_test"
+
+
+def test_cleaning_pattern_mutations_publish_new_configs():
+    """Test that pattern edits replace the stored config instead of mutating it"""
+    manager = ConfigurationManager()
+    original = manager.add_config(DomainConfiguration(domain_name="financial"))
+
+    updated = manager.add_cleaning_pattern("financial", CleaningPattern(pattern=r"#\d+"))
+
+    assert original.cleaning_patterns == []
+    assert manager.get_config("financial") is updated
+    assert [p.pattern for p in updated.cleaning_patterns] == [r"#\d+"]
+
+    removed = manager.remove_cleaning_pattern("financial", 0)
+    assert removed.pattern == r"#\d+"
+    assert manager.get_config("financial").cleaning_patterns == []
+    assert manager.remove_cleaning_pattern("financial", 0) is None
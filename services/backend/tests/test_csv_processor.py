@@ -0,0 +1,99 @@
+"""
+Test suite for the CSV processing service
+"""
+
+import codecs
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from data_labeler_api.models.transaction import FileProcessingOptions
+from data_labeler_api.services.csv_processor import CSVProcessor
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (codecs.BOM_UTF8 + b"Date,Amount\n", "utf-8-sig"),
+    ("Date,Amount\n".encode("utf-16"), "utf-16"),
+    ("Date,Café\n".encode("utf-8"), "utf-8"),
+    ("é".encode("utf-8") * 5000 + b"\xc3", "utf-8"),
+])
+def test_detect_encoding_fast_paths(tmp_path, raw, expected):
+    """Test that BOM-marked and UTF-8 files are recognised without chardet"""
+    path = tmp_path / "encoded.csv"
+    path.write_bytes(raw)
+
+    assert CSVProcessor().detect_encoding(str(path)) == expected
+
+
+def test_streamed_processing_matches_whole_file(tmp_path):
+    """Test that processing in chunks gives the same report and transactions"""
+    rows = ["Date,Description,Amount"]
+    rows += [f"{'bad' if i % 9 == 0 else '2024-01-15'},Shop {i % 4},{i}.50" for i in range(40)]
+    path = tmp_path / "large.csv"
+    path.write_text("\n".join(rows) + "\n")
+
+    processor = CSVProcessor()
+    whole = processor.process_csv_file(str(path), "f1")
+
+    processor.STREAMING_THRESHOLD_BYTES = 0
+    streamed = processor.process_csv_file(str(path), "f1", FileProcessingOptions(chunk_size=7))
+
+    assert streamed[0].total_rows == whole[0].total_rows == 40
+    assert streamed[2].model_dump() == whole[2].model_dump()
+    assert [t.model_dump() for t in streamed[1]] == [t.model_dump() for t in whole[1]]
+    assert [e.row for e in streamed[2].errors] == [2, 11, 20, 29, 38]
+
+
+def test_amounts_parse_to_decimals_with_missing_values_as_none(tmp_path):
+    """Test amount and balance parsing, including parentheses and empty cells"""
+    path = tmp_path / "amounts.csv"
+    path.write_text("Description,Amount,Balance\nA,(12.50),100.25\nB,3.10,\nC,abc,7\nD,(12.50),100.25\n")
+
+    _, transactions, _ = CSVProcessor().process_csv_file(str(path), "f1")
+
+    assert [(t.amount, t.balance) for t in transactions] == [
+        (Decimal("-12.50"), Decimal("100.25")),
+        (Decimal("3.10"), None),
+        (None, Decimal("7.0")),
+        (Decimal("-12.50"), Decimal("100.25")),
+    ]
+
+
+def test_detect_column_types():
+    """Test column type detection for typed and string columns"""
+    df = pd.DataFrame({
+        "posted": ["2024-01-01", "01/02/2024"],
+        "stamp": pd.to_datetime(["2024-01-01", "2024-01-02"]),
+        "amount": [1.5, 2.0],
+        "count": [1, 2],
+        "memo": ["coffee", "rent"],
+        "empty": [None, None],
+    })
+
+    assert CSVProcessor().detect_column_types(df) == {
+        "posted": "date",
+        "stamp": "date",
+        "amount": "numeric",
+        "count": "numeric",
+        "memo": "text",
+        "empty": "unknown",
+    }
+
+
+def test_validation_analyzes_duplicates_for_mapped_columns_only():
+    """Test that unmapped columns only get null and dtype analysis"""
+    df = pd.DataFrame({
+        "Description": ["A", "A", "B"],
+        "Amount": [1.0, 2.0, 3.0],
+        "Notes": [None, None, "x"],
+    })
+    processor = CSVProcessor()
+
+    report = processor.validate_csv_structure(df, processor.identify_financial_columns(df))
+
+    assert report.column_info["Description"]["duplicate_count"] == 1
+    notes = report.column_info["Notes"]
+    assert set(notes) == {"total_values", "null_count", "null_percentage", "data_type"}
+    assert notes["null_count"] == 2
+    assert "Column 'Notes' has 66.7% missing values" in report.warnings
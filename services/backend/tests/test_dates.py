@@ -0,0 +1,16 @@
+"""
+Test suite for date parsing helpers
+"""
+
+from datetime import datetime, timezone
+
+from data_labeler_api.utils.dates import parse_iso_datetime
+
+
+def test_parse_iso_datetime():
+    """Test parsing naive, UTC 'Z' and invalid values"""
+    assert parse_iso_datetime("2024-01-05T00:00:00") == datetime(2024, 1, 5)
+    assert parse_iso_datetime("2024-01-05T00:00:00Z") == datetime(2024, 1, 5, tzinfo=timezone.utc)
+    assert parse_iso_datetime("not a date") is None
+    assert parse_iso_datetime("") is None
+    assert parse_iso_datetime(None) is None
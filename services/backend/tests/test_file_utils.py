@@ -0,0 +1,45 @@
+"""
+Test suite for file writing helpers
+"""
+
+import os
+import stat
+
+import pytest
+
+from data_labeler_api.utils.files import atomic_write_bytes
+
+
+def test_atomic_write_replaces_contents(tmp_path):
+    """Test that a write replaces the file and leaves no temp files behind"""
+    path = tmp_path / "data.json"
+    atomic_write_bytes(path, b"old")
+    atomic_write_bytes(path, b"new")
+
+    assert path.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_failed_atomic_write_keeps_existing_file(tmp_path):
+    """Test that a failed write leaves the previous contents intact"""
+    path = tmp_path / "data.json"
+    atomic_write_bytes(path, b"old")
+
+    with pytest.raises(TypeError):
+        atomic_write_bytes(path, "not bytes")
+
+    assert path.read_bytes() == b"old"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_atomic_write_keeps_file_permissions(tmp_path):
+    """Test that new files get the umask default and rewrites keep the existing mode"""
+    umask = os.umask(0o022)
+    os.umask(umask)
+    path = tmp_path / "data.json"
+    atomic_write_bytes(path, b"new")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~umask
+
+    path.chmod(0o640)
+    atomic_write_bytes(path, b"rewritten")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
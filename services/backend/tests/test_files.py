@@ -0,0 +1,183 @@
+"""
+Test suite for file upload endpoints
+"""
+
+from fastapi.testclient import TestClient
+from data_labeler_api.main import app
+from data_labeler_api.api import files as files_api
+from data_labeler_api.core.config import get_settings
+from data_labeler_api.core.storage import storage_manager
+
+client = TestClient(app)
+
+SAMPLE_CSV = b"Date,Description,Amount\n2024-01-01,STARBUCKS #123,-4.50\n2024-01-02,PAYROLL,1500.00\n"
+
+
+def test_upload_csv():
+    """Test uploading a small CSV file"""
+    response = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("transactions.csv", SAMPLE_CSV, "text/csv")}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["filename"] == "transactions.csv"
+    assert data["file_size"] == len(SAMPLE_CSV)
+    assert data["status"] == "uploaded"
+
+
+def test_upload_rejects_non_csv():
+    """Test that non-CSV uploads are rejected"""
+    response = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("notes.txt", b"hello", "text/plain")}
+    )
+
+    assert response.status_code == 400
+
+
+def test_upload_rejects_oversized_file(monkeypatch):
+    """Test that uploads over the size limit return 413"""
+    monkeypatch.setattr(get_settings(), "max_upload_size_mb", 0)
+
+    response = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("transactions.csv", SAMPLE_CSV, "text/csv")}
+    )
+
+    assert response.status_code == 413
+
+
+def test_upload_strips_directory_from_filename():
+    """Test that a filename with path components stays inside the uploads directory"""
+    response = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("../../escape.csv", SAMPLE_CSV, "text/csv")}
+    )
+
+    assert response.status_code == 200
+    stored_path = storage_manager.get_file_path(response.json()["file_id"])
+
+    assert stored_path.resolve().is_relative_to(storage_manager.uploads_dir.resolve())
+    assert stored_path.name.endswith("_escape.csv")
+
+
+def test_uploaded_file_is_processed():
+    """Test that the background task processes and persists the upload"""
+    response = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("transactions.csv", SAMPLE_CSV, "text/csv")}
+    )
+    file_id = response.json()["file_id"]
+
+    status = client.get(f"/api/v1/files/{file_id}/status").json()
+    assert status["status"] == "completed"
+
+    processed_data = storage_manager.get_processed_data(file_id)
+    assert len(processed_data["transactions"]) == 2
+    assert float(processed_data["transactions"][0]["amount"]) == -4.5
+
+
+def test_list_files_paginates_newest_first():
+    """Test that file listing pages through a session newest first"""
+    session_id = "session_pagination_test"
+    uploaded = []
+    for i in range(3):
+        response = client.post(
+            "/api/v1/files/upload",
+            files={"file": (f"page_{i}.csv", SAMPLE_CSV, "text/csv")},
+            data={"session_id": session_id}
+        )
+        uploaded.append(response.json()["file_id"])
+
+    first_page = client.get(f"/api/v1/files?session_id={session_id}&per_page=2").json()
+    second_page = client.get(f"/api/v1/files?session_id={session_id}&per_page=2&page=2").json()
+
+    assert first_page["total"] == 3
+    assert first_page["has_more"] is True
+    assert [f["file_id"] for f in first_page["files"]] == uploaded[:0:-1]
+    assert [f["file_id"] for f in second_page["files"]] == uploaded[:1]
+    assert second_page["has_more"] is False
+
+    info = client.get(f"/api/v1/files/{uploaded[0]}").json()
+    assert second_page["files"][0]["uploaded_at"] == info["uploaded_at"]
+
+
+def test_file_status_supports_etag():
+    """Test that an unchanged status returns 304 for a matching If-None-Match"""
+    response = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("transactions.csv", SAMPLE_CSV, "text/csv")}
+    )
+    file_id = response.json()["file_id"]
+
+    status = client.get(f"/api/v1/files/{file_id}/status")
+    assert status.status_code == 200
+    assert status.headers["cache-control"] == "private, max-age=0"
+
+    cached = client.get(
+        f"/api/v1/files/{file_id}/status",
+        headers={"If-None-Match": status.headers["etag"]}
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_file_transactions_rows_and_columnar():
+    """Test that the columnar transactions format mirrors the row format"""
+    response = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("columnar.csv", SAMPLE_CSV, "text/csv")}
+    )
+    file_id = response.json()["file_id"]
+
+    rows = client.get(f"/api/v1/files/{file_id}/transactions").json()
+    columnar = client.get(f"/api/v1/files/{file_id}/transactions?format=columnar").json()
+
+    assert rows["total"] == columnar["total"] == 2
+    assert columnar["row_count"] == 2
+    columns = columnar["columns"]
+    rebuilt = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    assert rebuilt == rows["transactions"]
+
+    second_page = client.get(f"/api/v1/files/{file_id}/transactions?per_page=1&page=2").json()
+    assert [t["id"] for t in second_page["transactions"]] == [rows["transactions"][1]["id"]]
+
+
+def test_validation_report_flags_invalid_dates():
+    """Test that only unparseable dates are reported, with their row numbers"""
+    csv = b"Date,Description,Amount\n2024-01-01,A,1\nnot a date,B,2\n01/03/2024,C,3\n,D,4\n"
+    response = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("dates.csv", csv, "text/csv")}
+    )
+    file_id = response.json()["file_id"]
+
+    report = client.get(f"/api/v1/files/{file_id}/validation").json()
+    date_errors = [e for e in report["errors"] if e["error_type"] == "invalid_date"]
+    assert [(e["row"], e["value"]) for e in date_errors] == [(3, "not a date")]
+
+
+def test_processed_transactions_parse_mapped_columns():
+    """Test that dates, amounts and text are converted from the mapped columns"""
+    csv = b"Date,Description,Amount\n2024-01-01, STARBUCKS #123 ,(4.50)\nnot a date,PAYROLL,abc\n"
+    response = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("parsed.csv", csv, "text/csv")}
+    )
+    file_id = response.json()["file_id"]
+
+    transactions = client.get(f"/api/v1/files/{file_id}/transactions").json()["transactions"]
+    assert [(t["date"], t["description"], t["amount"]) for t in transactions] == [
+        ("2024-01-01T00:00:00", "STARBUCKS #123", "-4.50"),
+        (None, "PAYROLL", None),
+    ]
+    assert transactions[0]["row_number"] == 2
+    assert transactions[0]["merchant_name"] == "STARBUCKS"
+
+
+def test_process_pool_does_not_fork_the_server():
+    """Test that CSV workers start from a fresh process rather than a fork"""
+    assert files_api.get_process_pool()._mp_context.get_start_method() in ("forkserver", "spawn")
@@ -0,0 +1,23 @@
+"""
+Test suite for memory management helpers
+"""
+
+import gc
+
+from data_labeler_api.utils.memory import paused_gc
+
+
+def test_paused_gc_restores_previous_state():
+    """Test that collection is paused inside the block and restored after"""
+    assert gc.isenabled()
+    with paused_gc():
+        assert not gc.isenabled()
+    assert gc.isenabled()
+
+    gc.disable()
+    try:
+        with paused_gc():
+            pass
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
@@ -0,0 +1,111 @@
+"""
+Test suite for merchant pattern extraction
+"""
+
+import pytest
+from data_labeler_api.models.merchant_patterns import MerchantPatternCreate, MerchantPatternUpdate
+from data_labeler_api.services.merchant_patterns import MerchantPatternManager
+
+
+def test_extract_merchant_uses_updated_pattern():
+    """Test that extraction follows pattern updates and deletions"""
+    manager = MerchantPatternManager()
+    pattern = manager.create_pattern(MerchantPatternCreate(name="Coffee", pattern=r"starbucks"))
+
+    assert manager.extract_merchant_from_description("STARBUCKS #1234") == "Coffee"
+
+    manager.update_pattern(pattern.id, MerchantPatternUpdate(pattern=r"peets"))
+    assert manager.extract_merchant_from_description("STARBUCKS #1234") == "UNKNOWN"
+    assert manager.extract_merchant_from_description("PEETS COFFEE") == "Coffee"
+
+    manager.delete_pattern(pattern.id)
+    assert manager.extract_merchant_from_description("PEETS COFFEE") == "UNKNOWN"
+
+
+def test_create_pattern_rejects_invalid_regex():
+    """Test that invalid regex patterns are rejected"""
+    manager = MerchantPatternManager()
+
+    with pytest.raises(ValueError):
+        manager.create_pattern(MerchantPatternCreate(name="Broken", pattern=r"(unclosed"))
+
+
+def test_update_pattern_rejects_invalid_regex_without_changes():
+    """Test that a failed regex update keeps the pattern and its compiled regex"""
+    manager = MerchantPatternManager()
+    pattern = manager.create_pattern(MerchantPatternCreate(name="Shop", pattern=r"shop"))
+
+    with pytest.raises(ValueError):
+        manager.update_pattern(pattern.id, MerchantPatternUpdate(name="Broken", pattern=r"(bad"))
+
+    assert pattern.pattern == "shop" and pattern.name == "Shop"
+    assert manager.extract_merchant_from_description("shop two") == "Shop"
+
+
+def test_extract_merchants_matches_per_description_results():
+    """Test batch extraction returns per-description results and usage counts"""
+    manager = MerchantPatternManager()
+    pattern = manager.create_pattern(MerchantPatternCreate(name="Coffee", pattern=r"starbucks"))
+    descriptions = ["STARBUCKS #1", "RENT", "STARBUCKS #1", "", "starbucks #2"]
+
+    assert manager.extract_merchants(descriptions) == ["Coffee", "UNKNOWN", "Coffee", "UNKNOWN", "Coffee"]
+    assert manager.get_pattern(pattern.id).usage_count == 3
+
+
+def test_cached_lookups_follow_new_patterns_and_count_usage():
+    """Test that cached descriptions are re-matched after a pattern is added"""
+    manager = MerchantPatternManager()
+    assert manager.extract_merchant_from_description("PEETS COFFEE") == "UNKNOWN"
+
+    pattern = manager.create_pattern(MerchantPatternCreate(name="Peets", pattern=r"peets"))
+    assert manager.extract_merchant_from_description("PEETS COFFEE") == "Peets"
+    assert manager.extract_merchant_from_description("peets coffee") == "Peets"
+    assert manager.get_pattern(pattern.id).usage_count == 2
+
+
+def test_cached_ties_follow_live_usage_counts():
+    """Test that a cached description re-ranks tied patterns as usage changes"""
+    manager = MerchantPatternManager()
+    manager.create_pattern(MerchantPatternCreate(name="A", pattern=r"shop", confidence=0.8))
+    manager.create_pattern(MerchantPatternCreate(name="B", pattern=r"shop|zzz", confidence=0.8))
+    assert manager.extract_merchant_from_description("shop one") == "A"
+
+    for _ in range(5):
+        assert manager.extract_merchant_from_description("zzz") == "B"
+    assert manager.extract_merchant_from_description("shop one") == "B"
+
+
+def test_prefilter_preserves_matches_for_uncombinable_patterns():
+    """Test that backreferences and repeated group names fall back to per-pattern matching"""
+    manager = MerchantPatternManager()
+    manager.create_pattern(MerchantPatternCreate(name="Coffee", pattern=r"(?P<shop>starbucks)"))
+    assert manager._get_prefilter() is not None
+    assert manager.extract_merchants(["RENT", "STARBUCKS #1"]) == ["UNKNOWN", "Coffee"]
+
+    manager.create_pattern(MerchantPatternCreate(name="Tea", pattern=r"(?P<shop>teavana)"))
+    manager.create_pattern(MerchantPatternCreate(name="Echo", pattern=r"(\d\d)-\1"))
+    assert manager._get_prefilter() is None
+    assert manager.extract_merchants(["TEAVANA", "REF 12-12", "REF 12-34"]) == ["Tea", "Echo", "UNKNOWN"]
+
+
+def test_best_pattern_prefers_confidence_then_usage():
+    """Test that the most confident match wins, with ties going to the most used pattern"""
+    manager = MerchantPatternManager()
+    manager.create_pattern(MerchantPatternCreate(name="Generic", pattern=r"coffee", confidence=0.6))
+    manager.create_pattern(MerchantPatternCreate(name="Exact", pattern=r"peets coffee", confidence=0.7))
+    manager.create_pattern(MerchantPatternCreate(name="Brand", pattern=r"peets", confidence=0.8))
+    busy = manager.create_pattern(MerchantPatternCreate(name="Busy", pattern=r"pee", confidence=0.8))
+    busy.usage_count = 5
+
+    # "Brand" and "Busy" tie on confidence and "Busy" has the most usage
+    assert manager._find_best_pattern("peets coffee") is busy
+    assert manager._find_best_pattern("cold coffee").name == "Generic"
+
+
+def test_generate_pattern_uses_most_common_words():
+    """Test that generated patterns keep the most frequent shared words"""
+    manager = MerchantPatternManager()
+    descriptions = ["Blue Bottle coffee 12", "blue bottle coffee", "BLUE BOTTLE cafe", "bottle shop"]
+
+    assert manager._generate_pattern_from_descriptions(descriptions) == r"\b(?:bottle|blue|coffee)\b"
+    assert manager._generate_pattern_from_descriptions(["one coffee", "two teas"]) is None
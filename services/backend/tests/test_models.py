@@ -0,0 +1,39 @@
+"""
+Test suite for shared model helpers
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from pydantic import BaseModel, PrivateAttr
+
+from data_labeler_api.models.base import fast_constructor
+from data_labeler_api.models.transaction import Transaction
+
+
+def test_fast_constructor_matches_validated_model():
+    """Test that generated constructors mirror validated construction"""
+    build = fast_constructor(Transaction)
+    fields = dict(
+        id="f_row_2", row_number=2, file_id="f",
+        date=datetime(2024, 1, 1), description="COFFEE", amount=Decimal("-4.50")
+    )
+
+    fast = build(**fields)
+    validated = Transaction(**fields)
+
+    assert fast == validated
+    assert fast.model_dump_json() == validated.model_dump_json()
+    assert fast.model_fields_set == validated.model_fields_set
+    assert fast.validation_errors is not build(**fields).validation_errors
+
+
+def test_fast_constructor_rejects_private_attributes():
+    """Test that models needing private storage are refused"""
+    class WithPrivate(BaseModel):
+        name: str
+        _cache: dict = PrivateAttr(default_factory=dict)
+
+    with pytest.raises(TypeError):
+        fast_constructor(WithPrivate)
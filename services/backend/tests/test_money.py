@@ -0,0 +1,25 @@
+"""
+Test suite for money parsing helpers
+"""
+
+from decimal import Decimal
+
+from data_labeler_api.models.transaction import TransactionBase
+from data_labeler_api.utils.money import parse_money
+
+
+def test_parse_money():
+    """Test currency symbols, separators, parentheses and invalid values"""
+    assert parse_money("$1,234.56") == Decimal("1234.56")
+    assert parse_money(" (12.00) ") == Decimal("-12.00")
+    assert parse_money("-3") == Decimal("-3")
+    assert parse_money("n/a") is None
+    assert parse_money("") is None
+
+
+def test_transaction_amount_uses_money_parser():
+    """Test that string amounts and balances are parsed on the model"""
+    transaction = TransactionBase(amount="$1,000.50", balance="(20)")
+    assert transaction.amount == Decimal("1000.50")
+    assert transaction.balance == Decimal("-20")
+    assert TransactionBase(amount="bad").amount is None
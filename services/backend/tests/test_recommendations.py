@@ -0,0 +1,190 @@
+"""
+Test suite for recommendation pattern analysis
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from data_labeler_api.main import app
+from data_labeler_api.api.recommendations import (
+    analyze_amount_patterns,
+    analyze_description_patterns,
+    analyze_transaction_patterns,
+    calculate_transaction_statistics
+)
+from data_labeler_api.models.merchant_patterns import MerchantPatternCreate
+from data_labeler_api.core.storage import storage_manager
+from data_labeler_api.services.merchant_patterns import pattern_manager
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def coffee_pattern():
+    """Register a merchant pattern for the duration of a test"""
+    pattern = pattern_manager.create_pattern(MerchantPatternCreate(name="Starbucks", pattern=r"starbucks"))
+    yield pattern
+    pattern_manager.delete_pattern(pattern.id)
+
+
+def make_transactions():
+    """Build a small mixed set of labeled and unlabeled transactions"""
+    return [
+        {"id": "t1", "description": "STARBUCKS #1", "amount": -4.5, "date": "2024-01-01T00:00:00", "label": "coffee"},
+        {"id": "t2", "description": "STARBUCKS #2", "amount": -5.25, "date": "2024-01-03T00:00:00", "label": "coffee"},
+        {"id": "t3", "description": "STARBUCKS #3", "amount": -4.5, "date": "2024-01-05T00:00:00"},
+        {"id": "t4", "description": "PAYROLL DEPOSIT", "amount": 1500.0, "date": "2024-01-02T00:00:00", "label": "income"},
+        {"id": "t5", "description": "RENT PAYMENT", "amount": 1200.0, "date": "2024-01-04T00:00:00"},
+    ]
+
+
+def test_analyze_transaction_patterns_suggests_merchant_label(coffee_pattern):
+    """Test that unlabeled transactions inherit the merchant's dominant label"""
+    transactions = make_transactions()
+
+    recommendations = analyze_transaction_patterns(transactions, 0.3)
+
+    assert [r.transaction_id for r in recommendations] == ["t3"]
+    recommendation = recommendations[0]
+    assert recommendation.suggested_label_id == "coffee"
+    assert recommendation.pattern_matches == ["Starbucks"]
+    assert recommendation.similar_transactions == ["t1", "t2"]
+    assert recommendation.confidence == pytest.approx(1.0 * 0.6 + 0.3 * 0.4)
+
+
+def test_analyze_transaction_patterns_respects_min_confidence(coffee_pattern):
+    """Test that suggestions below the confidence threshold are dropped"""
+    transactions = make_transactions()
+
+    assert analyze_transaction_patterns(transactions, 0.95) == []
+
+
+def test_analyze_transaction_patterns_needs_two_labeled(coffee_pattern):
+    """Test that no suggestions are made from fewer than 2 labeled transactions"""
+    transactions = make_transactions()
+    transactions[0]["label"] = None
+    transactions[3]["label"] = None
+
+    assert analyze_transaction_patterns(transactions, 0.0) == []
+
+
+def test_analyze_transaction_patterns_limit_orders_by_confidence(coffee_pattern):
+    """Test that a limit returns only the top suggestions across merchants"""
+    rent_pattern = pattern_manager.create_pattern(MerchantPatternCreate(name="Rent", pattern=r"rent"))
+    transactions = make_transactions() + [
+        {"id": "t6", "description": "RENT PAYMENT", "amount": 1200.0, "label": "rent"},
+        {"id": "t7", "description": "RENT PAYMENT", "amount": 1200.0, "label": "rent"},
+        {"id": "t8", "description": "RENT PAYMENT", "amount": 1200.0, "label": "rent"},
+        {"id": "t9", "description": "RENT PAYMENT", "amount": 1200.0},
+    ]
+
+    try:
+        unlimited = analyze_transaction_patterns(transactions, 0.3)
+        top_two = analyze_transaction_patterns(transactions, 0.3, limit=2)
+        top_one = analyze_transaction_patterns(transactions, 0.3, limit=1)
+    finally:
+        pattern_manager.delete_pattern(rent_pattern.id)
+
+    # Without a limit suggestions follow merchant order; with one, confidence order
+    assert [r.transaction_id for r in unlimited] == ["t3", "t5", "t9"]
+    assert [r.transaction_id for r in top_two] == ["t5", "t9"]
+    assert [r.transaction_id for r in top_one] == ["t5"]
+    assert analyze_transaction_patterns(transactions, 0.3, limit=0) == []
+
+
+def test_smart_suggestions_returns_top_results_in_order(coffee_pattern):
+    """Test that the endpoint keeps the top suggestions, ties in original order"""
+    file_id = "smart-suggestions-test"
+    transactions = make_transactions() + [
+        {"id": "t6", "description": "STARBUCKS #6", "amount": -3.0},
+        {"id": "t7", "description": "STARBUCKS #7", "amount": -3.0},
+    ]
+    storage_manager.save_processed_data(file_id, {"transactions": transactions})
+
+    response = client.get(
+        "/api/v1/recommendations/smart-suggestions",
+        params={"file_id": file_id, "limit": 2}
+    )
+
+    assert response.status_code == 200
+    assert [r["transaction_id"] for r in response.json()] == ["t3", "t6"]
+
+    negative = client.get(
+        "/api/v1/recommendations/smart-suggestions",
+        params={"file_id": file_id, "limit": -5}
+    )
+    assert negative.status_code == 422
+
+
+def test_analyze_amount_patterns():
+    """Test amount range buckets, recurring amounts and statistics"""
+    result = analyze_amount_patterns(make_transactions())
+
+    assert result["recurring_amounts"] == [-4.5]
+    assert result["amount_ranges"] == {
+        "under_10": 0,
+        "10_to_50": 0,
+        "50_to_100": 0,
+        "100_to_500": 0,
+        "500_to_1000": 0,
+        "over_1000": 2
+    }
+    assert result["statistics"]["min_amount"] == -5.25
+    assert result["statistics"]["max_amount"] == 1500.0
+    assert result["statistics"]["median_amount"] == -4.5
+
+
+def test_analyze_amount_patterns_range_edges():
+    """Test that bucket edges are lower-inclusive and zero is not counted"""
+    amounts = [0, 9.99, 10, 50, 100, 500, 1000, "n/a"]
+    result = analyze_amount_patterns([{"amount": a} for a in amounts])
+
+    assert result["amount_ranges"] == {
+        "under_10": 1,
+        "10_to_50": 1,
+        "50_to_100": 1,
+        "100_to_500": 1,
+        "500_to_1000": 1,
+        "over_1000": 1
+    }
+    assert result["recurring_amounts"] == []
+    assert result["statistics"]["median_amount"] == 50.0
+
+
+def test_analyze_description_patterns_counts_words():
+    """Test that common description words are counted without stop words"""
+    result = analyze_description_patterns(make_transactions())
+
+    assert result["common_words"][0] == {"word": "starbucks", "count": 3}
+    assert result["total_descriptions"] == 5
+
+
+def test_analyze_description_patterns_strips_punctuation():
+    """Test that punctuation is removed inside words and short words are skipped"""
+    transactions = [
+        {"description": "McDonald's #12 of NYC"},
+        {"description": "MCDONALDS - the_best"},
+    ]
+    result = analyze_description_patterns(transactions)
+
+    counts = {entry["word"]: entry["count"] for entry in result["common_words"]}
+    assert counts == {"mcdonalds": 2, "nyc": 1, "thebest": 1}
+
+
+def test_calculate_transaction_statistics():
+    """Test amount and date statistics"""
+    stats = calculate_transaction_statistics(make_transactions())
+
+    assert stats["amounts"]["count"] == 5
+    assert stats["amounts"]["total_volume"] == pytest.approx(2685.75)
+    assert stats["amounts"]["median"] == -4.5
+    assert stats["amounts"]["max"] == 1500.0
+    assert stats["dates"]["earliest"] == "2024-01-01T00:00:00"
+    assert stats["dates"]["date_range_days"] == 4
+
+
+def test_analyze_transaction_patterns_skips_extraction_without_labels(coffee_pattern):
+    """Test that too few labels returns early without touching merchant patterns"""
+    transactions = [{"id": "t1", "description": "STARBUCKS #1"}, {"id": "t2", "description": "STARBUCKS #2"}]
+
+    assert analyze_transaction_patterns(transactions, 0.0) == []
+    assert pattern_manager.get_pattern(coffee_pattern.id).usage_count == 0
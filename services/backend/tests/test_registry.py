@@ -0,0 +1,151 @@
+"""
+Test suite for the file registry
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from data_labeler_api.core.registry import FileRegistry, create_file_registry
+
+
+def _file_info(file_id, session_id, uploaded_at):
+    return {
+        "file_id": file_id,
+        "session_id": session_id,
+        "uploaded_at": uploaded_at.isoformat(),
+        "file_size": 1,
+    }
+
+
+def test_page_is_newest_first_per_session():
+    """Test that pages are newest first and totals respect the session filter"""
+    registry = FileRegistry()
+    start = datetime(2024, 1, 1)
+    for i in range(5):
+        registry.add(_file_info(f"f{i}", "a" if i % 2 else "b", start + timedelta(hours=i)))
+
+    files, total = registry.page(None, 1, 2)
+    assert [f["file_id"] for f in files] == ["f3", "f2"]
+    assert total == 5
+
+    files, total = registry.page("a", 0, 10)
+    assert [f["file_id"] for f in files] == ["f3", "f1"]
+    assert total == 2
+
+
+def test_update_append_and_delete():
+    """Test entry mutation helpers and cutoff lookups"""
+    registry = create_file_registry(None)
+    registry.add(_file_info("old", "s", datetime(2024, 1, 1)))
+    registry.add(_file_info("new", "s", datetime(2024, 1, 3)))
+
+    registry.update("old", {"status": "completed"})
+    registry.append("old", "recommendations", {"id": "r1"})
+    registry.update("missing", {"status": "completed"})
+    assert registry.get("old")["status"] == "completed"
+    assert registry.get("old")["recommendations"] == [{"id": "r1"}]
+    assert "missing" not in registry
+
+    cutoff = datetime(2024, 1, 2, tzinfo=timezone.utc).timestamp()
+    assert registry.uploaded_before(cutoff) == ["old"]
+    assert registry.delete("old")
+    assert not registry.delete("old")
+    assert len(registry) == 1
+
+
+def test_sqlite_registry_is_shared_between_connections(tmp_path):
+    """Test that SQLite registries on the same file see each other's changes"""
+    path = tmp_path / "registry.db"
+    writer = create_file_registry(sqlite_path=path)
+    reader = create_file_registry(sqlite_path=path)
+    start = datetime(2024, 1, 1)
+    for i in range(3):
+        writer.add(_file_info(f"f{i}", "s", start + timedelta(hours=i)))
+
+    files, total = reader.page("s", 0, 2)
+    assert [f["file_id"] for f in files] == ["f2", "f1"]
+    assert total == 3
+
+    writer.append("f0", "recommendations", {"id": "r1"})
+    assert reader.get("f0")["recommendations"] == [{"id": "r1"}]
+
+    cutoff = datetime(2024, 1, 1, 1, tzinfo=timezone.utc).timestamp()
+    assert reader.uploaded_before(cutoff) == ["f0"]
+    assert reader.delete("f0") and "f0" not in writer
+    assert len(writer) == 2
+
+
+@pytest.fixture
+def redis_registry(monkeypatch):
+    """Redis registry backed by an in-memory fake server"""
+    fakeredis = pytest.importorskip("fakeredis")
+    import redis
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.Redis, "from_url", lambda url: fakeredis.FakeRedis(server=server)
+    )
+    return create_file_registry(redis_url="redis://fake")
+
+
+def test_redis_registry_round_trip(redis_registry):
+    """Test the Redis registry's entry, index and cutoff operations"""
+    registry = redis_registry
+    start = datetime(2024, 1, 1)
+    for i in range(5):
+        registry.add(_file_info(f"f{i}", "a" if i % 2 else "b", start + timedelta(hours=i)))
+
+    files, total = registry.page(None, 1, 2)
+    assert [f["file_id"] for f in files] == ["f3", "f2"]
+    assert total == 5
+    files, total = registry.page("a", 0, 10)
+    assert [f["file_id"] for f in files] == ["f3", "f1"]
+    assert total == 2
+
+    registry.update("f0", {"status": "completed"})
+    registry.append("f0", "recommendations", {"id": "r1"})
+    registry.update("missing", {"status": "completed"})
+    assert registry.get("f0")["status"] == "completed"
+    assert registry.get("f0")["recommendations"] == [{"id": "r1"}]
+    assert "missing" not in registry
+
+    cutoff = datetime(2024, 1, 1, 1, 30, tzinfo=timezone.utc).timestamp()
+    assert registry.uploaded_before(cutoff) == ["f0", "f1"]
+
+    assert registry.delete("f1")
+    assert not registry.delete("f1")
+    assert len(registry) == 4
+    files, total = registry.page("a", 0, 10)
+    assert [f["file_id"] for f in files] == ["f3"]
+    assert total == 1
+    assert [f["file_id"] for f in registry.values()] == ["f0", "f2", "f3", "f4"]
+
+
+def test_redis_registry_is_shared_between_clients(redis_registry):
+    """Test that registries on the same Redis server see each other's changes"""
+    writer = redis_registry
+    reader = create_file_registry(redis_url="redis://fake")
+    writer.add(_file_info("f0", "s", datetime(2024, 1, 1)))
+
+    assert reader.get("f0")["session_id"] == "s"
+    assert reader.delete("f0") and "f0" not in writer
+    assert writer.page("s", 0, 10) == ([], 0)
+
+
+def test_redis_values_survive_concurrent_deletes(redis_registry):
+    """Test that iterating in batches sees every entry that outlives the iteration"""
+    registry = redis_registry
+    registry.BATCH_SIZE = 2
+    start = datetime(2024, 1, 1)
+    for i in range(6):
+        registry.add(_file_info(f"f{i}", "s", start + timedelta(hours=i)))
+
+    seen = []
+    for file_info in registry.values():
+        seen.append(file_info["file_id"])
+        if file_info["file_id"] == "f1":
+            # Another worker's cleanup removes already-seen entries mid-iteration
+            registry.delete("f0")
+            registry.delete("f1")
+    assert seen == ["f0", "f1", "f2", "f3", "f4", "f5"]
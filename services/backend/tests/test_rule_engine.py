@@ -0,0 +1,194 @@
+"""
+Test suite for rule matching
+"""
+
+import re
+from datetime import datetime
+
+import pytest
+
+from data_labeler_api.models.configuration import CleaningPattern, ConfigurationManager, DomainConfiguration
+from data_labeler_api.models.merchant_patterns import MerchantPatternCreate
+from data_labeler_api.models.rule import Rule
+from data_labeler_api.services.merchant_patterns import pattern_manager
+from data_labeler_api.services.rule_engine import RuleEngine
+
+TRANSACTIONS = [
+    {"id": "t1", "description": "STARBUCKS #1", "amount": -4.5, "date": "2024-01-01T00:00:00"},
+    {"id": "t2", "description": "PAYROLL DEPOSIT", "amount": 1500.0, "date": "2024-01-02T00:00:00"},
+    {"id": "t3", "description": "STARBUCKS #3", "amount": -5.25, "date": "2024-01-05T00:00:00"},
+]
+
+
+def make_rule(rule_id: str, **conditions) -> Rule:
+    """Build an active rule with the given conditions"""
+    return Rule(
+        id=rule_id,
+        name=rule_id,
+        conditions=conditions,
+        label_id="label",
+        confidence=1.0,
+        created_at=datetime.utcnow(),
+        updated_at=datetime.utcnow()
+    )
+
+
+def test_find_matches_bulk_matches_per_rule_results():
+    """Test that bulk matching returns the same matches, grouped by rule"""
+    engine = RuleEngine()
+    rules = [
+        make_rule("coffee", description="starbucks"),
+        make_rule("large", amount={"min": 1000}),
+        make_rule("early", date_range={"end": "2024-01-02T00:00:00"}, description="payroll"),
+    ]
+
+    expected = [m for rule in rules for m in engine.find_matching_transactions(rule, TRANSACTIONS)]
+    matches = engine.find_matches_bulk(rules, TRANSACTIONS)
+
+    assert matches == expected
+    assert [(m.rule_id, m.transaction_id) for m in matches] == [
+        ("coffee", "t1"), ("coffee", "t3"), ("large", "t2"), ("early", "t1"), ("early", "t2")
+    ]
+    assert matches[-1].matched_conditions == ["description", "date_end"]
+    assert matches[-1].confidence == 1.0
+    assert matches[-2].confidence == 0.5
+
+
+def test_find_matches_bulk_skips_inactive_rules():
+    """Test that inactive rules never match"""
+    engine = RuleEngine()
+    rule = make_rule("coffee", description="starbucks")
+    rule.is_active = False
+
+    assert engine.find_matches_bulk([rule], TRANSACTIONS) == []
+
+
+def test_compile_rule_is_cached_until_rule_changes():
+    """Test that compiled matchers are reused until updated_at changes"""
+    engine = RuleEngine()
+    rule = make_rule("coffee", description="starbucks")
+
+    matcher = engine.compile_rule(rule)
+    assert engine.compile_rule(rule) is matcher
+
+    rule.conditions.description = "payroll"
+    rule.updated_at = datetime.utcnow().replace(year=2099)
+    matches = engine.find_matches_bulk([rule], TRANSACTIONS)
+
+    assert engine.compile_rule(rule) is not matcher
+    assert [m.transaction_id for m in matches] == ["t2"]
+
+
+def test_word_index_matches_unindexed_results():
+    """Test that narrowing rules by anchor words keeps every match"""
+    conditions = [
+        {"description": "starbucks"}, {"description": "star bucks"}, {"description": "7-eleven"},
+        {"description": "#3"}, {"category": "coffee"}, {"description": "café"},
+        {"description": "payroll", "amount": {"min": 1000}}, {"description": "deposit"},
+    ]
+    rules = [make_rule(f"r{i}", **condition) for i, condition in enumerate(conditions)]
+    transactions = TRANSACTIONS + [
+        {"id": "t4", "description": "7-Eleven 42", "category": "Coffee Shop"},
+        {"id": "t5", "description": "CAFÉ ROUGE", "amount": 2000},
+    ]
+
+    indexed = RuleEngine()
+    assert indexed.MIN_INDEXED_RULES <= len(rules)
+    unindexed = RuleEngine()
+    unindexed.MIN_INDEXED_RULES = len(rules) + 1
+
+    matches = indexed.find_matches_bulk(rules, transactions)
+    assert matches == unindexed.find_matches_bulk(rules, transactions)
+    assert [(m.rule_id, m.transaction_id) for m in matches] == [
+        ("r0", "t1"), ("r0", "t3"), ("r1", "t1"), ("r1", "t3"), ("r2", "t4"),
+        ("r4", "t4"), ("r5", "t5"), ("r6", "t2"), ("r6", "t5"), ("r7", "t2"),
+    ]
+
+
+def test_generate_regex_pattern_separators_match_whitespace_and_hyphens():
+    """Test that spaces in condition text match whitespace, hyphens and underscores"""
+    engine = RuleEngine()
+
+    fuzzy = re.compile(engine.generate_regex_pattern("foo bar", True))
+    assert fuzzy.search("foo-bar") and fuzzy.search("foo  bar") and fuzzy.search("foo_bar")
+    assert not fuzzy.search("foobar")
+
+    exact = re.compile(engine.generate_regex_pattern("foo bar", False))
+    assert exact.search("foobar") and exact.search("foo bar")
+    assert not exact.search("foo\\bar")
+
+    rule = make_rule("payroll", description="payroll deposit")
+    assert [m.transaction_id for m in engine.find_matching_transactions(rule, TRANSACTIONS)] == ["t2"]
+
+
+def test_text_search_agrees_with_condition_pattern():
+    """Test that the literal prefilter never changes whether a condition matches"""
+    engine = RuleEngine()
+    condition_search = engine._text_search("star bucks")
+
+    def search(value):
+        return condition_search(value, value.lower())
+
+    assert search("STARBUCKS #1") and search("Star-Bucks Café")
+    assert not search("XSTARBUCKS") and not search("AMAZON")
+    # Non-ASCII text is left to the regex, whose IGNORECASE folds "ſ" to "s"
+    assert search("ſtarbucks")
+
+
+def test_cleaning_pipeline_is_rebuilt_when_config_changes():
+    """Test that compiled cleaning patterns follow config replacements"""
+    engine = RuleEngine()
+    manager = ConfigurationManager()
+    config = manager.add_config(DomainConfiguration(
+        domain_name="bank",
+        cleaning_patterns=[CleaningPattern(pattern=r"\s+#\d+"), CleaningPattern(pattern="(")]
+    ))
+
+    pipeline = engine._cleaning_pipeline(config)
+    assert [pattern.pattern for pattern, _ in pipeline] == [r"\s+#\d+"]
+    assert engine._cleaning_pipeline(config) is pipeline
+
+    updated = manager.add_cleaning_pattern("bank", CleaningPattern(pattern="POS ", replacement=""))
+    assert len(engine._cleaning_pipeline(updated)) == 2
+
+
+def test_generated_matcher_binds_condition_values_by_name():
+    """Test that generated matchers check every condition kind, whatever the condition text holds"""
+    engine = RuleEngine()
+    rule = make_rule(
+        "all",
+        description="o'brien \"s\" pub",
+        category="pub')\nimport os",
+        amount={"exact": 12.5, "min": 10, "max": 20},
+        date_range={"start": "2024-01-01T00:00:00", "end": "2024-01-31T00:00:00"},
+    )
+    transaction = {
+        "id": "t9", "description": "O'BRIEN \"S\" PUB #4", "category": "Dining",
+        "amount": 12.5, "date": "2024-01-10T00:00:00",
+    }
+
+    match = engine.match_rule_against_transaction(rule, transaction)
+
+    assert match.matched_conditions == [
+        "description", "amount_exact", "amount_min", "amount_max", "date_start", "date_end"
+    ]
+    assert match.confidence == 1.0
+
+
+def test_create_rule_from_transaction_extracts_merchant_once():
+    """Test that a rule built from a transaction credits its merchant pattern once"""
+    pattern = pattern_manager.create_pattern(MerchantPatternCreate(name="Starbucks", pattern=r"starbucks"))
+    try:
+        rule = RuleEngine().create_rule_from_transaction(TRANSACTIONS[0], "coffee")
+
+        assert re.fullmatch(r"rule_[0-9a-f]{8}", rule.id)
+        assert rule.conditions.merchant == "Starbucks"
+        assert rule.regex.merchant == r"\bStarbucks\b"
+        assert rule.regex.description is None
+        assert rule.conditions.amount["exact"] == -4.5
+        assert rule.conditions.amount["min"] == pytest.approx(-4.725)
+        assert rule.conditions.amount["max"] == pytest.approx(-4.275)
+        assert RuleEngine().validate_rule(rule).errors == []
+        assert pattern_manager.get_pattern(pattern.id).usage_count == 1
+    finally:
+        pattern_manager.delete_pattern(pattern.id)
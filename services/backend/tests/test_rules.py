@@ -0,0 +1,159 @@
+"""
+Test suite for rule management endpoints
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from data_labeler_api.main import app
+from data_labeler_api.api.rules import rules_db, rules_sorted, active_rules
+from data_labeler_api.core import storage
+from data_labeler_api.core.storage import storage_manager
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def empty_rule_store():
+    """Drop rules a test created, even when it fails before deleting them"""
+    yield
+    rules_db.clear()
+    rules_sorted.clear()
+    active_rules.clear()
+
+
+def create_rule(name: str, priority: int) -> str:
+    """Create a description rule through the API and return its ID"""
+    response = client.post("/api/v1/rules", json={
+        "name": name,
+        "conditions": {"description": name},
+        "label_id": "label",
+        "priority": priority
+    })
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def test_list_rules_uses_priority_order():
+    """Test that rule listing stays sorted across updates and deletes"""
+    low = create_rule("low", 1)
+    high = create_rule("high", 5)
+    mid = create_rule("mid", 3)
+
+    names = [r["name"] for r in client.get("/api/v1/rules").json()]
+    assert names == ["high", "mid", "low"]
+
+    # Raising a priority and deactivating a rule both move it in the indices
+    assert client.put(f"/api/v1/rules/{low}", json={"priority": 10}).status_code == 200
+    assert client.put(f"/api/v1/rules/{high}", json={"is_active": False}).status_code == 200
+
+    names = [r["name"] for r in client.get("/api/v1/rules").json()]
+    assert names == ["low", "high", "mid"]
+    active = [r["name"] for r in client.get("/api/v1/rules", params={"active_only": True}).json()]
+    assert active == ["low", "mid"]
+
+    page = client.get("/api/v1/rules", params={"offset": 1, "limit": 1}).json()
+    assert [r["name"] for r in page] == ["high"]
+
+    for rule_id in (low, high, mid):
+        assert client.delete(f"/api/v1/rules/{rule_id}").status_code == 200
+
+    assert rules_db == {} and rules_sorted == [] and active_rules == []
+
+
+def test_rejected_update_leaves_rule_unchanged():
+    """Test that an update failing validation doesn't modify the stored rule"""
+    rule_id = create_rule("unchanged", 2)
+
+    response = client.put(f"/api/v1/rules/{rule_id}", json={"conditions": {}, "priority": 9})
+    assert response.status_code == 400
+
+    rule = client.get(f"/api/v1/rules/{rule_id}").json()
+    assert rule["priority"] == 2
+    assert rule["conditions"]["description"] == "unchanged"
+
+
+def test_apply_rule_labels_selected_transactions():
+    """Test applying a rule to a subset of its matching transactions"""
+    file_id = "apply-rule-test"
+    storage_manager.save_processed_data(file_id, {"transactions": [
+        {"id": "t1", "description": "STARBUCKS #1", "amount": "-4.5"},
+        {"id": "t2", "description": "STARBUCKS #2", "amount": "-5.25"},
+        {"id": "t3", "description": "PAYROLL", "amount": "1500"},
+    ]})
+    rule_id = create_rule("starbucks", 1)
+
+    response = client.post(
+        f"/api/v1/rules/{rule_id}/apply",
+        params={"file_id": file_id},
+        json=["t2", "t3"]
+    )
+    assert response.status_code == 200
+    assert response.json()["updated_count"] == 1
+
+    labels = {t["id"]: t.get("label") for t in storage_manager.get_processed_data(file_id)["transactions"]}
+    assert labels == {"t1": None, "t2": "label", "t3": None}
+
+
+def test_rule_ids_are_unique_after_deletes():
+    """Test that rule IDs don't repeat when rules are created in the same second"""
+    first = create_rule("first", 0)
+    client.delete(f"/api/v1/rules/{first}")
+    second = create_rule("second", 0)
+
+    assert first != second
+    rule = client.get(f"/api/v1/rules/{second}").json()
+    assert rule["created_at"] == rule["updated_at"]
+
+
+def test_reapplying_rule_does_not_duplicate_history():
+    """Test that applying a rule twice records each transaction once"""
+    file_id = "apply-rule-history-test"
+    storage_manager.save_processed_data(file_id, {"transactions": [
+        {"id": "t1", "description": "STARBUCKS #1", "amount": "-4.5"},
+        {"id": "t2", "description": "STARBUCKS #2", "amount": "-5.25"},
+    ]})
+    rule_id = create_rule("starbucks", 1)
+
+    for _ in range(2):
+        assert client.post(f"/api/v1/rules/{rule_id}/apply", params={"file_id": file_id}).status_code == 200
+
+    rule = client.get(f"/api/v1/rules/{rule_id}").json()
+    assert rule["transaction_ids"] == ["t1", "t2"]
+    assert rule["match_count"] == 4
+
+
+def test_failed_apply_leaves_cached_transactions_unlabeled(monkeypatch):
+    """Test that labels only reach the shared processed data once they are saved"""
+    file_id = "apply-rule-failed-save"
+    storage_manager.save_processed_data(file_id, {"transactions": [
+        {"id": "t1", "description": "STARBUCKS #1", "amount": "-4.5"},
+    ]})
+    cached = storage_manager.get_processed_data(file_id)
+    rule_id = create_rule("starbucks", 1)
+
+    def fail_write(path, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage, "atomic_write_bytes", fail_write)
+    response = client.post(f"/api/v1/rules/{rule_id}/apply", params={"file_id": file_id})
+
+    assert response.status_code == 500
+    assert storage_manager.get_processed_data(file_id) is cached
+    assert "label" not in cached["transactions"][0]
+
+
+def test_match_keeps_creation_order_for_confidence_ties():
+    """Test that equally confident matches are cut by the limit in rule creation order"""
+    file_id = "match-order-test"
+    storage_manager.save_processed_data(file_id, {"transactions": [
+        {"id": "t1", "description": "STARBUCKS COFFEE", "amount": "-4.5"},
+    ]})
+    first = create_rule("starbucks", 1)
+    create_rule("coffee", 5)
+
+    response = client.post("/api/v1/rules/match", params={"file_id": file_id, "limit": 1})
+    assert response.status_code == 200
+    assert [m["rule_id"] for m in response.json()] == [first]
+
+    negative = client.post("/api/v1/rules/match", params={"file_id": file_id, "limit": -5})
+    assert negative.status_code == 422
@@ -0,0 +1,222 @@
+"""
+Test suite for session persistence endpoints
+"""
+
+import time
+
+from fastapi.testclient import TestClient
+from data_labeler_api.main import app
+from data_labeler_api.api import sessions
+from data_labeler_api.core.config import get_settings
+
+client = TestClient(app)
+
+
+def make_session(session_id: str, file_name: str = "transactions.csv") -> dict:
+    """Build a session payload as the frontend sends it"""
+    return {
+        "sessionId": session_id,
+        "dataState": {"rows": [{"id": "t1", "label": "coffee"}], "notes": "café"},
+        "activeTab": "data",
+        "metadata": {
+            "sessionId": session_id,
+            "fileName": file_name,
+            "lastModified": "2024-01-01T00:00:00",
+            "rowCount": 1
+        }
+    }
+
+
+def test_session_round_trip():
+    """Test saving, loading, listing and deleting a session"""
+    session_id = "session-round-trip"
+    response = client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id))
+    assert response.status_code == 200
+
+    loaded = client.get(f"/api/v1/sessions/{session_id}").json()
+    assert loaded["dataState"] == {"rows": [{"id": "t1", "label": "coffee"}], "notes": "café"}
+    assert loaded["metadata"]["storageType"] == "backend"
+
+    listed = [s["sessionId"] for s in client.get("/api/v1/sessions").json()]
+    assert session_id in listed
+
+    assert client.delete(f"/api/v1/sessions/{session_id}").status_code == 200
+    assert client.get(f"/api/v1/sessions/{session_id}").status_code == 404
+
+
+def test_updated_session_is_reloaded():
+    """Test that a rewritten session file is not served from the parse cache"""
+    session_id = "session-update"
+    client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id, "first.csv"))
+    assert client.get(f"/api/v1/sessions/{session_id}").json()["metadata"]["fileName"] == "first.csv"
+
+    client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id, "second.csv"))
+    assert client.get(f"/api/v1/sessions/{session_id}").json()["metadata"]["fileName"] == "second.csv"
+
+    client.delete(f"/api/v1/sessions/{session_id}")
+
+
+def test_list_sessions_uses_metadata_index():
+    """Test that listing reads the metadata index and rebuilds it when missing"""
+    session_id = "session-index"
+    client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id, "indexed.csv"))
+
+    sessions.SESSIONS_INDEX_FILE.unlink()
+    listed = {s["sessionId"]: s for s in client.get("/api/v1/sessions").json()}
+    assert listed[session_id]["fileName"] == "indexed.csv"
+    assert sessions.SESSIONS_INDEX_FILE.exists()
+
+    client.delete(f"/api/v1/sessions/{session_id}")
+    listed = [s["sessionId"] for s in client.get("/api/v1/sessions").json()]
+    assert session_id not in listed
+
+
+def test_get_session_supports_etag():
+    """Test that session reads return an ETag and honor If-None-Match"""
+    session_id = "session-etag"
+    client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id))
+
+    response = client.get(f"/api/v1/sessions/{session_id}")
+    etag = response.headers["etag"]
+    assert response.json()["sessionId"] == session_id
+
+    cached = client.get(f"/api/v1/sessions/{session_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id, "changed.csv"))
+    changed = client.get(f"/api/v1/sessions/{session_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["metadata"]["fileName"] == "changed.csv"
+
+    client.delete(f"/api/v1/sessions/{session_id}")
+
+
+def test_rapid_saves_are_coalesced(monkeypatch):
+    """Test that a burst of saves is served from memory and written once"""
+    monkeypatch.setattr(get_settings(), "session_write_debounce_ms", 60_000)
+    writes = []
+    save_session_to_file = sessions.save_session_to_file
+    monkeypatch.setattr(
+        sessions, "save_session_to_file",
+        lambda session: writes.append(session.session_id) or save_session_to_file(session)
+    )
+
+    session_id = "session-debounce"
+    with TestClient(app) as live_client:
+        for name in ("one.csv", "two.csv", "three.csv"):
+            saved = live_client.post(
+                f"/api/v1/sessions/{session_id}", json=make_session(session_id, name)
+            )
+            assert saved.json()["metadata"]["syncStatus"] == "pending"
+
+        loaded = live_client.get(f"/api/v1/sessions/{session_id}").json()
+        assert loaded["metadata"]["fileName"] == "three.csv"
+        listed = {s["sessionId"]: s for s in live_client.get("/api/v1/sessions").json()}
+        assert listed[session_id]["fileName"] == "three.csv"
+        assert writes == []
+
+    # Shutdown flushes whatever is still queued
+    assert writes == [session_id]
+    assert sessions.load_session_from_file(session_id).metadata.file_name == "three.csv"
+    client.delete(f"/api/v1/sessions/{session_id}")
+
+
+def test_gzip_refused_with_zero_q_value():
+    """Test that Accept-Encoding q-values decide whether the stored gzip is served"""
+    session_id = "session-qvalue"
+    client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id))
+
+    refused = client.get(f"/api/v1/sessions/{session_id}", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in refused.headers
+    assert refused.json()["sessionId"] == session_id
+    wildcard = client.get(
+        f"/api/v1/sessions/{session_id}", headers={"Accept-Encoding": "*;q=0.5, gzip;q=0"}
+    )
+    assert "content-encoding" not in wildcard.headers
+    accepted = client.get(
+        f"/api/v1/sessions/{session_id}", headers={"Accept-Encoding": "br, gzip;q=0.8"}
+    )
+    assert accepted.headers["content-encoding"] == "gzip"
+
+    client.delete(f"/api/v1/sessions/{session_id}")
+
+
+def test_failed_flush_is_retried(monkeypatch):
+    """Test that a queued save whose write fails is flushed again without another save"""
+    monkeypatch.setattr(get_settings(), "session_write_debounce_ms", 10)
+    attempts = []
+    save_session_to_file = sessions.save_session_to_file
+
+    def flaky_save(session):
+        attempts.append(session.session_id)
+        return len(attempts) > 1 and save_session_to_file(session)
+
+    monkeypatch.setattr(sessions, "save_session_to_file", flaky_save)
+
+    session_id = "session-flush-retry"
+    with TestClient(app) as live_client:
+        live_client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id))
+        for _ in range(200):
+            if sessions.get_pending_session(session_id) is None:
+                break
+            time.sleep(0.01)
+        assert sessions.get_pending_session(session_id) is None
+
+    assert attempts == [session_id, session_id]
+    assert sessions.load_session_from_file(session_id) is not None
+    client.delete(f"/api/v1/sessions/{session_id}")
+
+
+def test_active_session_round_trip():
+    """Test setting, reading and clearing the active session"""
+    session_id = "session-active"
+    client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id))
+
+    assert client.post("/api/v1/sessions/active", json={"sessionId": session_id}).status_code == 200
+    assert client.get("/api/v1/sessions/active").json() == {"sessionId": session_id}
+
+    client.delete(f"/api/v1/sessions/{session_id}")
+    assert client.get("/api/v1/sessions/active").json() == {"sessionId": None}
+
+
+def test_legacy_uncompressed_session_is_read_and_migrated():
+    """Test that pre-compression session files still load and are replaced on save"""
+    session_id = "session-legacy"
+    client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id, "legacy.csv"))
+    stored = sessions.get_session_file(session_id)
+    legacy = sessions.get_legacy_session_file(session_id)
+    legacy.write_bytes(sessions.read_session_bytes(str(stored)))
+    stored.unlink()
+
+    plain = client.get(f"/api/v1/sessions/{session_id}", headers={"Accept-Encoding": "identity"})
+    assert plain.json()["metadata"]["fileName"] == "legacy.csv"
+    assert "content-encoding" not in plain.headers
+    assert client.get(f"/api/v1/sessions/{session_id}/exists").status_code == 200
+
+    client.post(f"/api/v1/sessions/{session_id}", json=make_session(session_id, "migrated.csv"))
+    assert stored.exists() and not legacy.exists()
+    compressed = client.get(f"/api/v1/sessions/{session_id}")
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.json()["metadata"]["fileName"] == "migrated.csv"
+
+    client.delete(f"/api/v1/sessions/{session_id}")
+    assert not stored.exists()
+
+
+def test_legacy_session_datetimes_are_served_as_iso():
+    """Test that legacy files written with json.dump(default=str) are re-serialized"""
+    session_id = "session-legacy-datetimes"
+    legacy = sessions.get_legacy_session_file(session_id)
+    legacy.write_text(
+        '{"sessionId": "session-legacy-datetimes", "dataState": {}, "activeTab": "data", '
+        '"metadata": {"sessionId": "session-legacy-datetimes", "fileName": "old.csv", '
+        '"lastModified": "2024-01-01 12:30:00", "rowCount": 0}, '
+        '"createdAt": "2024-01-01 12:00:00", "updatedAt": "2024-01-01 12:30:00.250000"}'
+    )
+
+    loaded = client.get(f"/api/v1/sessions/{session_id}").json()
+    assert loaded["metadata"]["lastModified"] == "2024-01-01T12:30:00"
+    assert loaded["updatedAt"] == "2024-01-01T12:30:00.250000"
+
+    client.delete(f"/api/v1/sessions/{session_id}")
+    assert not legacy.exists()
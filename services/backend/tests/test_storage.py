@@ -0,0 +1,82 @@
+"""
+Test suite for the file storage manager
+"""
+
+import io
+import json
+import os
+import stat
+
+from data_labeler_api.core.storage import FileStorageManager
+
+
+def test_processed_data_is_cached_until_file_changes():
+    """Test that processed data is parsed once and reloaded after a rewrite"""
+    storage = FileStorageManager()
+    file_id = "cache-test"
+    assert storage.save_processed_data(file_id, {"transactions": [{"id": "t1"}]})
+
+    first = storage.get_processed_data(file_id)
+    assert storage.get_processed_data(file_id) is first
+
+    # An out-of-band rewrite changes (mtime, size) and must be picked up
+    processed_path = storage.processed_dir / f"{file_id}.json"
+    processed_path.write_text(json.dumps({"transactions": []}), encoding="utf-8")
+    file_stat = processed_path.stat()
+    os.utime(processed_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000))
+
+    assert storage.get_processed_data(file_id) == {"transactions": []}
+
+    processed_path.unlink()
+    assert storage.get_processed_data(file_id) is None
+
+
+def test_save_processed_data_updates_cache():
+    """Test that saving writes through to the cache"""
+    storage = FileStorageManager()
+    file_id = "cache-write-through"
+    storage.save_processed_data(file_id, {"transactions": []})
+    storage.get_processed_data(file_id)
+
+    updated = {"transactions": [{"id": "t1", "label": "coffee"}]}
+    storage.save_processed_data(file_id, updated)
+
+    assert storage.get_processed_data(file_id) == updated
+
+
+def test_processed_data_fields_are_normalized_on_load():
+    """Test that capitalized transaction fields are renamed to canonical keys"""
+    storage = FileStorageManager()
+    file_id = "normalize-test"
+    processed_path = storage.processed_dir / f"{file_id}.json"
+    processed_path.write_text(json.dumps({"transactions": [
+        {"id": "t1", "Description": "STARBUCKS", "Amount": "-4.5", "date": "2024-01-01"}
+    ]}), encoding="utf-8")
+
+    transaction = storage.get_processed_data(file_id)["transactions"][0]
+    assert transaction == {"id": "t1", "description": "STARBUCKS", "amount": "-4.5", "date": "2024-01-01"}
+
+
+def test_stream_upload_recreates_removed_session_dir():
+    """Test that uploads recover when a remembered session directory disappears"""
+    storage = FileStorageManager()
+    session_id = "session-dir-test"
+    first = storage.save_uploaded_file_stream(io.BytesIO(b"a,b\n1,2\n"), "first.csv", session_id)
+    assert storage.get_file_info(first)["file_size"] == 8
+
+    storage.delete_file(first)
+    (storage.uploads_dir / session_id).rmdir()
+
+    second = storage.save_uploaded_file_stream(io.BytesIO(b"a,b\n"), "second.csv", session_id)
+    assert storage.get_file_path(second).read_bytes() == b"a,b\n"
+    assert storage.get_file_info(second)["file_size"] == 4
+
+
+def test_stream_upload_uses_default_file_permissions():
+    """Test that streamed uploads get the umask default rather than the temp file's 0600"""
+    storage = FileStorageManager()
+    file_id = storage.save_uploaded_file_stream(io.BytesIO(b"a,b\n"), "perms.csv", "session-perms")
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(storage.get_file_path(file_id).stat().st_mode) == 0o666 & ~umask